@@ -8,11 +8,13 @@ import os
 import re
 import sys
 import json
+import shutil
 import hashlib
 import tarfile
 import datetime
 import subprocess
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
 
 # LiteX Build Bundle ------------------------------------------------------------------------------
@@ -75,6 +77,58 @@ def _file_digest(path):
     return h.hexdigest()
 
 
+# Digest cache: path -> (mtime_ns, size, sha256), persisted next to the bundles so unchanged inputs
+# are not re-hashed on every build.
+
+_DIGEST_CACHE_FILE = "digest_cache.json"
+
+
+def _load_digest_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_digest_cache(path, cache):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# Archive compressors: tarfile gzip, multi-threaded gzip (pigz) or zstd (zstandard module or zstd).
+
+_COMPRESSIONS = ["gz", "pigz", "zstd"]
+
+_ARCHIVE_SUFFIXES = {
+    "gz"   : ".tar.gz",
+    "pigz" : ".tar.gz",
+    "zstd" : ".tar.zst",
+}
+
+
+def _zstd_compressor():
+    try:
+        import zstandard
+        return "module", zstandard
+    except ImportError:
+        pass
+    if shutil.which("zstd") is not None:
+        return "command", ["zstd", "-q", "-T0", "-3"]
+    return None, None
+
+
+def _check_compression(compression):
+    if compression not in _COMPRESSIONS:
+        raise ValueError(f"Unsupported bundle compression: {compression}.")
+    if compression == "zstd" and _zstd_compressor()[0] is None:
+        raise OSError("zstd bundle compression requires the zstandard Python module or the zstd command.")
+
+
 def _git_info(path):
     cwd = path if os.path.isdir(path) else os.path.dirname(path)
     try:
@@ -195,10 +249,13 @@ class BuildBundle:
         command       = None,
         env           = None,
         strict        = "warn",
-        exclude_dirs  = None):
+        exclude_dirs  = None,
+        compression   = "gz",
+        jobs          = None):
 
         if strict not in ["warn", "error"]:
             raise ValueError(f"Unsupported bundle strict mode: {strict}.")
+        _check_compression(compression)
 
         self.output_dir    = _abspath(output_dir)
         self.archive_path  = _abspath(archive_path) if archive_path else None
@@ -207,6 +264,9 @@ class BuildBundle:
         self.strict        = strict
         self.exclude_dirs  = [_abspath(p) for p in _as_list(exclude_dirs)]
         self.exclude_dirs.append(self.output_dir)
+        self.compression   = compression
+        self.jobs          = jobs
+        self.digest_cache  = os.path.join(self.output_dir, "bundles", _DIGEST_CACHE_FILE)
 
         self._records         = {}
         self._missing         = []
@@ -335,7 +395,7 @@ class BuildBundle:
             "path"        : key,
             "archive_path": archive_path,
             "roles"       : [role],
-            "sha256"      : _file_digest(key),
+            "sha256"      : None, # Computed in create (_hash_records).
             "size"        : st.st_size,
             "mtime_ns"    : st.st_mtime_ns,
             "mode"        : st.st_mode,
@@ -345,6 +405,28 @@ class BuildBundle:
             record["link_target"] = os.readlink(key)
         self._records[key] = record
 
+    def _hash_records(self):
+        # Only re-hash files whose (mtime, size) changed since the previous bundle, in parallel.
+        cache   = _load_digest_cache(self.digest_cache)
+        pending = []
+        for record in self._records.values():
+            if record["kind"] == "symlink":
+                record["sha256"] = _file_digest(record["path"])
+                continue
+            cached = cache.get(record["path"])
+            if cached is not None and cached[:2] == [record["mtime_ns"], record["size"]]:
+                record["sha256"] = cached[2]
+            else:
+                pending.append(record)
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                for record, digest in zip(pending, executor.map(_file_digest, [r["path"] for r in pending])):
+                    record["sha256"] = digest
+        _save_digest_cache(self.digest_cache, {
+            r["path"]: [r["mtime_ns"], r["size"], r["sha256"]]
+            for r in self._records.values() if r["kind"] == "file"
+        })
+
     def _input_digest(self):
         h = hashlib.sha256()
         for record in sorted(self._records.values(), key=lambda r: r["archive_path"]):
@@ -394,28 +476,91 @@ class BuildBundle:
             "git"        : sorted(git_roots.values(), key=lambda r: r["root"]),
         }
 
+    def _is_up_to_date(self, manifest_path, input_digest):
+        # An existing archive can be reused when it was created from the same inputs and command.
+        if not os.path.exists(self.archive_path):
+            return False
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (manifest.get("input_digest") == input_digest and
+                manifest.get("command")      == self.command and
+                manifest.get("env")          == self.env)
+
+    def _write_archive(self, archive_path, manifest_bytes, files):
+        def add_files(archive):
+            info = tarfile.TarInfo("manifest.json")
+            info.size  = len(manifest_bytes)
+            info.mtime = int(datetime.datetime.utcnow().timestamp())
+            archive.addfile(info, fileobj=_BytesReader(manifest_bytes))
+            for record in files:
+                archive.add(record["path"], arcname=record["archive_path"], recursive=False)
+
+        command = None
+        if self.compression == "pigz" and shutil.which("pigz") is not None:
+            command = ["pigz", "-6"]
+        if self.compression == "zstd":
+            kind, compressor = _zstd_compressor()
+            if kind == "module":
+                with open(archive_path, "wb") as f:
+                    with compressor.ZstdCompressor(level=3, threads=-1).stream_writer(f) as writer:
+                        with tarfile.open(fileobj=writer, mode="w|", dereference=False) as archive:
+                            add_files(archive)
+                return
+            command = compressor
+
+        # Tar stream piped to an external compressor.
+        if command is not None:
+            with open(archive_path, "wb") as f:
+                p = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=f)
+                try:
+                    with tarfile.open(fileobj=p.stdin, mode="w|", dereference=False) as archive:
+                        add_files(archive)
+                finally:
+                    p.stdin.close()
+                    if p.wait() != 0:
+                        raise OSError(f"{command[0]} failed with {p.returncode}.")
+            return
+
+        # Python gzip (also used for pigz when pigz is not available).
+        with tarfile.open(archive_path, "w:gz", compresslevel=6, dereference=False) as archive:
+            add_files(archive)
+
     def create(self):
         self._handle_missing()
 
+        self._hash_records()
         input_digest = self._input_digest()
         if self.archive_path is None:
             archive_dir       = os.path.join(self.output_dir, "bundles")
-            archive_basename  = f"litex-build-input-{input_digest[:12]}.tar.gz"
+            archive_basename  = f"litex-build-input-{input_digest[:12]}{_ARCHIVE_SUFFIXES[self.compression]}"
             self.archive_path = os.path.join(archive_dir, archive_basename)
 
+        manifest_path = self.archive_path + ".manifest.json"
+        if self._is_up_to_date(manifest_path, input_digest):
+            return {
+                "archive" : self.archive_path,
+                "manifest": manifest_path,
+                "digest"  : input_digest,
+                "reused"  : True,
+            }
+
         os.makedirs(os.path.dirname(self.archive_path), exist_ok=True)
         manifest = self._manifest(self.archive_path, input_digest)
         manifest_bytes = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
 
-        with tarfile.open(self.archive_path, "w:gz", dereference=False) as archive:
-            info = tarfile.TarInfo("manifest.json")
-            info.size  = len(manifest_bytes)
-            info.mtime = int(datetime.datetime.utcnow().timestamp())
-            archive.addfile(info, fileobj=_BytesReader(manifest_bytes))
-            for record in manifest["files"]:
-                archive.add(record["path"], arcname=record["archive_path"], recursive=False)
+        # Write to a temporary file first: an existing archive is always complete.
+        tmp_archive_path = self.archive_path + ".tmp"
+        try:
+            self._write_archive(tmp_archive_path, manifest_bytes, manifest["files"])
+        except BaseException:
+            if os.path.exists(tmp_archive_path):
+                os.remove(tmp_archive_path)
+            raise
+        os.replace(tmp_archive_path, self.archive_path)
 
-        manifest_path = self.archive_path + ".manifest.json"
         with open(manifest_path, "w", encoding="utf-8") as f:
             json.dump(manifest, f, indent=2, sort_keys=True)
             f.write("\n")
@@ -424,6 +569,7 @@ class BuildBundle:
             "archive" : self.archive_path,
             "manifest": manifest_path,
             "digest"  : input_digest,
+            "reused"  : False,
         }
 
 
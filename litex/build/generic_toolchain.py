@@ -11,6 +11,9 @@ import math
 from migen.fhdl.structure import Signal, _Fragment
 
 from litex.gen import LiteXContext
+from litex.gen.fhdl.conv_cache import VerilogCache
+
+from litex.build.profile import profile_phase
 
 # Generic Toolchain --------------------------------------------------------------------------------
 
@@ -29,6 +32,7 @@ class GenericToolchain:
         self.named_sc    = []
         self._vns        = None
         self._synth_opts = ""
+        self._script     = None
 
         # Set Toolchain to LiteXContext.
         LiteXContext.toolchain = self
@@ -67,6 +71,7 @@ class GenericToolchain:
         synth_opts     = "",
         run            = True,
         build_backend  = "litex",
+        verilog_cache  = True,
         **kwargs):
 
         self._build_name = build_name
@@ -81,31 +86,39 @@ class GenericToolchain:
         os.chdir(self._build_dir)
         try:
             # Finalize Design.
-            if not isinstance(self.fragment, _Fragment):
-                self.fragment = self.fragment.get_fragment()
-            platform.finalize(self.fragment)
+            with profile_phase("finalize"):
+                if not isinstance(self.fragment, _Fragment):
+                    self.fragment = self.fragment.get_fragment()
+                platform.finalize(self.fragment)
 
-            # Generate Verilog.
-            v_output = platform.get_verilog(self.fragment, name=build_name, **kwargs)
-            self._vns = v_output.ns
+            # Generate Verilog (or reuse previous one when design/options are unchanged).
+            # verilog_cache can also be a VerilogCache factory (ex: shared between builds).
             v_file = build_name + ".v"
-            v_output.write(v_file)
+            if verilog_cache:
+                kwargs["cache"] = verilog_cache(v_file) if callable(verilog_cache) else VerilogCache(v_file)
+            with profile_phase("verilog"):
+                v_output = platform.get_verilog(self.fragment, name=build_name, **kwargs)
+                self._vns = v_output.ns
+                # Leave unchanged files untouched so downstream tools' caching stays valid.
+                if not getattr(v_output, "cached", False):
+                    v_output.write(v_file)
 
             # Finalize toolchain (after gateware is complete)
             self.finalize()
 
-            # Get signals and platform constraints
-            self.named_sc, self.named_pc = platform.resolve_signals(self._vns)
-            platform.add_source(v_file)
+            with profile_phase("constraints"):
+                # Get signals and platform constraints
+                self.named_sc, self.named_pc = platform.resolve_signals(self._vns)
+                platform.add_source(v_file)
 
-            # Generate Design Timing Constraints File.
-            tim_cst_file = self.build_timing_constraints(v_output.ns)
+                # Generate Design Timing Constraints File.
+                tim_cst_file = self.build_timing_constraints(v_output.ns)
 
-            # Generate Design IO Constraints File.
-            io_cst_file = self.build_io_constraints()
+                # Generate Design IO Constraints File.
+                io_cst_file = self.build_io_constraints()
 
-            # Generate Design Placement Constraints File.
-            place_cst_file = self.build_placement_constraints()
+                # Generate Design Placement Constraints File.
+                place_cst_file = self.build_placement_constraints()
 
             if build_backend not in self.supported_build_backend:
                 raise NotImplementedError("Build backend {build_backend} is not supported by {toolchain} toolchain".format(
@@ -115,15 +128,18 @@ class GenericToolchain:
 
             # LiteX backend.
             if build_backend == "litex":
-                # Generate project.
-                self.build_project()
+                with profile_phase("project"):
+                    # Generate project.
+                    self.build_project()
 
-                # Generate build script.
-                script = self.build_script()
+                    # Generate build script.
+                    script = self.build_script()
+                    self._script = script
 
                 # Run.
                 if run:
-                    self.run_script(script)
+                    with profile_phase("run"):
+                        self.run_script(script)
 
             # Edalize backend.
             else:
@@ -161,7 +177,8 @@ class GenericToolchain:
                 backend = get_edatool(tool)(edam=edam, work_root=self._build_dir)
                 backend.configure()
                 if run:
-                    backend.build()
+                    with profile_phase("run"):
+                        backend.build()
 
             return v_output.ns
         finally:
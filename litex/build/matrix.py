@@ -0,0 +1,246 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import time
+import shutil
+import traceback
+import multiprocessing
+from multiprocessing.connection import wait
+
+from litex.gen.fhdl.conv_cache import VerilogCache
+
+# Shared Verilog Cache -----------------------------------------------------------------------------
+
+class SharedVerilogCache:
+    """Verilog conversions shared between the builds of a matrix.
+
+    Each build keeps its own VerilogCache; when it misses and another build of the matrix already
+    converted a fragment with the same digest (same design, device and conversion options), the
+    Verilog/data/metadata files of that build are copied and reused instead of converting again.
+    """
+    def __init__(self):
+        self.conversions = {} # digest: (build directory, VerilogCache).
+        self.hits        = 0
+
+    def __call__(self, filename):
+        return _SharedVerilogCacheEntry(self, filename)
+
+
+class _SharedVerilogCacheEntry(VerilogCache):
+    def __init__(self, shared, filename):
+        VerilogCache.__init__(self, filename)
+        self.shared = shared
+
+    def load(self, digest, signals, namespace_cls, reserved_keywords):
+        r = VerilogCache.load(self, digest, signals, namespace_cls, reserved_keywords)
+        if r is not None:
+            self._register(digest, r)
+            return r
+        if digest not in self.shared.conversions:
+            return None
+        src_dir, src = self.shared.conversions[digest]
+        try:
+            for filename in [src.filename, src.metadata, *src.data_files]:
+                shutil.copyfile(os.path.join(src_dir, filename), filename)
+        except OSError:
+            return None
+        r = VerilogCache.load(self, digest, signals, namespace_cls, reserved_keywords)
+        if r is not None:
+            self.shared.hits += 1
+        return r
+
+    def store(self, digest, output, signals):
+        VerilogCache.store(self, digest, output, signals)
+        self._register(digest, output)
+
+    def _register(self, digest, output):
+        self.data_files = list(output.data_files.keys())
+        self.shared.conversions.setdefault(digest, (os.getcwd(), self))
+
+# Build Targets ------------------------------------------------------------------------------------
+
+class BuildTarget:
+    """Build of a design on a platform (GenericPlatform.build).
+
+    `design` is a Module/fragment or a callable returning it, called when the target is generated
+    so that elaboration happens in the matrix (and only for the targets that are built).
+    """
+    def __init__(self, name, platform, design, build_dir=None, build_name="top", **build_kwargs):
+        self.name         = name
+        self.platform     = platform
+        self.design       = design
+        self.build_dir    = os.path.abspath(build_dir or os.path.join("build", name))
+        self.build_name   = build_name
+        self.build_kwargs = build_kwargs
+
+    def generate(self, verilog_cache):
+        design = self.design() if callable(self.design) else self.design
+        self.platform.build(design,
+            build_dir     = self.build_dir,
+            build_name    = self.build_name,
+            run           = False,
+            verilog_cache = verilog_cache,
+            **self.build_kwargs)
+        return self.platform.toolchain
+
+
+class BuilderTarget:
+    """Build of a SoC with a Builder (software, BIOS, gateware...).
+
+    `builder` is a Builder or a callable returning it (elaborating the SoC in the matrix).
+    """
+    def __init__(self, name, builder, **build_kwargs):
+        self.name         = name
+        self.builder      = builder
+        self.build_kwargs = build_kwargs
+        self.build_dir    = None
+
+    def generate(self, verilog_cache):
+        builder = self.builder() if callable(self.builder) else self.builder
+        self.build_dir = builder.gateware_dir
+        builder.build(run=False, verilog_cache=verilog_cache, **self.build_kwargs)
+        return builder.soc.platform.toolchain
+
+# Build Matrix -------------------------------------------------------------------------------------
+
+def _run_toolchain_script(toolchain, build_dir, log):
+    # Run the toolchain script in build_dir with its output (and the one of its sub-processes)
+    # redirected to the target's log, return the exit code.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    cwd   = os.getcwd()
+    saved = (sys.stdout, sys.stderr, os.dup(1), os.dup(2))
+    fd    = os.open(log, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    os.close(fd)
+    sys.stdout = os.fdopen(1, "w", buffering=1, closefd=False)
+    sys.stderr = os.fdopen(2, "w", buffering=1, closefd=False)
+    try:
+        os.chdir(build_dir)
+        toolchain.run_script(toolchain._script)
+        return 0
+    except (Exception, SystemExit):
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = saved[:2]
+        os.dup2(saved[2], 1)
+        os.dup2(saved[3], 2)
+        os.close(saved[2])
+        os.close(saved[3])
+        os.chdir(cwd)
+
+def _run_toolchain_process(toolchain, build_dir, log):
+    # Executed in a forked process.
+    sys.exit(_run_toolchain_script(toolchain, build_dir, log))
+
+
+class BuildMatrix:
+    """Build a matrix of targets (boards, toolchains, variants...).
+
+    Targets are generated sequentially (elaboration, Verilog conversion shared between targets
+    with identical fragments, constraints and build scripts), then the toolchain scripts are run
+    concurrently (at most `jobs` at a time) in forked processes, each logging to
+    <log_dir>/<target>.log (default log_dir: the target's build directory). Without fork support
+    (ex: Windows), the toolchain scripts are run sequentially. Failures are reported per target and
+    do not stop the other builds.
+    """
+    def __init__(self, targets, jobs=None, log_dir=None):
+        names = [t.name for t in targets]
+        if len(set(names)) != len(names):
+            raise ValueError("Build matrix target names must be unique.")
+        self.targets       = targets
+        self.jobs          = jobs or os.cpu_count()
+        self.log_dir       = log_dir
+        self.verilog_cache = SharedVerilogCache()
+
+    def _log(self, target):
+        log_dir = self.log_dir or target.build_dir
+        os.makedirs(log_dir, exist_ok=True)
+        return os.path.abspath(os.path.join(log_dir, target.name + ".log"))
+
+    def generate(self, target, result):
+        start = time.monotonic()
+        try:
+            toolchain = target.generate(self.verilog_cache)
+            if getattr(toolchain, "_script", None) is None:
+                raise OSError("Toolchain of {} has no build script to run.".format(target.name))
+        except Exception:
+            toolchain = None
+            result["status"] = "fail"
+            result["error"]  = traceback.format_exc().strip().splitlines()[-1]
+        result["generate_time"] = time.monotonic() - start
+        return toolchain
+
+    def _done(self, result, exitcode, run_start, log):
+        result["run_time"] = time.monotonic() - run_start
+        if exitcode != 0:
+            result["status"] = "fail"
+            result["error"]  = "Toolchain failed with {}, see {}.".format(exitcode, result["log"])
+        log("[matrix] {}: {}.".format(result["name"], result["status"]))
+
+    def run(self, log=print):
+        start      = time.monotonic()
+        results    = []
+        toolchains = {}
+
+        # Generate all targets (sequential: elaboration/conversion are in-process).
+        for target in self.targets:
+            result = {"name": target.name, "status": "pass", "error": None,
+                "generate_time": 0.0, "run_time": 0.0, "log": None}
+            results.append(result)
+            log("[matrix] {}: generating...".format(target.name))
+            toolchain = self.generate(target, result)
+            if toolchain is not None:
+                toolchains[target.name] = toolchain
+                result["log"] = self._log(target)
+
+        # Run toolchain scripts concurrently, in forked processes (sequentially when fork is not
+        # supported, ex: on Windows).
+        pending = [(t, r) for t, r in zip(self.targets, results) if t.name in toolchains]
+        if "fork" not in multiprocessing.get_all_start_methods():
+            log("[matrix] fork not supported, running toolchains sequentially.")
+            for target, result in pending:
+                log("[matrix] {}: running toolchain (log: {})...".format(target.name, result["log"]))
+                run_start = time.monotonic()
+                exitcode  = _run_toolchain_script(toolchains[target.name], target.build_dir, result["log"])
+                self._done(result, exitcode, run_start, log)
+        else:
+            ctx     = multiprocessing.get_context("fork")
+            running = {}
+            while pending or running:
+                while pending and len(running) < self.jobs:
+                    target, result = pending.pop(0)
+                    log("[matrix] {}: running toolchain (log: {})...".format(target.name, result["log"]))
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    p = ctx.Process(target=_run_toolchain_process,
+                        args=(toolchains[target.name], target.build_dir, result["log"]))
+                    p.start()
+                    running[p.sentinel] = (p, result, time.monotonic())
+                for sentinel in wait(list(running.keys())):
+                    p, result, run_start = running.pop(sentinel)
+                    p.join()
+                    self._done(result, p.exitcode, run_start, log)
+        log(format_build_matrix_summary(results, elapsed=time.monotonic() - start))
+        return results
+
+# Summary ------------------------------------------------------------------------------------------
+
+def format_build_matrix_summary(results, elapsed=None):
+    lines = ["{:<24} {:>14} {:>10} {:>6}  {}".format("Target", "Generate (s)", "Run (s)", "Status", "Error")]
+    for r in results:
+        lines.append("{:<24} {:>14.2f} {:>10.2f} {:>6}  {}".format(
+            r["name"], r["generate_time"], r["run_time"], r["status"], r["error"] or ""))
+    passed = sum(r["status"] == "pass" for r in results)
+    lines.append("{}/{} target(s) passed{}.".format(passed, len(results),
+        "" if elapsed is None else " in {:.2f}s".format(elapsed)))
+    return "\n".join(lines)
@@ -0,0 +1,111 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import json
+import time
+import contextlib
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Helpers ------------------------------------------------------------------------------------------
+
+_active_profiler = None
+
+PROFILE_ENV = "LITEX_PROFILE"
+
+
+def _peak_rss_mb():
+    """Peak RSS (MB) of the process and of its waited-for children (toolchains)."""
+    if resource is None:
+        return None, None
+    # ru_maxrss is in kB on Linux and in bytes on macOS.
+    scale = 1/(1024*1024) if sys.platform == "darwin" else 1/1024
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*scale,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss*scale,
+    )
+
+
+def _cpu_times():
+    t = os.times()
+    return t.user + t.system, t.children_user + t.children_system
+
+
+def profile_enabled_from_env():
+    return os.getenv(PROFILE_ENV, "0") not in ["", "0"]
+
+# Build Profiler -----------------------------------------------------------------------------------
+
+class BuildProfiler:
+    """Per-phase wall time, CPU time and peak RSS of a build.
+
+    Phases are nested context managers; each one records its wall time, the CPU time of the
+    process and of the children it waited for (toolchains, compilers) and the peak RSS of both at
+    the end of the phase (peaks are process-wide, so a phase's peak includes its parents').
+    """
+    def __init__(self):
+        self.phases = []
+        self.stack  = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        # Phases are reported in start order: reserve the entry now, fill it at the end.
+        entry = {"phase": "/".join(self.stack + [name]), "depth": len(self.stack)}
+        self.phases.append(entry)
+        self.stack.append(name)
+        wall_start = time.perf_counter()
+        cpu_start, children_cpu_start = _cpu_times()
+        try:
+            yield
+        finally:
+            cpu_end, children_cpu_end = _cpu_times()
+            rss, children_rss = _peak_rss_mb()
+            self.stack.pop()
+            entry.update({
+                "wall_s"               : round(time.perf_counter() - wall_start, 6),
+                "cpu_s"                : round(cpu_end - cpu_start, 6),
+                "children_cpu_s"       : round(children_cpu_end - children_cpu_start, 6),
+                "peak_rss_mb"          : None if rss          is None else round(rss, 1),
+                "children_peak_rss_mb" : None if children_rss is None else round(children_rss, 1),
+            })
+
+    def to_dict(self):
+        return {"version": 1, "phases": self.phases}
+
+    def write(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+# Active Profiler ----------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def build_profile_context(enabled, filename):
+    """Activate a BuildProfiler for the duration of a build and write its JSON report."""
+    global _active_profiler
+    if not enabled or _active_profiler is not None:
+        yield None
+        return
+    profiler = _active_profiler = BuildProfiler()
+    try:
+        with profiler.phase("build"):
+            yield profiler
+    finally:
+        _active_profiler = None
+        if filename is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+            profiler.write(filename)
+
+
+def profile_phase(name):
+    """Context manager recording `name` as a phase of the active build profile (if any)."""
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.phase(name)
@@ -0,0 +1,157 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import re
+import json
+import time
+import shutil
+import resource
+import subprocess
+
+from litex.build.sim import verilator
+
+# Helpers ------------------------------------------------------------------------------------------
+
+_time_units = {"ns": 1e-9, "us": 1e-6, "ms": 1e-3, "s": 1}
+_summary_re = re.compile(r"simulated=([\d.]+)(ns|us|ms|s), elapsed=([\d.]+)(ns|us|ms|s)")
+
+def parse_sim_summary(output):
+    """Return (simulated_s, elapsed_s) from the [sim] summary line of a simulation, or None."""
+    matches = _summary_re.findall(output)
+    if not matches:
+        return None
+    simulated, simulated_unit, elapsed, elapsed_unit = matches[-1]
+    return float(simulated)*_time_units[simulated_unit], float(elapsed)*_time_units[elapsed_unit]
+
+def get_benchmark_variants(threads=(1,), opt_levels=("O3",)):
+    """Return the benchmark variants: every combination of threads and optimization levels."""
+    return [{"name": "threads{}_{}".format(t, o), "threads": int(t), "opt_level": o}
+        for t in threads for o in opt_levels]
+
+def _children_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+# Simulation Benchmark -----------------------------------------------------------------------------
+
+class SimBenchmark:
+    """Benchmark a Verilator simulation over several build variants (threads, optimization level).
+
+    The simulation is generated once in build_dir (build=True, run=False) and each variant is then
+    compiled in build_dir/benchmark/<variant>/ (kept between runs: incremental builds only rebuild
+    what changed) and run for a fixed number of sys_clk cycles. Variants are run sequentially to
+    keep measurements independent.
+
+    Memory init files (ROM/RAM contents loaded with $readmemh relative to the simulation directory)
+    are linked in each variant directory so that variants run the same software.
+    """
+    files      = ["sim_init.cpp", "sim_header.h", "variables.mak", "sim_config.js"]
+    data_files = [".hex", ".init", ".bin"]
+
+    def __init__(self, build_dir, sources, sys_clk_freq, cycles=1_000_000, build_name="sim",
+        jobs=None, modules=None, extra_files=None, build_kwargs=None):
+        self.build_dir    = os.path.abspath(build_dir)
+        self.sources      = sources
+        self.sys_clk_freq = sys_clk_freq
+        self.cycles       = cycles
+        self.build_name   = build_name
+        self.jobs         = jobs
+        self.modules      = modules
+        self.extra_files  = extra_files
+        self.build_kwargs = build_kwargs or {}
+
+    def _compile(self, variant, directory):
+        os.makedirs(directory, exist_ok=True)
+        for f in self.files:
+            if os.path.exists(os.path.join(self.build_dir, f)):
+                shutil.copyfile(os.path.join(self.build_dir, f), os.path.join(directory, f))
+        for f in os.listdir(self.build_dir):
+            if os.path.splitext(f)[1] in self.data_files:
+                link = os.path.join(directory, f)
+                if os.path.lexists(link):
+                    os.remove(link)
+                os.symlink(os.path.join(self.build_dir, f), link)
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            verilator._build_sim(self.build_name, self.sources,
+                jobs        = self.jobs,
+                threads     = variant["threads"],
+                coverage    = False,
+                opt_level   = variant["opt_level"],
+                incremental = True,
+                modules     = self.modules,
+                extra_files = self.extra_files,
+                **self.build_kwargs,
+            )
+            start = time.monotonic()
+            verilator._compile_sim(self.build_name, verbose=False)
+            return time.monotonic() - start
+        finally:
+            os.chdir(cwd)
+
+    def _run(self, directory):
+        cpu_start  = _children_cpu_time()
+        wall_start = time.monotonic()
+        # Console input is kept open (but idle) until the cycle budget is reached.
+        p = subprocess.Popen([os.path.join(directory, "obj_dir", "Vsim")],
+            cwd    = directory,
+            env    = {**os.environ, "LITEX_SIM_MAX_TIME_PS": str(int(self.cycles*1e12/self.sys_clk_freq))},
+            stdin  = subprocess.PIPE,
+            stdout = subprocess.PIPE,
+            stderr = subprocess.STDOUT,
+        )
+        output = p.stdout.read().decode("utf-8", errors="replace")
+        p.stdin.close()
+        p.stdout.close()
+        p.wait()
+        wall = time.monotonic() - wall_start
+        cpu  = _children_cpu_time() - cpu_start
+        with open(os.path.join(directory, "benchmark.log"), "w") as f:
+            f.write(output)
+        if p.returncode != 0:
+            raise OSError("Benchmark simulation failed with {}, see {}.".format(
+                p.returncode, os.path.join(directory, "benchmark.log")))
+        summary = parse_sim_summary(output)
+        # Prefer the simulation loop time reported by the simulation (excludes startup).
+        elapsed = summary[1] if summary is not None and summary[1] > 0 else wall
+        return elapsed, wall, cpu
+
+    def run(self, variants, log=print):
+        results = []
+        for variant in variants:
+            directory  = os.path.join(self.build_dir, "benchmark", variant["name"])
+            log("[benchmark] {}: building...".format(variant["name"]))
+            build_time = self._compile(variant, directory)
+            log("[benchmark] {}: running {} cycles...".format(variant["name"], self.cycles))
+            elapsed, wall, cpu = self._run(directory)
+            results.append({
+                **variant,
+                "cycles"        : self.cycles,
+                "build_time_s"  : round(build_time, 3),
+                "elapsed_s"     : round(elapsed, 3),
+                "sim_khz"       : round(self.cycles/elapsed/1e3, 3),
+                "cpu_percent"   : round(100*cpu/wall, 1),
+            })
+        return results
+
+# Report -------------------------------------------------------------------------------------------
+
+def format_benchmark_results(results):
+    """Format benchmark results as a table (fastest variant marked with *)."""
+    best = max(results, key=lambda r: r["sim_khz"]) if results else None
+    lines = ["{:<20} {:>8} {:>6} {:>12} {:>12} {:>12} {:>8}".format(
+        "Variant", "Threads", "Opt", "Build (s)", "Run (s)", "Speed (kHz)", "CPU (%)")]
+    for r in results:
+        lines.append("{:<20} {:>8} {:>6} {:>12.2f} {:>12.2f} {:>12.2f} {:>8.1f}{}".format(
+            r["name"], r["threads"], r["opt_level"], r["build_time_s"], r["elapsed_s"],
+            r["sim_khz"], r["cpu_percent"], " *" if r is best else ""))
+    return "\n".join(lines)
+
+def write_benchmark_results(results, filename):
+    with open(filename, "w") as f:
+        json.dump(results, f, indent=4)
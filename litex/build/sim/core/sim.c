@@ -34,6 +34,7 @@ struct session_list_s {
 
 uint64_t timebase_ps = 1;
 uint64_t sim_time_ps = 0;
+static uint64_t sim_max_time_ps = 0;
 static double sim_start_time_s = 0.0;
 static int sim_started = 0;
 static int sim_stop_signal = 0;
@@ -443,7 +444,7 @@ static void cb(int sock, short which, void *arg)
 
     sim_time_ps += timebase_ps;
 
-    if (litex_sim_got_finish()) {
+    if (litex_sim_got_finish() || (sim_max_time_ps && sim_time_ps >= sim_max_time_ps)) {
         event_base_loopbreak(base);
         break;
     }
@@ -497,6 +498,12 @@ int main(int argc, char *argv[])
 #endif
 #endif
 
+  /* Optional simulated time budget (benchmarks, regressions). */
+  if(getenv("LITEX_SIM_MAX_TIME_PS") != NULL)
+  {
+    sim_max_time_ps = strtoull(getenv("LITEX_SIM_MAX_TIME_PS"), NULL, 0);
+  }
+
   litex_sim_init_cmdargs(argc, argv);
   if(RC_OK != (ret = litex_sim_initialize_all(&vsim, base)))
   {
@@ -4,6 +4,9 @@
 #include <stdlib.h>
 #include <string.h>
 #include <stdint.h>
+#ifndef _WIN32
+#include <signal.h>
+#endif
 #include "Vsim.h"
 #include "verilated.h"
 
@@ -71,6 +74,24 @@ static void litex_sim_call_user_post_eval(void *vsim, uint64_t time_ps)
 #endif
 
 #ifdef SAVABLE
+/* Snapshots: save/load times and files can be overridden at runtime (see litex_sim_init_runtime). */
+static const char *save_file = "sim_default.vlt";
+static const char *load_file = "sim_default.vlt";
+static bool save_exit = false;
+static bool load_at_start = false;
+static bool saved = false;
+static bool restored = false;
+static uint64_t time_offset = 0;
+#ifndef _WIN32
+static volatile sig_atomic_t save_requested = 0;
+
+static void litex_sim_save_signal_cb(int signum)
+{
+  (void)signum;
+  save_requested = 1;
+}
+#endif
+
 static void litex_sim_save_state(void *vsim, const char *filename);
 static void litex_sim_restore_state(void *vsim, const char *filename);
 #endif
@@ -98,20 +119,38 @@ static void litex_sim_tracer_close(void)
 extern "C" void litex_sim_eval(void *vsim, uint64_t time_ps)
 {
 #ifdef SAVABLE
-  if (main_time == load_time && load_time > 0) {
-    printf("MDEBUG: Restoring state at time %ld\n", load_time);
-    litex_sim_restore_state(vsim, "sim_default.vlt");
+  if (!restored && (load_at_start || (load_time > 0 && main_time >= load_time))) {
+    restored = true;
+    litex_sim_restore_state(vsim, load_file);
+    /* Keep simulated time continuous with the snapshot. */
+    time_offset = main_time - time_ps;
+    printf("MDEBUG: Restored state at time %ld from %s\n", main_time, load_file);
   }
-  if (main_time == save_time) {
-    printf("MDEBUG: Saving state at time %ld\n", save_time);
-    litex_sim_save_state(vsim, "sim_default.vlt");
+  bool save_now = !saved && main_time >= save_time;
+#ifndef _WIN32
+  if (save_requested) {
+    save_requested = 0;
+    save_now = true;
+  }
+#endif
+  if (save_now) {
+    saved = true;
+    printf("MDEBUG: Saving state at time %ld to %s\n", main_time, save_file);
+    fflush(stdout);
+    litex_sim_save_state(vsim, save_file);
+    if (save_exit)
+      Verilated::gotFinish(true);
   }
 #endif
   Vsim *sim = (Vsim *)vsim;
   litex_sim_call_user_pre_eval(sim, time_ps);
   sim->eval();
   litex_sim_call_user_post_eval(sim, time_ps);
+#ifdef SAVABLE
+  main_time = time_ps + time_offset;
+#else
   main_time = time_ps;
+#endif
 }
 
 extern "C" void litex_sim_init_cmdargs(int argc, char *argv[])
@@ -123,6 +162,23 @@ extern "C" void litex_sim_init_runtime(long load_start, long save_start)
 {
   save_time = save_start;
   load_time = load_start;
+#ifdef SAVABLE
+  const char *env;
+  if ((env = getenv("LITEX_SIM_SAVE_TIME")) != NULL)
+    save_time = strtoull(env, NULL, 0);
+  if ((env = getenv("LITEX_SIM_SAVE_FILE")) != NULL)
+    save_file = env;
+  if ((env = getenv("LITEX_SIM_SAVE_EXIT")) != NULL)
+    save_exit = atoi(env) != 0;
+  if ((env = getenv("LITEX_SIM_LOAD_FILE")) != NULL) {
+    load_file = env;
+    load_at_start = true;
+  }
+#ifndef _WIN32
+  /* SIGUSR1 requests a snapshot at the next evaluation. */
+  signal(SIGUSR1, litex_sim_save_signal_cb);
+#endif
+#endif
   printf("MDEBUG: Save time: %ld, load_time: %ld\n", save_time, load_time);
 }
 
@@ -0,0 +1,234 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import re
+import json
+import time
+import shutil
+import signal
+import selectors
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from litex.build.sim import verilator
+
+# Helpers ------------------------------------------------------------------------------------------
+
+_saved_re = re.compile(rb"MDEBUG: Saving state at time (\d+)")
+
+def _run_vsim(cmd, cwd, env, log, stdin=None, until=None, on_match=None, timeout=None):
+    """Run the simulation, logging its output and watching it for the `until` pattern.
+
+    on_match(proc) is called once when `until` is found in the output (default: interrupt the
+    simulation). The simulation is also interrupted after `timeout` seconds. Returns (returncode,
+    matched, output).
+    """
+    if on_match is None:
+        on_match = lambda proc: proc.send_signal(signal.SIGINT)
+    until    = until.encode() if isinstance(until, str) else until
+    output   = bytearray()
+    matched  = False
+    deadline = None if timeout is None else time.monotonic() + timeout
+    proc = subprocess.Popen(cmd,
+        cwd    = cwd,
+        env    = {**os.environ, **env},
+        stdin  = subprocess.PIPE,
+        stdout = subprocess.PIPE,
+        stderr = subprocess.STDOUT,
+    )
+    try:
+        if stdin:
+            proc.stdin.write(stdin.encode() if isinstance(stdin, str) else stdin)
+            proc.stdin.flush()
+        with open(log, "wb") as f, selectors.DefaultSelector() as sel:
+            sel.register(proc.stdout, selectors.EVENT_READ)
+            while True:
+                if deadline is not None and time.monotonic() > deadline:
+                    deadline = None
+                    proc.send_signal(signal.SIGINT)
+                if not sel.select(timeout=0.1):
+                    continue
+                data = os.read(proc.stdout.fileno(), 65536)
+                if not data:
+                    break
+                f.write(data)
+                f.flush()
+                # Only search the new data (and a pattern-sized overlap with the previous one).
+                search_start = max(len(output) - len(until) + 1, 0) if until else 0
+                output += data
+                if until and not matched and output.find(until, search_start) >= 0:
+                    matched = True
+                    on_match(proc)
+        returncode = proc.wait()
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        proc.stdin.close()
+        proc.stdout.close()
+    return returncode, matched, bytes(output)
+
+# Simulation Snapshots -----------------------------------------------------------------------------
+
+class SimSnapshots:
+    """Named snapshots of a savable Verilator simulation (litex_sim).
+
+    Snapshots (Verilator save files) are stored in <build_dir>/snapshots/ with a JSON description
+    (simulated time, parent snapshot, digest of the simulation build). A snapshot can be taken at
+    a given simulated time or when a pattern shows up on the console (BIOS prompt, Linux login...)
+    and restored into N parallel simulation processes (forks), each with its own stimuli, so that
+    a long boot is only simulated once.
+    """
+    def __init__(self, build_dir, build_name="sim"):
+        self.build_dir  = os.path.abspath(build_dir)
+        self.build_name = build_name
+        self.directory  = os.path.join(self.build_dir, "snapshots")
+        self.forks_dir  = os.path.join(self.build_dir, "forks")
+        self.vsim       = os.path.join(self.build_dir, "obj_dir", "Vsim")
+
+    def compile(self, verbose=False):
+        """Compile the simulation (build=True, run=False) without running it."""
+        cwd = os.getcwd()
+        os.chdir(self.build_dir)
+        try:
+            verilator._compile_sim(self.build_name, verbose)
+        finally:
+            os.chdir(cwd)
+
+    def get_digest(self):
+        try:
+            with open(os.path.join(self.build_dir, verilator._sim_digest_file), "r") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def get_filename(self, name):
+        if not name or os.sep in name or name.startswith(".") or (os.altsep and os.altsep in name):
+            raise ValueError("Invalid snapshot name: {}.".format(name))
+        return os.path.join(self.directory, name + ".vlt")
+
+    def get(self, name):
+        filename = self.get_filename(name)
+        try:
+            with open(filename[:-len(".vlt")] + ".json", "r") as f:
+                snapshot = json.load(f)
+        except OSError:
+            raise ValueError("No snapshot named {} in {}.".format(name, self.directory))
+        snapshot["filename"] = filename
+        snapshot["size"]     = os.path.getsize(filename)
+        return snapshot
+
+    def list(self):
+        """Return the snapshots, ordered by simulated time."""
+        if not os.path.isdir(self.directory):
+            return []
+        snapshots = [self.get(f[:-len(".json")]) for f in os.listdir(self.directory) if f.endswith(".json")]
+        return sorted(snapshots, key=lambda s: (s["time_ps"], s["name"]))
+
+    def remove(self, name):
+        filename = self.get_filename(name)
+        for f in [filename, filename[:-len(".vlt")] + ".json"]:
+            if os.path.exists(f):
+                os.remove(f)
+
+    def _check_snapshot(self, name):
+        snapshot = self.get(name)
+        digest   = self.get_digest()
+        if None not in [digest, snapshot["digest"]] and digest != snapshot["digest"]:
+            raise ValueError("Snapshot {} was saved from a different simulation build.".format(name))
+        return snapshot
+
+    def save(self, name, time_ps=None, until=None, restore=None, stdin=None, timeout=None):
+        """Run the simulation and save snapshot `name` at time_ps or when `until` is printed.
+
+        The simulation starts from snapshot `restore` when provided (time_ps is then absolute) and
+        exits once the snapshot is saved.
+        """
+        if (time_ps is None) == (until is None):
+            raise ValueError("Snapshot {} needs either a time or an until pattern.".format(name))
+        filename = self.get_filename(name)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_filename = filename + ".tmp"
+        env = {
+            "LITEX_SIM_SAVE_FILE" : tmp_filename,
+            "LITEX_SIM_SAVE_EXIT" : "1",
+        }
+        if time_ps is not None:
+            env["LITEX_SIM_SAVE_TIME"] = str(int(time_ps))
+        if restore is not None:
+            env["LITEX_SIM_LOAD_FILE"] = self._check_snapshot(restore)["filename"]
+
+        log = os.path.join(self.directory, name + ".log")
+        returncode, matched, output = _run_vsim([self.vsim],
+            cwd      = self.build_dir,
+            env      = env,
+            log      = log,
+            stdin    = stdin,
+            until    = until,
+            on_match = lambda proc: proc.send_signal(signal.SIGUSR1),
+            timeout  = timeout,
+        )
+        saved = _saved_re.findall(output)
+        if not saved or not os.path.exists(tmp_filename):
+            raise OSError("Snapshot {} not saved (simulation must be built savable), see {}.".format(name, log))
+        os.replace(tmp_filename, filename)
+        snapshot = {
+            "name"    : name,
+            "time_ps" : int(saved[-1]),
+            "parent"  : restore,
+            "until"   : until,
+            "digest"  : self.get_digest(),
+            "created" : time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(filename[:-len(".vlt")] + ".json", "w") as f:
+            json.dump(snapshot, f, indent=4)
+        return self.get(name)
+
+    def fork(self, name, stimuli, jobs=None):
+        """Restore snapshot `name` into one simulation process per stimulus, in parallel.
+
+        Each stimulus is a dict with optional keys:
+        - name       : fork name (default: index), the fork runs in <build_dir>/forks/<name>/.
+        - stdin      : console input (str/bytes) sent to the simulation (serial2console).
+        - env        : extra environment variables (for user C++ sources/modules).
+        - sim_config : sim_config.js to use (default: the one of the build).
+        - until      : stop the simulation when this pattern is printed (test verdict).
+        - timeout    : stop the simulation after this number of seconds.
+        Returns a list of dicts (name, directory, log, returncode, matched, elapsed).
+        """
+        snapshot = self._check_snapshot(name)
+
+        def run(index, stimulus):
+            fork_name = str(stimulus.get("name", index))
+            directory = os.path.join(self.forks_dir, fork_name)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory)
+            os.symlink(os.path.join(self.build_dir, "modules"), os.path.join(directory, "modules"))
+            shutil.copyfile(stimulus.get("sim_config", os.path.join(self.build_dir, "sim_config.js")),
+                os.path.join(directory, "sim_config.js"))
+            log   = os.path.join(directory, "sim.log")
+            start = time.monotonic()
+            returncode, matched, _ = _run_vsim([self.vsim],
+                cwd     = directory,
+                env     = {**stimulus.get("env", {}), "LITEX_SIM_LOAD_FILE": snapshot["filename"]},
+                log     = log,
+                stdin   = stimulus.get("stdin"),
+                until   = stimulus.get("until"),
+                timeout = stimulus.get("timeout"),
+            )
+            return {
+                "name"       : fork_name,
+                "directory"  : directory,
+                "log"        : log,
+                "returncode" : returncode,
+                "matched"    : matched,
+                "elapsed"    : time.monotonic() - start,
+            }
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            return list(executor.map(run, range(len(stimuli)), stimuli))
@@ -6,6 +6,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import argparse
+import hashlib
 import os
 import re
 import signal
@@ -231,14 +232,57 @@ def _generate_sim_config(config):
     tools.write_to_file("sim_config.js", content)
 
 
+_sim_digest_file = os.path.join("obj_dir", "litex_sim.sha256")
+
+
+def _sim_digest(cc_files, make_args, modules=None, extra_files=None):
+    """SHA256 of everything the Verilator executable is built from.
+
+    Covers the generated Verilog, sim_init.cpp/sim_header.h/variables.mak, the user C++ sources,
+    the sim core/modules sources, the make arguments and the set of sim modules. sim_config.js
+    itself is parsed at runtime by Vsim, so only its module set is part of the digest; memory
+    init files (.hex/.init/.bin) are also loaded at runtime and are not part of it.
+    """
+    h = hashlib.sha256()
+    def update_file(filename):
+        h.update(os.path.abspath(filename).encode() + b"\0")
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(2**20), b""):
+                h.update(chunk)
+    core_files = []
+    for root, dirs, files in os.walk(core_directory):
+        dirs.sort()
+        core_files += [os.path.join(root, f) for f in sorted(files)
+            if Path(f).suffix in [".c", ".cpp", ".h", ".mak"] or f == "Makefile"]
+    for filename in [*cc_files, "sim_init.cpp", "sim_header.h", "variables.mak", *(extra_files or []), *core_files]:
+        if os.path.exists(filename):
+            update_file(filename)
+    h.update(" ".join(make_args).encode() + b"\0")
+    h.update(" ".join(sorted(set(modules or []))).encode())
+    return h.hexdigest()
+
+
+def _sim_build_is_up_to_date(digest):
+    if not os.path.exists(os.path.join("obj_dir", "Vsim")):
+        return False
+    try:
+        with open(_sim_digest_file, "r") as f:
+            return f.read().strip() == digest
+    except OSError:
+        return False
+
+
 def _build_sim(build_name, sources, jobs, threads, coverage, opt_level="O3",
-        trace=False, trace_fst=False, video=False, savable=False):
+        trace=False, trace_fst=False, video=False, savable=False,
+        incremental=False, ccache=False, modules=None, extra_files=None):
     makefile = os.path.join(core_directory, "Makefile")
 
-    cc_srcs = []
+    cc_srcs  = []
+    cc_files = []
     for filename, language, library, *copy in sources:
-        if Path(filename).suffix not in [".hex", ".init"]:
+        if Path(filename).suffix not in [".hex", ".init", ".bin"]:
             cc_srcs.append("--cc " + filename + " ")
+            cc_files.append(filename)
 
     make_args = [
         'CC_SRCS="{}"'.format("".join(cc_srcs)),
@@ -252,10 +296,33 @@ def _build_sim(build_name, sources, jobs, threads, coverage, opt_level="O3",
         "SAVABLE=1" if savable else "",
     ]
 
-    build_script_contents = """\
+    # Use ccache for the compilation of the Verilated C++ sources (when available).
+    objcache = ""
+    if ccache:
+        if which("ccache") is None:
+            print("ccache not found, compiling without it.")
+        else:
+            objcache = "OBJCACHE=ccache"
+
+    # Reuse obj_dir when nothing the Verilator executable is built from changed.
+    digest = _sim_digest(cc_files,
+        make_args   = [arg for arg in make_args if arg and not arg.startswith("JOBS=")],
+        modules     = modules,
+        extra_files = extra_files,
+    )
+    if incremental and _sim_build_is_up_to_date(digest):
+        print("Verilator inputs unchanged (sha256: {}), reusing obj_dir/.".format(digest[:16]))
+        build_script_contents = """\
+# Verilator inputs unchanged (sha256: {}), reusing obj_dir/.
+""".format(digest)
+    else:
+        if incremental:
+            reason = "changed" if os.path.exists(_sim_digest_file) else "not built yet"
+            print("Verilator inputs {} (sha256: {}), rebuilding obj_dir/.".format(reason, digest[:16]))
+        build_script_contents = """\
 rm -rf obj_dir/
-make -C . -f {} {}
-""".format(makefile, " ".join(arg for arg in make_args if arg))
+make -C . -f {} {} && echo {} > {}
+""".format(makefile, " ".join(arg for arg in make_args + [objcache] if arg), digest, _sim_digest_file)
     build_script_file = "build_" + build_name + ".sh"
     tools.write_to_file(build_script_file, build_script_contents, force_unix=True)
 
@@ -333,13 +400,17 @@ class SimVerilatorToolchain:
             trace_end        = -1,
             trace_timescale  = "1ps",
             hierarchical     = False,
+            memory_init_format = "hex",
             interactive      = True,
             pre_run_callback = None,
             extra_mods       = None,
             extra_mods_path  = "",
             load_start       = 0,
             save_start       = -1,
+            savable          = False,
             verilator_extra_sources = None,
+            incremental      = False,
+            ccache           = False,
             **kwargs):
 
         verilator_extra_sources = _normalize_verilator_extra_sources(verilator_extra_sources)
@@ -357,8 +428,9 @@ class SimVerilatorToolchain:
 
                 # Generate verilog
                 v_output = platform.get_verilog(fragment,
-                    name         = build_name,
-                    hierarchical = hierarchical,
+                    name               = build_name,
+                    hierarchical       = hierarchical,
+                    memory_init_format = memory_init_format,
                 )
                 named_sc, named_pc = platform.resolve_signals(v_output.ns)
                 v_file = build_name + ".v"
@@ -393,8 +465,8 @@ class SimVerilatorToolchain:
                     _generate_sim_config(sim_config)
 
                 # Build
-                # Set SAVABLE=1 if load_start != 0 and save_start != -1
-                savable = (load_start != 0 or save_start != -1)
+                # Set SAVABLE=1 if load_start != 0 and save_start != -1 (or for snapshots).
+                savable = savable or (load_start != 0 or save_start != -1)
                 _build_sim(
                     build_name = build_name,
                     sources    = platform.sources,
@@ -406,6 +478,10 @@ class SimVerilatorToolchain:
                     trace_fst  = trace_fst,
                     video      = video,
                     savable    = savable,
+                    incremental = incremental,
+                    ccache      = ccache,
+                    modules     = [m["module"] for m in sim_config.modules] if sim_config else None,
+                    extra_files = verilator_extra_sources,
                 )
 
             # Run
@@ -452,9 +528,14 @@ def verilator_build_args(parser):
     toolchain_group.add_argument("--opt-level",    default="O3",        help="Compilation optimization level.")
     toolchain_group.add_argument("--load-start",   default="0",         help="Time to restore simulation state (ps).")
     toolchain_group.add_argument("--save-start",   default="-1",        help="Time to save simulation state (ps).")
+    toolchain_group.add_argument("--memory-init-format", default="hex", choices=["hex", "bin"],
+                                 help="Memory init files format (bin: raw images loaded with $fread).")
     toolchain_group.add_argument("--verilator-extra-source", action="append", default=[],
                                  dest="verilator_extra_sources",
                                  help="Add user C++ source to the Verilator simulation executable.")
+    toolchain_group.add_argument("--no-incremental", action="store_true",
+                                 help="Always rebuild the simulation (default: reuse obj_dir when Verilator inputs are unchanged).")
+    toolchain_group.add_argument("--ccache",       action="store_true", help="Use ccache to compile the Verilated C++ sources.")
 
 
 def verilator_build_argdict(args):
@@ -469,5 +550,8 @@ def verilator_build_argdict(args):
         "opt_level"   : args.opt_level,
         "load_start"  : int(float(args.load_start)),
         "save_start"  : int(float(args.save_start)),
+        "memory_init_format" : args.memory_init_format,
         "verilator_extra_sources" : args.verilator_extra_sources,
+        "incremental" : not args.no_incremental,
+        "ccache"      : args.ccache,
     }
@@ -0,0 +1,247 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import json
+import types
+import hashlib
+
+import migen
+from migen.fhdl.structure import Signal, _Fragment
+
+from litex.gen.fhdl.conv_output import ConvOutput, data_file_digest
+
+# Helpers ------------------------------------------------------------------------------------------
+
+# Bump when the digest or the cache file format changes.
+_CACHE_VERSION = 1
+
+# Attributes not describing the design (unique ids, back-references to the platform).
+_skipped_attributes = {"duid", "platform"}
+
+
+def _sha256(data):
+    return hashlib.sha256(data.encode() if isinstance(data, str) else data).hexdigest()
+
+
+def _generator_digest():
+    """Digest of the Verilog generator itself (LiteX FHDL sources and Migen specials)."""
+    h = hashlib.sha256()
+    directories = [os.path.dirname(__file__), os.path.dirname(migen.fhdl.__file__)]
+    for directory in directories:
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".py"):
+                with open(os.path.join(directory, filename), "rb") as f:
+                    h.update(filename.encode() + b"\0" + f.read())
+    return h.hexdigest()
+
+# Fragment Digest ----------------------------------------------------------------------------------
+
+class _FragmentDigest:
+    """Canonical serialization of a (lowered) fragment, hashed.
+
+    Signals are identified by their rank among `signals` (sorted by duid, i.e. creation order,
+    which is what the namer uses) instead of their duid, and the instance numbers of their
+    backtraces are replaced by their rank among the numbers used with the same name (the namer
+    only depends on their order), so the digest is stable across runs of the same design. Other
+    objects are serialized from their attributes; unordered containers of
+    objects with a duid are serialized in duid order and other sets in serialized order. Unknown
+    values fall back to repr(): this can only cause spurious misses, never stale hits.
+    """
+    def __init__(self, signals):
+        self.ranks   = {s: i for i, s in enumerate(signals)}
+        self.numbers = {}
+        self.memo    = {}
+        self.keep  = []
+        self.hash  = hashlib.sha256()
+        self.parts = []
+        numbers = {}
+        for signal in signals:
+            for name, number in signal.backtrace:
+                numbers.setdefault(name, set()).add(number)
+        for name, values in numbers.items():
+            values = sorted(values, key=lambda n: (n is not None, n or 0))
+            self.numbers[name] = {n: i for i, n in enumerate(values)}
+
+    def _emit(self, s):
+        self.parts.append(s)
+        if len(self.parts) >= 4096:
+            self.flush()
+
+    def flush(self):
+        self.hash.update("\x1f".join(self.parts).encode())
+        self.parts = []
+
+    def _serialize_unordered(self, items):
+        items = list(items)
+        if all(hasattr(item, "duid") for item in items):
+            for item in sorted(items, key=lambda item: item.duid):
+                self.add(item)
+        else:
+            # Serialize each item separately and sort the results.
+            outer, self.parts = self.parts, []
+            serialized = []
+            for item in items:
+                self.add(item)
+                serialized.append("\x1e".join(self.parts))
+                self.parts = []
+            self.parts = outer
+            for s in sorted(serialized):
+                self._emit(s)
+
+    def add(self, obj):
+        if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+            self._emit(type(obj).__name__ + ":" + repr(obj))
+        elif isinstance(obj, Signal):
+            rank = self.ranks.get(obj)
+            if rank is None:
+                rank = self.ranks[obj] = len(self.ranks)
+            self._emit("S{}".format(rank))
+            if id(obj) not in self.memo:
+                self.memo[id(obj)] = rank
+                self._add_attributes(obj, backtrace=True)
+        elif isinstance(obj, (list, tuple)):
+            self._emit("[{}".format(len(obj)))
+            for item in obj:
+                self.add(item)
+            self._emit("]")
+        elif isinstance(obj, (set, frozenset)):
+            self._emit("{{{}".format(len(obj)))
+            self._serialize_unordered(obj)
+            self._emit("}")
+        elif isinstance(obj, dict):
+            self._emit("<{}".format(len(obj)))
+            for k, v in obj.items():
+                self.add(k)
+                self.add(v)
+            self._emit(">")
+        elif isinstance(obj, (type, types.FunctionType, types.BuiltinFunctionType)):
+            self._emit("T:{}.{}".format(obj.__module__, obj.__qualname__))
+        elif hasattr(obj, "__dict__"):
+            ref = self.memo.get(id(obj))
+            if ref is not None:
+                self._emit("R{}".format(ref))
+                return
+            self.memo[id(obj)] = len(self.memo)
+            self.keep.append(obj)
+            self._add_attributes(obj)
+        else:
+            self._emit("?" + repr(obj))
+
+    def _add_attributes(self, obj, backtrace=False):
+        cls = type(obj)
+        self._emit("O:{}.{}".format(cls.__module__, cls.__qualname__))
+        for k, v in vars(obj).items():
+            if k in _skipped_attributes:
+                continue
+            self._emit(k)
+            if backtrace and k == "backtrace":
+                for name, number in v:
+                    self.add(name)
+                    self.add(self.numbers.get(name, {}).get(number, number))
+            else:
+                self.add(v)
+        self._emit(";")
+
+    def hexdigest(self):
+        self.flush()
+        return self.hash.hexdigest()
+
+
+def fragment_digest(f, signals, **options):
+    """Digest of a lowered fragment, its signals and the conversion options.
+
+    Returns the digest and the signals in digest order (`signals` sorted by duid, followed by the
+    other signals found in the fragment).
+    """
+    signals = sorted(signals, key=lambda s: s.duid)
+    d = _FragmentDigest(signals)
+    d.add("litex-verilog-cache-v{}".format(_CACHE_VERSION))
+    d.add(_generator_digest())
+    d.add(sys.version_info[:2])
+    for k in sorted(options.keys()):
+        d.add(k)
+        d.add(options[k])
+    d.add(f.comb)
+    d.add({cd: f.sync[cd] for cd in sorted(f.sync.keys())})
+    d.add(f.specials)
+    d.add(list(f.clock_domains))
+    return d.hexdigest(), list(d.ranks.keys())
+
+# Verilog Conversion Cache -------------------------------------------------------------------------
+
+class VerilogCache:
+    """Reuse of a previous Verilog conversion.
+
+    The conversion output written to `filename` is recorded in a JSON file next to it with the
+    digest of the conversion inputs and the state of the signal namespace. When the digest matches
+    and the Verilog file is unchanged, the conversion output is rebuilt from these files instead of
+    being regenerated, and the namespace is restored so that later name lookups (constraints...)
+    return the same names.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self.metadata = filename + ".cache.json"
+
+    def load(self, digest, signals, namespace_cls, reserved_keywords):
+        try:
+            with open(self.metadata) as f:
+                metadata = json.load(f)
+            if metadata["version"] != _CACHE_VERSION or metadata["digest"] != digest:
+                return None
+            with open(self.filename) as f:
+                main_source = f.read()
+            if _sha256(main_source) != metadata["main_source"]:
+                return None
+            data_files = {}
+            for filename, sha in metadata["data_files"].items():
+                with open(filename, "rb") as f:
+                    data_files[filename] = f.read()
+                if _sha256(data_files[filename]) != sha:
+                    return None
+                # Text data files are restored as str (as generated), binary ones as bytes.
+                try:
+                    data_files[filename] = data_files[filename].decode()
+                except UnicodeDecodeError:
+                    pass
+        except (OSError, ValueError, KeyError):
+            return None
+        if len(metadata["names"]) != len(signals):
+            return None
+
+        r = ConvOutput()
+        r.set_main_source(main_source)
+        r.data_files = data_files
+        r.cached     = True
+        name_dict = {s: n for s, n in zip(signals, metadata["names"]) if n is not None}
+        ns = namespace_cls(name_dict, reserved_keywords)
+        ns.counts = metadata["counts"]
+        ns.sigs   = {signals[i]: n for i, n in metadata["numbers"]}
+        r.ns = ns
+        return r
+
+    def store(self, digest, output, signals):
+        ns     = output.ns
+        ranks  = {s: i for i, s in enumerate(signals)}
+        # Numbering of the signals named so far; signals named after the conversion (constraints)
+        # get the same numbers from the restored counts.
+        numbers = sorted((ranks[s], n) for s, n in ns.sigs.items() if s in ranks)
+        metadata = {
+            "version"     : _CACHE_VERSION,
+            "digest"      : digest,
+            "main_source" : _sha256(output.main_source),
+            "data_files"  : {k: data_file_digest(v) for k, v in output.data_files.items()},
+            "names"       : [ns.name_dict.get(s) for s in signals],
+            "numbers"     : numbers,
+            "counts"      : ns.counts,
+        }
+        with open(self.metadata, "w") as f:
+            json.dump(metadata, f)
+
+    def invalidate(self):
+        if os.path.exists(self.metadata):
+            os.remove(self.metadata)
@@ -0,0 +1,99 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import hashlib
+
+from migen.fhdl.conv_output import ConvOutput as MigenConvOutput
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def data_file_digest(content):
+    """SHA-256 of a data file content (str, bytes or streamed content)."""
+    if isinstance(content, str):
+        content = content.encode()
+    if isinstance(content, (bytes, bytearray)):
+        return hashlib.sha256(content).hexdigest()
+    return content.digest()
+
+
+def _file_digest(filename):
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(2**20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_data_file(filename, content):
+    """Write a data file, leaving it untouched (mtime included) when its content is unchanged.
+
+    `content` is either a str, bytes or a streamed content providing `chunks()` (iterable of bytes)
+    and `digest()`; streamed contents are written chunk by chunk and never held in memory.
+    """
+    if os.path.exists(filename) and _file_digest(filename) == data_file_digest(content):
+        return False
+    if isinstance(content, str):
+        content = content.encode()
+    with open(filename, "wb") as f:
+        if isinstance(content, (bytes, bytearray)):
+            f.write(content)
+        else:
+            for chunk in content.chunks():
+                f.write(chunk)
+    return True
+
+# Streamed Data File -------------------------------------------------------------------------------
+
+class StreamedDataFile:
+    """Data file content generated on demand as chunks of bytes.
+
+    `generate` is a callable returning an iterable of bytes; the digest is computed (and memoized)
+    on first request without keeping the content.
+    """
+    def __init__(self, generate):
+        self.generate = generate
+        self._digest  = None
+
+    def chunks(self):
+        return self.generate()
+
+    def digest(self):
+        if self._digest is None:
+            h = hashlib.sha256()
+            for chunk in self.generate():
+                h.update(chunk)
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def __bytes__(self):
+        return b"".join(self.generate())
+
+# Conversion Output --------------------------------------------------------------------------------
+
+class ConvOutput(MigenConvOutput):
+    """Conversion output (Verilog source and data files).
+
+    Extends Migen's with data files given as bytes or streamed contents (see `StreamedDataFile`);
+    data files are only rewritten when their content changed.
+    """
+    def __str__(self):
+        r = self.main_source + "\n"
+        for filename, content in sorted(self.data_files.items()):
+            if not isinstance(content, str):
+                content = bytes(content)
+                try:
+                    content = content.decode()
+                except UnicodeDecodeError:
+                    content = f"<{len(content)} bytes>\n"
+            r += filename + ":\n" + content
+        return r
+
+    def write(self, main_filename):
+        with open(main_filename, "w") as f:
+            f.write(self.main_source)
+        for filename, content in self.data_files.items():
+            write_data_file(filename, content)
@@ -5,6 +5,9 @@
 # This file is Copyright (c) 2021-2023 Florent Kermarrec <florent@enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import sys
+import array
+
 from migen.fhdl.structure    import *
 from migen.fhdl.module       import *
 from migen.fhdl.bitcontainer import bits_for
@@ -12,9 +15,54 @@ from migen.fhdl.tools        import *
 from migen.fhdl.verilog      import _printexpr as verilog_printexpr
 from migen.fhdl.specials     import *
 
+from litex.gen.fhdl.conv_output import StreamedDataFile
+
+# LiteX Memory Init Files --------------------------------------------------------------------------
+
+# Words formatted per chunk when streaming init files.
+_init_chunk_words = 2**16
+
+_array_typecodes = {array.array(t).itemsize: t for t in "BHILQ"}
+
+def _init_to_bytes(words, nbytes):
+    """Big-endian raw image of words (OverflowError when a word doesn't fit in nbytes)."""
+    typecode = _array_typecodes.get(nbytes, None)
+    if typecode is not None:
+        a = array.array(typecode, words)
+        if sys.byteorder == "little" and nbytes > 1:
+            a.byteswap()
+        return a.tobytes()
+    return b"".join(w.to_bytes(nbytes, "big") for w in words)
+
+def _init_hex_chunks(init, width):
+    """Stream $readmemh content: one zero-padded hex word per line."""
+    digits    = int(width/4)
+    formatter = f"{{:0{digits}x}}\n"
+    for i in range(0, len(init), _init_chunk_words):
+        words = init[i:i + _init_chunk_words]
+        # Fast path: hex-encode the raw image of the chunk (words must fit in width).
+        if width % 8 == 0:
+            try:
+                yield _init_to_bytes(words, width//8).hex("\n", width//8).encode() + b"\n"
+                continue
+            except (OverflowError, TypeError):
+                pass
+        yield (formatter*len(words)).format(*words).encode()
+
+def _init_bin_chunks(init, width):
+    """Stream $fread content: raw big-endian image, width rounded up to bytes."""
+    nbytes = (width + 7)//8
+    mask   = 2**width - 1
+    for i in range(0, len(init), _init_chunk_words):
+        words = init[i:i + _init_chunk_words]
+        try:
+            yield _init_to_bytes(words, nbytes)
+        except (OverflowError, TypeError):
+            yield _init_to_bytes([int(w) & mask for w in words], nbytes)
+
 # LiteX Memory Verilog Generation ------------------------------------------------------------------
 
-def _memory_generate_verilog(name, memory, namespace, add_data_file):
+def _memory_generate_verilog(name, memory, namespace, add_data_file, init_format="hex"):
     # Helpers.
     # --------
 
@@ -72,15 +120,27 @@ def _memory_generate_verilog(name, memory, namespace, add_data_file):
     # ----------------------------------------
     r += f"reg [{memory.width-1}:0] {_get_name(memory)}[0:{memory.depth-1}];\n"
     if memory.init is not None:
-        content = ""
-        formatter = f"{{:0{int(memory.width/4)}x}}\n"
-        for d in memory.init:
-            content += formatter.format(d)
-        memory_filename = add_data_file(f"{name}_{_get_name(memory)}.init", content)
-
-        r += "initial begin\n"
-        r += f"\t$readmemh(\"{memory_filename}\", {_get_name(memory)});\n"
-        r += "end\n"
+        init  = list(memory.init)
+        width = memory.width
+        # Raw binary image, loaded with $fread (byte-aligned widths only).
+        if init_format == "bin" and width % 8 == 0:
+            content = StreamedDataFile(lambda: _init_bin_chunks(init, width))
+            memory_filename = add_data_file(f"{name}_{_get_name(memory)}.bin", content)
+
+            r += f"initial begin : {_get_name(Signal(name_override=f'{_get_name(memory)}_init'))}\n"
+            r += "\tinteger fd, n;\n"
+            r += f"\tfd = $fopen(\"{memory_filename}\", \"rb\");\n"
+            r += f"\tn  = $fread({_get_name(memory)}, fd);\n"
+            r += "\t$fclose(fd);\n"
+            r += "end\n"
+        # Hex text, loaded with $readmemh.
+        else:
+            content = StreamedDataFile(lambda: _init_hex_chunks(init, width))
+            memory_filename = add_data_file(f"{name}_{_get_name(memory)}.init", content)
+
+            r += "initial begin\n"
+            r += f"\t$readmemh(\"{memory_filename}\", {_get_name(memory)});\n"
+            r += "end\n"
 
     # Port Intermediate Signals.
     # --------------------------
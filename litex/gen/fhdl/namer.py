@@ -5,8 +5,6 @@
 # This file is Copyright (c) 2023 Florent Kermarrec <florent@enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
-from itertools import combinations
-
 from migen.fhdl.structure import *
 
 # Hierarchy Node Class -----------------------------------------------------------------------------
@@ -20,7 +18,13 @@ class _HierarchyNode:
         use_name    (bool): Flag to determine if the node's name should be used in signal naming.
         use_number  (bool): Flag to determine if the node's number should be used in signal naming.
         children    (dict): A dictionary of child nodes.
+        all_numbers (list): Sorted numbers of the base node, when numbering is used.
+        number_index(dict): Position of each number in all_numbers.
+        elements    (dict): Memoized name elements, by number.
     """
+    __slots__ = ("signal_count", "numbers", "use_name", "use_number", "children", "all_numbers",
+        "number_index", "elements", "_sorted")
+
     def __init__(self):
         self.signal_count = 0
         self.numbers      = set()
@@ -28,6 +32,16 @@ class _HierarchyNode:
         self.use_number   = False
         self.children     = {}
         self.all_numbers  = []
+        self.number_index = {}
+        self.elements     = {}
+        self._sorted      = None
+
+    def sorted_numbers(self):
+        """Returns (and memoizes) the sorted numbers of the node and their index."""
+        if self._sorted is None:
+            all_numbers  = sorted(self.numbers)
+            self._sorted = (all_numbers, {n: i for i, n in enumerate(all_numbers)})
+        return self._sorted
 
     def update(self, name, number, use_number, current_base=None):
         """
@@ -45,15 +59,17 @@ class _HierarchyNode:
         """
         # Create the appropriate key for the node.
         key = (name, number) if use_number else name
-        # Use setdefault to either get the existing child node or create a new one.
-        child = self.children.setdefault(key, _HierarchyNode())
+        # Get the existing child node or create a new one.
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = _HierarchyNode()
         # Add the number to the set of numbers associated with this node.
         child.numbers.add(number)
         # Increment the count of signals that have traversed this node.
         child.signal_count += 1
-        # If numbering is used, sort and store all numbers associated with the base node.
+        # If numbering is used, store all numbers associated with the base node (sorted once).
         if use_number and current_base:
-            child.all_numbers = sorted(current_base.numbers)
+            child.all_numbers, child.number_index = current_base.sorted_numbers()
         return child
 
 # Build Hierarchy Tree Function --------------------------------------------------------------------
@@ -103,10 +119,15 @@ def _determine_name_usage(node, node_name=""):
         for child_name, child_node in node.children.items()
     }
 
-    # Check for naming conflicts between all pairs of children.
-    for (child1_name, names1), (child2_name, names2) in combinations(child_name_sets.items(), 2):
-        if names1 & names2:  # If there's an intersection, we have a naming conflict.
-            node.children[child1_name].use_name = node.children[child2_name].use_name = True
+    # Check for naming conflicts between children: a name owned by more than one child is a
+    # conflict for all of them (single pass over the names instead of comparing all pairs).
+    owners = {}
+    for child_name, names in child_name_sets.items():
+        child = node.children[child_name]
+        for name in names:
+            owner = owners.setdefault(name, child)
+            if owner is not child:
+                owner.use_name = child.use_name = True
 
     # Collect names, prepending child's name if necessary.
     for child_name, child_names in child_name_sets.items():
@@ -147,13 +168,15 @@ def _build_signal_name_dict_from_tree(tree, signals):
         for step_name, step_n in signal.backtrace:
             # Navigate the tree according to the signal's path.
             treepos = treepos.children.get((step_name, step_n)) or treepos.children.get(step_name)
-            # Check if the number is part of the name based on the tree node.
-            use_number = step_n in treepos.all_numbers
 
             # If the tree node's name is to be used, add it to the elements.
             if treepos.use_name:
-                # Create the name part, including the number if necessary.
-                element_name = step_name if not use_number else f"{step_name}{treepos.all_numbers.index(step_n)}"
+                # Create the name part, including the number if necessary (memoized on the node).
+                element_name = treepos.elements.get(step_n)
+                if element_name is None:
+                    index = treepos.number_index.get(step_n)
+                    element_name = step_name if index is None else f"{step_name}{index}"
+                    treepos.elements[step_n] = element_name
                 elements.append(element_name)
 
         # Combine the name parts into the signal's full name.
@@ -248,13 +271,6 @@ def _build_signal_name_dict_for_group(group_number, signals):
         dict: A dictionary mapping signals to their hierarchical names.
     """
 
-    def resolve_conflicts_and_rebuild_tree():
-        conflicts = _list_conflicting_signals(name_dict)
-        if conflicts:
-            _set_number_usage(tree, conflicts)
-            return _build_hierarchy_tree(signals, tree)
-        return tree
-
     def disambiguate_signals_with_duid():
         inv_name_dict = _invert_signal_name_dict(name_dict)
         for names, sigs in inv_name_dict.items():
@@ -267,8 +283,14 @@ def _build_signal_name_dict_for_group(group_number, signals):
     _determine_name_usage(tree)
     name_dict = _build_signal_name_dict_from_tree(tree, signals)
 
+    # Names are final when there is no conflict.
+    conflicts = _list_conflicting_signals(name_dict)
+    if not conflicts:
+        return name_dict
+
     # Address naming conflicts by introducing numbers.
-    tree = resolve_conflicts_and_rebuild_tree()
+    _set_number_usage(tree, conflicts)
+    tree = _build_hierarchy_tree(signals, tree)
 
     # Re-determine name usage and rebuild the name dictionary.
     _determine_name_usage(tree)
@@ -284,6 +306,10 @@ def _build_signal_name_dict_for_group(group_number, signals):
 def _build_signal_groups(signals):
     """Organizes signals into related groups.
 
+    Group N contains the signals with N related ancestors; ancestors of the signals are included
+    in their groups. Each signal is visited once (chains are only walked up to an already
+    grouped signal).
+
     Parameters:
         signals (iterable): An iterable of all signals to be organized.
 
@@ -291,79 +317,36 @@ def _build_signal_groups(signals):
         list: A list of sets, each containing related signals.
     """
     grouped_signals = []
+    depths          = {}
 
-    # Create groups of related signals.
     for signal in signals:
+        # Walk up the chain of related signals, up to an already grouped one.
         chain = []
-        # Trace back the chain of related signals.
-        while signal is not None:
-            chain.insert(0, signal)
+        while signal is not None and signal not in depths:
+            chain.append(signal)
             signal = signal.related
-
-        # Ensure there's a set for each level of relation.
-        while len(grouped_signals) < len(chain):
-            grouped_signals.append(set())
+        depth = -1 if signal is None else depths[signal]
 
         # Assign signals to their respective group.
-        for group, sig in zip(grouped_signals, chain):
-            group.add(sig)
+        for sig in reversed(chain):
+            depth += 1
+            depths[sig] = depth
+            if depth == len(grouped_signals):
+                grouped_signals.append(set())
+            grouped_signals[depth].add(sig)
 
     return grouped_signals
 
-# Build Hierarchical Name Function -----------------------------------------------------------------
-
-def _build_hierarchical_name(signal, group_number, group_name_dict_mappings):
-    """Builds the hierarchical name for a signal.
-
-    Parameters:
-        signal                 (Signal): The signal to build the name for.
-        group_number              (int): The group number of the signal.
-        group_name_dict_mappings (list): The list of all group name dictionaries.
-
-    Returns:
-        str: The hierarchical name for the signal.
-    """
-    hierarchical_name    = group_name_dict_mappings[group_number][signal]
-    current_group_number = group_number
-    current_signal       = signal
-
-    # Traverse up the signal's group relationships to prepend parent names.
-    while current_signal.related is not None:
-        current_signal       = current_signal.related
-        current_group_number -= 1
-        parent_name          = group_name_dict_mappings[current_group_number][current_signal]
-        hierarchical_name = f"{parent_name}_{hierarchical_name}"
-
-    return hierarchical_name
-
-# Update Name Dict With Group Function -------------------------------------------------------------
-
-def _update_name_dict_with_group(name_dict, group_number, group_name_dict, group_name_dict_mappings):
-    """Updates the name dictionary with hierarchical names for a specific group.
-
-    Parameters:
-        name_dict                (dict): The dictionary to update.
-        group_number              (int): The current group number.
-        group_name_dict          (dict): The name dictionary for the current group.
-        group_name_dict_mappings (list): The list of all group name dictionaries.
-
-    Returns:
-        None: The name_dict is updated in place.
-    """
-    for signal, name in group_name_dict.items():
-        hierarchical_name = _build_hierarchical_name(
-            signal, group_number, group_name_dict_mappings
-        )
-        name_dict[signal] = hierarchical_name
-
 # Build Signal Name Dict Function ------------------------------------------------------------------
 
 def _build_signal_name_dict(signals):
     """Builds a complete signal-to-name dictionary using a hierarchical tree.
 
+    The name of a related signal is the name of its parent followed by its name in its group;
+    groups are processed in order so parent names are computed once and reused.
+
     Parameters:
-        signals    (iterable): An iterable of all signals to be named.
-        tree (_HierarchyNode): The root node of the tree used for name resolution.
+        signals (iterable): An iterable of all signals to be named.
 
     Returns:
         dict: A complete dictionary mapping signals to their hierarchical names.
@@ -371,16 +354,15 @@ def _build_signal_name_dict(signals):
     # Group the signals based on their relationships.
     groups = _build_signal_groups(signals)
 
-    # Generate a name mapping for each group.
-    group_name_dict_mappings = [
-        _build_signal_name_dict_for_group(group_number, group_signals)
-        for group_number, group_signals in enumerate(groups)
-    ]
-
     # Create the final signal-to-name mapping.
     name_dict = {}
-    for group_number, group_name_dict in enumerate(group_name_dict_mappings):
-        _update_name_dict_with_group(name_dict, group_number, group_name_dict, group_name_dict_mappings)
+    for group_number, group_signals in enumerate(groups):
+        group_name_dict = _build_signal_name_dict_for_group(group_number, group_signals)
+        if group_number == 0:
+            name_dict.update(group_name_dict)
+        else:
+            for signal, name in group_name_dict.items():
+                name_dict[signal] = f"{name_dict[signal.related]}_{name}"
 
     return name_dict
 
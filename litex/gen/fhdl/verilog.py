@@ -27,16 +27,18 @@ from migen.fhdl.structure   import *
 from migen.fhdl.structure   import _Operator, _Slice, _Assign, _Fragment, _ClockDomainList
 from migen.fhdl.tools       import *
 from migen.fhdl.tools       import _apply_lowerer, _Lowerer
-from migen.fhdl.conv_output import ConvOutput
 from migen.fhdl.specials    import Instance, Memory, _MemoryPort
 
 from litex.gen import LiteXContext
-from litex.gen.fhdl.expression import _generate_expression, _generate_signal
-from litex.gen.fhdl.namer      import build_signal_namespace
-from litex.gen.fhdl.hierarchy  import LiteXHierarchyExplorer
-from litex.gen.fhdl.utils      import allocate_generated_name
+from litex.gen.fhdl.expression  import _generate_expression, _generate_signal
+from litex.gen.fhdl.namer       import build_signal_namespace, SignalNamespace
+from litex.gen.fhdl.conv_cache  import fragment_digest
+from litex.gen.fhdl.conv_output import ConvOutput
+from litex.gen.fhdl.hierarchy   import LiteXHierarchyExplorer
+from litex.gen.fhdl.utils       import allocate_generated_name
 
-from litex.build.tools import get_litex_git_revision
+from litex.build.tools   import get_litex_git_revision
+from litex.build.profile import profile_phase
 
 # ------------------------------------------------------------------------------------------------ #
 #                                     BANNER/TRAILER/SEPARATORS                                    #
@@ -648,7 +650,7 @@ def _generate_synchronous_logic(f, ns):
 #                                      SPECIALS                                                    #
 # ------------------------------------------------------------------------------------------------ #
 
-def _generate_specials(name, overrides, specials, namespace, add_data_file, attr_translate):
+def _generate_specials(name, overrides, specials, namespace, add_data_file, attr_translate, memory_init_format="hex"):
     r = ""
     for special in sorted(specials, key=lambda x: x.duid):
         if hasattr(special, "attr"):
@@ -656,7 +658,7 @@ def _generate_specials(name, overrides, specials, namespace, add_data_file, attr
         # Replace Migen Memory's emit_verilog with LiteX's implementation.
         if isinstance(special, Memory):
             from litex.gen.fhdl.memory import _memory_generate_verilog
-            pr = _memory_generate_verilog(name, special, namespace, add_data_file)
+            pr = _memory_generate_verilog(name, special, namespace, add_data_file, memory_init_format)
         # Replace Migen Instance's emit_verilog with LiteX's implementation.
         elif isinstance(special, Instance):
             from litex.gen.fhdl.instance import _instance_generate_verilog
@@ -903,6 +905,7 @@ class _HierarchicalBuildContext:
     comb_cycle_policy: str
     time_unit: str
     time_precision: str
+    memory_init_format: str
     ios: set
     conv_output: ConvOutput = field(default_factory=ConvOutput)
     root: object = None
@@ -913,7 +916,7 @@ class _HierarchicalBuildContext:
     ns: object = None
 
 
-def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_translate, regs_init, comb_cycle_policy, time_unit, time_precision):
+def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_translate, regs_init, comb_cycle_policy, time_unit, time_precision, memory_init_format):
     if LiteXContext.top is None:
         raise ValueError("Hierarchical Verilog generation requires LiteXContext.top to be set.")
 
@@ -923,16 +926,17 @@ def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_transl
     # - subtree_*  : transitive union of local_* over hierarchy descendants
     # - inline_*   : statements inherited from children selected for inlining
     ctx = _HierarchicalBuildContext(
-        top               = LiteXContext.top,
-        name              = name,
-        platform          = platform,
-        special_overrides = special_overrides,
-        attr_translate    = attr_translate,
-        regs_init         = regs_init,
-        comb_cycle_policy = comb_cycle_policy,
-        time_unit         = time_unit,
-        time_precision    = time_precision,
-        ios               = _resolve_ios(ios, platform),
+        top                = LiteXContext.top,
+        name               = name,
+        platform           = platform,
+        special_overrides  = special_overrides,
+        attr_translate     = attr_translate,
+        regs_init          = regs_init,
+        comb_cycle_policy  = comb_cycle_policy,
+        time_unit          = time_unit,
+        time_precision     = time_precision,
+        memory_init_format = memory_init_format,
+        ios                = _resolve_ios(ios, platform),
     )
     _apply_io_name_overrides(ctx.ios)
 
@@ -1438,6 +1442,7 @@ def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_transl
             namespace=ctx.ns,
             add_data_file=ctx.conv_output.add_data_file,
             attr_translate=ctx.attr_translate,
+            memory_init_format=ctx.memory_init_format,
         ))
         parts.append("endmodule\n")
         verilog += "".join(parts)
@@ -1457,8 +1462,11 @@ def convert(f, ios=set(), name="top", platform=None,
     hierarchical      = False,
     comb_cycle_policy = "warn",
     # Sim parameters.
-    time_unit      = "1ns",
-    time_precision = "1ps",
+    time_unit          = "1ns",
+    time_precision     = "1ps",
+    memory_init_format = "hex",
+    # Cache parameters.
+    cache          = None,
     ):
 
     # Build Logic.
@@ -1468,48 +1476,81 @@ def convert(f, ios=set(), name="top", platform=None,
     if not isinstance(f, _Fragment):
         f = f.get_fragment()
     comb_cycle_policy = _normalize_comb_cycle_policy(comb_cycle_policy)
+    if memory_init_format not in ["hex", "bin"]:
+        raise ValueError(f"Unsupported memory_init_format {memory_init_format!r}, expected 'hex' or 'bin'.")
 
     # Hierarchical Verilog generation (opt-in path).
     if hierarchical:
         return _convert_hierarchical(
-            f                 = f,
-            ios               = ios,
-            name              = name,
-            platform          = platform,
-            special_overrides = special_overrides,
-            attr_translate    = attr_translate,
-            regs_init         = regs_init,
-            comb_cycle_policy = comb_cycle_policy,
-            time_unit         = time_unit,
-            time_precision    = time_precision,
+            f                  = f,
+            ios                = ios,
+            name               = name,
+            platform           = platform,
+            special_overrides  = special_overrides,
+            attr_translate     = attr_translate,
+            regs_init          = regs_init,
+            comb_cycle_policy  = comb_cycle_policy,
+            time_unit          = time_unit,
+            time_precision     = time_precision,
+            memory_init_format = memory_init_format,
         )
 
     # Create ConvOutput for flat path.
     r = ConvOutput()
 
     # Flat Verilog generation.
-    f, lowered_specials = _prepare_fragment(
-        f=f,
-        platform=platform,
-        special_overrides=special_overrides,
-        global_clock_domains=None
-    )
+    with profile_phase("lower"):
+        f, lowered_specials = _prepare_fragment(
+            f=f,
+            platform=platform,
+            special_overrides=special_overrides,
+            global_clock_domains=None
+        )
 
     # IOs collection (when not specified) and naming stabilization.
     ios = _resolve_ios(ios, platform)
     _apply_io_name_overrides(ios)
 
+    signals = (
+        list_signals(f) |
+        list_special_ios(f, ins=True, outs=True, inouts=True) |
+        ios
+    )
+    device    = getattr(platform, "device", "Unknown")
+    top       = LiteXContext.top.__class__.__name__ if LiteXContext.top is not None else "Unknown"
+    hierarchy = _generate_hierarchy(top=LiteXContext.top)
+
+    # Reuse previous Conversion (when unchanged).
+    # -------------------------------------------
+    if cache is not None:
+        with profile_phase("cache"):
+            digest, cache_signals = fragment_digest(f, signals,
+                ios                = ios,
+                name               = name,
+                device             = device,
+                top                = top,
+                hierarchy          = hierarchy,
+                special_overrides  = special_overrides,
+                attr_translate     = attr_translate,
+                regs_init          = regs_init,
+                comb_cycle_policy  = comb_cycle_policy,
+                time_unit          = time_unit,
+                time_precision     = time_precision,
+                memory_init_format = memory_init_format,
+            )
+            cached = cache.load(digest, cache_signals, SignalNamespace, _ieee_1800_2017_verilog_reserved_keywords)
+        if cached is not None:
+            cached.ns.clock_domains = f.clock_domains
+            return cached
+
     # Build Signal Namespace.
     # ----------------------
-    ns = build_signal_namespace(
-        signals = (
-            list_signals(f) |
-            list_special_ios(f, ins=True, outs=True, inouts=True) |
-            ios
-        ),
-        reserved_keywords = _ieee_1800_2017_verilog_reserved_keywords
-    )
-    ns.clock_domains = f.clock_domains
+    with profile_phase("namespace"):
+        ns = build_signal_namespace(
+            signals           = signals,
+            reserved_keywords = _ieee_1800_2017_verilog_reserved_keywords
+        )
+        ns.clock_domains = f.clock_domains
 
     # Build Verilog.
     # --------------
@@ -1518,8 +1559,8 @@ def convert(f, ios=set(), name="top", platform=None,
     # Banner.
     verilog += _generate_banner(
         filename     = name,
-        device       = getattr(platform, "device", "Unknown"),
-        top          = LiteXContext.top.__class__.__name__ if LiteXContext.top is not None else "Unknown",
+        device       = device,
+        top          = top,
         hierarchical = False
     )
 
@@ -1531,34 +1572,40 @@ def convert(f, ios=set(), name="top", platform=None,
 
     # Module Definition.
     verilog += _generate_separator("Module")
-    verilog += _generate_module(f, ios, name, ns, attr_translate)
+    with profile_phase("module"):
+        verilog += _generate_module(f, ios, name, ns, attr_translate)
 
     # Module Hierarchy.
     verilog += _generate_separator("Hierarchy")
-    verilog += _generate_hierarchy(top=LiteXContext.top)
+    verilog += hierarchy
 
     # Module Signals.
     verilog += _generate_separator("Signals")
-    verilog += _generate_signals(f, ios, name, ns, attr_translate, regs_init)
+    with profile_phase("signals"):
+        verilog += _generate_signals(f, ios, name, ns, attr_translate, regs_init)
 
     # Combinatorial Logic.
     verilog += _generate_separator("Combinatorial Logic")
-    verilog += _generate_combinatorial_logic(f, ns, comb_cycle_policy)
+    with profile_phase("comb"):
+        verilog += _generate_combinatorial_logic(f, ns, comb_cycle_policy)
 
     # Synchronous Logic.
     verilog += _generate_separator("Synchronous Logic")
-    verilog += _generate_synchronous_logic(f, ns)
+    with profile_phase("sync"):
+        verilog += _generate_synchronous_logic(f, ns)
 
     # Specials
     verilog += _generate_separator("Specialized Logic")
-    verilog += _generate_specials(
-        name           = name,
-        overrides      = special_overrides,
-        specials       = f.specials - lowered_specials,
-        namespace      = ns,
-        add_data_file  = r.add_data_file,
-        attr_translate = attr_translate
-    )
+    with profile_phase("specials"):
+        verilog += _generate_specials(
+            name           = name,
+            overrides      = special_overrides,
+            specials       = f.specials - lowered_specials,
+            namespace      = ns,
+            add_data_file      = r.add_data_file,
+            attr_translate     = attr_translate,
+            memory_init_format = memory_init_format,
+        )
 
     # Module End.
     verilog += "endmodule\n"
@@ -1569,4 +1616,7 @@ def convert(f, ios=set(), name="top", platform=None,
     r.set_main_source(verilog)
     r.ns = ns
 
+    if cache is not None:
+        cache.store(digest, r, cache_signals)
+
     return r
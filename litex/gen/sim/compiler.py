@@ -0,0 +1,320 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import collections
+
+from migen.fhdl.structure import *
+from migen.fhdl.structure import _Operator, _Slice, _ArrayProxy, _Assign
+from migen.fhdl.bitcontainer import value_bits_sign
+from migen.fhdl.specials import _MemoryLocation
+
+# Helpers ------------------------------------------------------------------------------------------
+
+# Python infix operators matching litex.gen.sim.core.str2op.
+_infix_ops = {
+    "+"   : "+",
+    "-"   : "-",
+    "*"   : "*",
+    ">>>" : ">>",
+    "<<<" : "<<",
+    "&"   : "&",
+    "^"   : "^",
+    "|"   : "|",
+    "<"   : "<",
+    "<="  : "<=",
+    "=="  : "==",
+    "!="  : "!=",
+    ">"   : ">",
+    ">="  : ">=",
+}
+
+# Value stores, bound as default arguments of generated functions.
+_stores = "_v=_v, _p=_p, _dirty=_dirty"
+
+# Case statements with more entries than this are dispatched through a dict of functions.
+_case_dispatch_threshold = 4
+
+
+class CompileError(Exception):
+    pass
+
+
+def _mask(nbits):
+    return (1 << nbits) - 1
+
+
+# Statement Compiler -------------------------------------------------------------------------------
+
+class StatementCompiler:
+    """Compile FHDL statement lists into Python functions.
+
+    Statements are translated once to Python source which is then executed to produce a function
+    with the same semantics as `Evaluator.execute`: reads come from the committed values, writes
+    go to the pending values (truncated to the target width) and mark their slot dirty. Signals
+    are replaced by their slot number; arrays and helpers are bound in the generated module
+    namespace and the value stores are bound as default arguments so the generated code only
+    performs local lookups.
+    """
+    def __init__(self, evaluator):
+        self.evaluator  = evaluator
+        self.namespace  = {
+            "_v"       : evaluator.values,
+            "_p"       : evaluator.pending,
+            "_dirty"   : evaluator.dirty.append,
+            "_display" : evaluator.display,
+        }
+        self.objects    = {}
+        self.aux        = []
+        self.count      = 0
+
+    # Namespace ------------------------------------------------------------------------------------
+
+    def _new_name(self, prefix):
+        self.count += 1
+        return "{}{}".format(prefix, self.count)
+
+    def _bind(self, obj, prefix):
+        key = (prefix, id(obj))
+        try:
+            return self.objects[key][0]
+        except KeyError:
+            name = self._new_name(prefix)
+            self.namespace[name] = obj
+            # Keep a reference on obj so that its id can't be reused.
+            self.objects[key] = (name, obj)
+            return name
+
+    def _bind_signal(self, signal):
+        if signal.variable:
+            raise CompileError("Variables are not supported", signal)
+        return str(self.evaluator.slot(signal))
+
+    def _bind_signals(self, signals):
+        slots = tuple(int(self._bind_signal(signal)) for signal in signals)
+        return self._bind(slots, "_a")
+
+    # Expressions ----------------------------------------------------------------------------------
+
+    def _read(self, slot, postcommit):
+        if postcommit:
+            return "_p[{}]".format(slot)
+        return "_v[{}]".format(slot)
+
+    def expr(self, node, postcommit=False):
+        if isinstance(node, Constant):
+            return repr(node.value)
+        elif isinstance(node, Signal):
+            return self._read(self._bind_signal(node), postcommit)
+        elif isinstance(node, _Operator):
+            operands = [self.expr(o, postcommit) for o in node.operands]
+            if node.op == "-" and len(operands) == 1:
+                return "(-{})".format(operands[0])
+            elif node.op == "~":
+                return "(~{})".format(operands[0])
+            elif node.op == "m":
+                return "({1} if {0} else {2})".format(*operands)
+            elif node.op in _infix_ops and len(operands) == 2:
+                return "({} {} {})".format(operands[0], _infix_ops[node.op], operands[1])
+            else:
+                raise CompileError("Unsupported operator", node.op)
+        elif isinstance(node, _Slice):
+            v = self.expr(node.value, postcommit)
+            return "(({} >> {}) & {})".format(v, node.start, _mask(node.stop - node.start))
+        elif isinstance(node, Cat):
+            shift = 0
+            terms = []
+            for element in node.l:
+                nbits = len(element)
+                term  = "({} & {})".format(self.expr(element, postcommit), _mask(nbits))
+                if shift:
+                    term = "({} << {})".format(term, shift)
+                terms.append(term)
+                shift += nbits
+            if not terms:
+                return "0"
+            return "({})".format(" | ".join(terms))
+        elif isinstance(node, Replicate):
+            nbits = len(node.v)
+            mult  = sum(1 << i*nbits for i in range(node.n))
+            return "(({} & {}) * {})".format(self.expr(node.v, postcommit), _mask(nbits), mult)
+        elif isinstance(node, _ArrayProxy):
+            key  = self.expr(node.key, postcommit)
+            last = len(node.choices) - 1
+            if all(isinstance(c, Signal) for c in node.choices):
+                array = self._bind_signals(node.choices)
+                return self._read("{}[min({}, {})]".format(array, last, key), postcommit)
+            readers = []
+            for choice in node.choices:
+                readers.append("lambda {}: {}".format(_stores, self.expr(choice, postcommit)))
+            name = self._new_name("_r")
+            self.aux.append("{} = ({},)".format(name, ", ".join(readers)))
+            return "{}[min({}, {})]()".format(name, last, key)
+        elif isinstance(node, _MemoryLocation):
+            array = self._bind_signals(self.evaluator.replaced_memories[node.memory])
+            index = self.expr(node.index, postcommit)
+            return self._read("{}[{}]".format(array, index), postcommit)
+        elif isinstance(node, ClockSignal):
+            return self.expr(self.evaluator.clock_domains[node.cd].clk, postcommit)
+        elif isinstance(node, ResetSignal):
+            rst = self.evaluator.clock_domains[node.cd].rst
+            if rst is None:
+                if node.allow_reset_less:
+                    return "0"
+                raise CompileError("Attempted to get reset signal of resetless domain", node.cd)
+            return self.expr(rst, postcommit)
+        else:
+            raise CompileError("Unsupported expression", node)
+
+    # Assignments ----------------------------------------------------------------------------------
+
+    def _truncate(self, value, nbits, signed):
+        if signed and nbits:
+            sign = 1 << (nbits - 1)
+            return "((({} & {}) ^ {}) - {})".format(value, _mask(nbits), sign, sign)
+        return "({} & {})".format(value, _mask(nbits))
+
+    def _temp(self, lines, level, value):
+        name = self._new_name("_t")
+        lines.append((level, "{} = {}".format(name, value)))
+        return name
+
+    def _write(self, lines, level, slot, value):
+        lines.append((level, "_p[{}] = {}".format(slot, value)))
+        lines.append((level, "_dirty({})".format(slot)))
+
+    def assign(self, lines, level, node, value):
+        if isinstance(node, Signal):
+            slot = self._bind_signal(node)
+            self._write(lines, level, slot, self._truncate(value, node.nbits, node.signed))
+        elif isinstance(node, Cat):
+            value = self._temp(lines, level, value)
+            shift = 0
+            for element in node.l:
+                nbits = len(element)
+                self.assign(lines, level, element, "(({} >> {}) & {})".format(value, shift, _mask(nbits)))
+                shift += nbits
+        elif isinstance(node, _Slice):
+            width = node.stop - node.start
+            clear = _mask(node.stop) - _mask(node.start)
+            full  = self.expr(node.value, postcommit=True)
+            self.assign(lines, level, node.value, "(({} & {}) | (({} & {}) << {}))".format(
+                full, ~clear, value, _mask(width), node.start))
+        elif isinstance(node, _ArrayProxy):
+            value = self._temp(lines, level, value)
+            key   = "min({}, {})".format(len(node.choices) - 1, self.expr(node.key))
+            if (all(isinstance(c, Signal) for c in node.choices) and
+                len(set((c.nbits, c.signed) for c in node.choices)) == 1):
+                array  = self._bind_signals(node.choices)
+                choice = node.choices[0]
+                slot   = self._temp(lines, level, "{}[{}]".format(array, key))
+                self._write(lines, level, slot, self._truncate(value, choice.nbits, choice.signed))
+            else:
+                writers = []
+                for choice in node.choices:
+                    writers.append(self._function(lambda l, lv, c=choice: self.assign(l, lv, c, "_x"), args="_x"))
+                name = self._new_name("_w")
+                self.aux.append("{} = ({},)".format(name, ", ".join(writers)))
+                lines.append((level, "{}[{}]({})".format(name, key, value)))
+        elif isinstance(node, _MemoryLocation):
+            memory = self.evaluator.replaced_memories[node.memory]
+            array  = self._bind_signals(memory)
+            slot   = self._temp(lines, level, "{}[{}]".format(array, self.expr(node.index)))
+            self._write(lines, level, slot, self._truncate(value, memory[0].nbits, memory[0].signed))
+        else:
+            raise CompileError("Unsupported assignment target", node)
+
+    # Statements -----------------------------------------------------------------------------------
+
+    def statements(self, lines, level, statements):
+        for s in statements:
+            if isinstance(s, _Assign):
+                self.assign(lines, level, s.l, self.expr(s.r))
+            elif isinstance(s, If):
+                lines.append((level, "if {} & {}:".format(self.expr(s.cond), _mask(len(s.cond)))))
+                self.block(lines, level + 1, s.t)
+                if s.f:
+                    lines.append((level, "else:"))
+                    self.block(lines, level + 1, s.f)
+            elif isinstance(s, Case):
+                self.case(lines, level, s)
+            elif isinstance(s, collections.abc.Iterable):
+                self.statements(lines, level, s)
+            elif isinstance(s, Display):
+                lines.append((level, "_display({})".format(self._bind(s, "_d"))))
+            else:
+                raise CompileError("Unsupported statement", s)
+
+    def block(self, lines, level, statements):
+        start = len(lines)
+        self.statements(lines, level, statements)
+        if len(lines) == start:
+            lines.append((level, "pass"))
+
+    def case(self, lines, level, s):
+        nbits, signed = value_bits_sign(s.test)
+        test  = self._temp(lines, level, self._truncate(self.expr(s.test), nbits, signed))
+        cases = collections.OrderedDict()
+        for k, v in s.cases.items():
+            if isinstance(k, Constant):
+                cases.setdefault(k.value, v)
+        default = s.cases.get("default", None)
+        if len(cases) > _case_dispatch_threshold:
+            table = {}
+            for value, body in cases.items():
+                table[value] = self._function(lambda l, lv, b=body: self.block(l, lv, b))
+            name     = self._new_name("_c")
+            fallback = "_nop" if default is None else self._function(lambda l, lv: self.block(l, lv, default))
+            self.namespace["_nop"] = lambda: None
+            self.aux.append("{} = {{{}}}".format(name, ", ".join(
+                "{!r}: {}".format(k, v) for k, v in table.items())))
+            lines.append((level, "{}.get({}, {})()".format(name, test, fallback)))
+            return
+        keyword = "if"
+        for value, body in cases.items():
+            lines.append((level, "{} {} == {!r}:".format(keyword, test, value)))
+            self.block(lines, level + 1, body)
+            keyword = "elif"
+        if default is not None:
+            if keyword == "if":
+                self.statements(lines, level, default)
+            else:
+                lines.append((level, "else:"))
+                self.block(lines, level + 1, default)
+
+    # Functions ------------------------------------------------------------------------------------
+
+    def _function(self, body, args=""):
+        name  = self._new_name("_f")
+        lines = []
+        body(lines, 1)
+        if not lines:
+            lines.append((1, "pass"))
+        args = ", ".join(a for a in [args, _stores] if a)
+        source = ["def {}({}):".format(name, args)]
+        source += ["    "*level + line for level, line in lines]
+        self.aux.append("\n".join(source))
+        return name
+
+    def compile(self, statements):
+        return self.compile_many([statements])[0]
+
+    def compile_many(self, statement_lists):
+        """Compile each statement list to a function, in a single Python module.
+
+        Returns one function per statement list, or None for lists that can't be compiled.
+        """
+        names = []
+        for statements in statement_lists:
+            aux = len(self.aux)
+            try:
+                names.append(self._function(lambda l, lv: self.block(l, lv, statements)))
+            except CompileError:
+                del self.aux[aux:]
+                names.append(None)
+        source = "\n".join(self.aux) + "\n"
+        code   = compile(source, "<litex.gen.sim>", "exec")
+        exec(code, self.namespace)
+        return [None if name is None else self.namespace[name] for name in names]
@@ -10,6 +10,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
+import fnmatch
 import operator
 import collections
 import inspect
@@ -27,7 +28,11 @@ from migen.fhdl.specials import _MemoryLocation
 from migen.fhdl.module import Module
 from migen.genlib.resetsync import AsyncResetSynchronizer
 
+from litex.gen.fhdl.namer import build_signal_namespace
 from litex.gen.sim.vcd import VCDWriter, DummyVCDWriter
+from litex.gen.sim.fst import FSTWriter
+from litex.gen.sim.compiler import StatementCompiler
+from litex.gen.sim.scheduler import CombScheduler
 
 
 def _get_fragment(fragment_or_module):
@@ -58,6 +63,34 @@ def generate_gtkw_savefile(fragment_or_module, vns, savefile, dumpfile,
             save.add(signal)
 
 
+def select_trace_signals(signals, ns, selection):
+    """Select the signals to trace.
+
+    `selection` is a list of glob patterns (matched on the names of the namespace `ns`), Modules
+    or Fragments (all signals of their hierarchy) and Signals. Selected signals keep the order of
+    `signals`.
+    """
+    if isinstance(selection, (str, Signal, Module, _Fragment)):
+        selection = [selection]
+    patterns = []
+    selected = set()
+    for item in selection:
+        if isinstance(item, str):
+            patterns.append(item)
+        elif isinstance(item, Signal):
+            selected.add(item)
+        elif isinstance(item, _Fragment):
+            selected |= list_signals(item)
+        elif isinstance(item, Module):
+            # Submodules are already finalized by the elaboration of the top module.
+            item.finalize()
+            selected |= list_signals(item._fragment)
+        else:
+            raise TypeError("Unsupported trace selection: {}".format(item))
+    return [s for s in signals if s in selected or
+        any(fnmatch.fnmatchcase(ns.get_name(s), pattern) for pattern in patterns)]
+
+
 class ClockState:
     def __init__(self, high, half_period, time_before_trans):
         self.high = high
@@ -130,19 +163,50 @@ def _truncate(value, nbits, signed):
 
 
 class Evaluator:
-    def __init__(self, clock_domains, replaced_memories):
+    """FHDL statement interpreter.
+
+    Signal values live in flat lists indexed by a dense integer slot allocated to each signal
+    (at elaboration for the simulated fragment, on first access for others):
+
+    - `values`: committed values, read by statements.
+    - `pending`: values after the current modifications; equal to `values` for clean slots.
+    - `dirty`: slots written since the last commit (may contain duplicates).
+    """
+    def __init__(self, clock_domains, replaced_memories, signals=()):
         self.clock_domains = clock_domains
         self.replaced_memories = replaced_memories
-        self.signal_values = dict()
-        self.modifications = dict()
+        self.slots   = dict()
+        self.signals = []
+        self.values  = []
+        self.pending = []
+        self.dirty   = []
+        for signal in signals:
+            self.slot(signal)
+
+    def slot(self, signal):
+        try:
+            return self.slots[signal]
+        except KeyError:
+            slot = len(self.signals)
+            self.slots[signal] = slot
+            self.signals.append(signal)
+            self.values.append(signal.reset.value)
+            self.pending.append(signal.reset.value)
+            return slot
+
+    def read(self, signal):
+        return self.values[self.slot(signal)]
 
     def commit(self):
-        r = set()
-        for k, v in self.modifications.items():
-            if k not in self.signal_values or self.signal_values[k] != v:
-                self.signal_values[k] = v
-                r.add(k)
-        self.modifications.clear()
+        r = []
+        values  = self.values
+        pending = self.pending
+        for slot in self.dirty:
+            v = pending[slot]
+            if values[slot] != v:
+                values[slot] = v
+                r.append(slot)
+        self.dirty.clear()
         return r
 
     def eval(self, node, postcommit=False):
@@ -150,14 +214,8 @@ class Evaluator:
             return node.value
         elif isinstance(node, Signal):
             if postcommit:
-                try:
-                    return self.modifications[node]
-                except KeyError:
-                    pass
-            try:
-                return self.signal_values[node]
-            except KeyError:
-                return node.reset.value
+                return self.pending[self.slot(node)]
+            return self.values[self.slot(node)]
         elif isinstance(node, _Operator):
             operands = [self.eval(o, postcommit) for o in node.operands]
             if node.op == "-":
@@ -210,8 +268,9 @@ class Evaluator:
     def assign(self, node, value):
         if isinstance(node, Signal):
             assert not node.variable
-            self.modifications[node] = _truncate(value,
-                                                 node.nbits, node.signed)
+            slot = self.slot(node)
+            self.pending[slot] = _truncate(value, node.nbits, node.signed)
+            self.dirty.append(slot)
         elif isinstance(node, Cat):
             for element in node.l:
                 nbits = len(element)
@@ -257,17 +316,54 @@ class Evaluator:
             elif isinstance(s, collections.abc.Iterable):
                 self.execute(s)
             elif isinstance(s, Display):
-                args = []
-                for arg in s.args:
-                    assert isinstance(arg, _Value)
-                    try:
-                        args.append(self.signal_values[arg])
-                    except: # not yet evaluated
-                        args.append(arg.reset.value)
-                print(s.s %(*args,))
+                self.display(s)
             else:
                 raise NotImplementedError
 
+    def display(self, s):
+        args = []
+        for arg in s.args:
+            assert isinstance(arg, _Value)
+            if isinstance(arg, Signal):
+                args.append(self.read(arg))
+            else:
+                args.append(arg.reset.value)
+        print(s.s %(*args,))
+
+    def compile(self, statements):
+        return lambda: self.execute(statements)
+
+    def compile_many(self, statement_lists):
+        return [self.compile(statements) for statements in statement_lists]
+
+
+class CompiledEvaluator(Evaluator):
+    """Evaluator executing statement lists compiled to Python functions.
+
+    Statement lists are translated once (see `StatementCompiler`); lists using constructs the
+    compiler does not support fall back to the interpreter.
+    """
+    def compile(self, statements):
+        try:
+            function = StatementCompiler(self).compile(statements)
+        except (SyntaxError, RecursionError):
+            function = None
+        return function or Evaluator.compile(self, statements)
+
+    def compile_many(self, statement_lists):
+        try:
+            functions = StatementCompiler(self).compile_many(statement_lists)
+        except (SyntaxError, RecursionError):
+            return [self.compile(statements) for statements in statement_lists]
+        return [function or Evaluator.compile(self, statements)
+            for function, statements in zip(functions, statement_lists)]
+
+
+evaluators = {
+    "compiled"    : CompiledEvaluator,
+    "interpreter" : Evaluator,
+}
+
 
 class DummyAsyncResetSynchronizerImpl(Module):
     def __init__(self, cd, async_reset):
@@ -285,8 +381,15 @@ class DummyAsyncResetSynchronizer:
 
 # TODO: instances via Iverilog/VPI
 class Simulator:
+    """Simulate a Module/Fragment with generators.
+
+    Signals are traced to `vcd_name` (as FST when the filename ends with `.fst`). `trace_signals`
+    restricts the traced signals (see `select_trace_signals`) and `trace_start`/`trace_stop`
+    restrict tracing to a window expressed in cycles of the `trace_clock` domain.
+    """
     def __init__(self, fragment_or_module, generators, clocks={"sys": 10}, vcd_name=None,
-                 gtkw_name=None, special_overrides={}):
+                 gtkw_name=None, special_overrides={}, backend="compiled",
+                 trace_signals=None, trace_start=None, trace_stop=None, trace_clock="sys"):
         self.fragment_or_module = fragment_or_module
         self.gtkw_name          = gtkw_name
         self.gtkw_generated     = False
@@ -329,24 +432,48 @@ class Simulator:
         # comb signals return to their reset value if nothing assigns them
         self.fragment.comb[0:0] = [s.eq(s.reset)
                                    for s in list_targets(self.fragment.comb)]
-        self.evaluator = Evaluator(self.fragment.clock_domains,
-                                   mta.replacements)
+        signals = list_signals(self.fragment)
+        for cd in self.fragment.clock_domains:
+            signals.add(cd.clk)
+            if cd.rst is not None:
+                signals.add(cd.rst)
+        for memory_array in mta.replacements.values():
+            signals |= set(memory_array)
+        signals = sorted(signals, key=lambda x: x.duid)
+
+        if backend not in evaluators:
+            raise ValueError("Unknown simulator backend: '{}', supported: {}".format(
+                backend, ", ".join(evaluators.keys())))
+        self.evaluator = evaluators[backend](self.fragment.clock_domains,
+                                             mta.replacements, signals)
+        self.comb = CombScheduler(self.evaluator, self.fragment.comb)
+        self.sync = {cd: self.evaluator.compile(statements)
+                     for cd, statements in self.fragment.sync.items()}
 
         if vcd_name is None:
             self.vcd = DummyVCDWriter()
         else:
-            self.vcd = VCDWriter(vcd_name)
-
-            signals = list_signals(self.fragment)
-            for cd in self.fragment.clock_domains:
-                signals.add(cd.clk)
-                if cd.rst is not None:
-                    signals.add(cd.rst)
-            for memory_array in mta.replacements.values():
-                signals |= set(memory_array)
-            self.vcd.init(signals, clock_domains=self.fragment.clock_domains)
-            for signal in sorted(signals, key=lambda x: x.duid):
-                self.vcd.set(signal, signal.reset.value)
+            if os.path.splitext(vcd_name)[1] == ".fst":
+                self.vcd = FSTWriter(vcd_name)
+            else:
+                self.vcd = VCDWriter(vcd_name)
+            # Names are given over all signals so that they don't depend on the selection.
+            ns = build_signal_namespace(signals)
+            if trace_signals is not None:
+                signals = select_trace_signals(signals, ns, trace_signals)
+            self.vcd.init(signals, clock_domains=self.fragment.clock_domains, ns=ns)
+
+        # Trace window (in simulation time).
+        if trace_clock not in clocks:
+            if trace_start is not None or trace_stop is not None:
+                raise ValueError("Unknown trace clock: '{}'".format(trace_clock))
+            period = 0
+        else:
+            period = 2*self.time.clocks[trace_clock].half_period
+        self.t            = 0
+        self.trace_start  = 0    if trace_start is None else trace_start*period
+        self.trace_stop   = None if trace_stop  is None else trace_stop*period
+        self.tracing      = self.trace_start == 0 and self.trace_stop != 0
 
     def __enter__(self):
         return self
@@ -374,17 +501,24 @@ class Simulator:
             **kwargs)
         self.gtkw_generated = True
 
-    def _commit_and_comb_propagate(self):
-        # TODO: optimize
-        all_modified = set()
+    def _commit_and_comb_propagate(self, all_groups=False):
         modified = self.evaluator.commit()
-        all_modified |= modified
-        while modified:
-            self.evaluator.execute(self.fragment.comb)
-            modified = self.evaluator.commit()
-            all_modified |= modified
-        for signal in all_modified:
-            self.vcd.set(signal, self.evaluator.signal_values[signal])
+        modified = self.comb.propagate(modified, all_groups)
+        if self.tracing:
+            signals = self.evaluator.signals
+            values  = self.evaluator.values
+            for slot in modified:
+                self.vcd.set(signals[slot], values[slot])
+
+    def _update_trace_window(self):
+        if self.tracing:
+            if self.trace_stop is not None and self.t >= self.trace_stop:
+                self.tracing = False
+        elif self.t >= self.trace_start and (self.trace_stop is None or self.t < self.trace_stop):
+            self.tracing = True
+            # Dump the current state when entering the window.
+            for signal, value in zip(self.evaluator.signals, self.evaluator.values):
+                self.vcd.set(signal, value)
 
     def _evalexec_nested_lists(self, x):
         if isinstance(x, list):
@@ -429,16 +563,17 @@ class Simulator:
         return False
 
     def run(self):
-        self.evaluator.execute(self.fragment.comb)
-        self._commit_and_comb_propagate()
+        self._commit_and_comb_propagate(all_groups=True)
 
         while True:
             dt, rising, falling = self.time.tick()
             self.vcd.delay(dt)
+            self.t += dt
+            self._update_trace_window()
             for cd in rising:
                 self.evaluator.assign(self.fragment.clock_domains[cd].clk, 1)
-                if cd in self.fragment.sync:
-                    self.evaluator.execute(self.fragment.sync[cd])
+                if cd in self.sync:
+                    self.sync[cd]()
                 if cd in self.generators:
                     self._process_generators(cd)
             for cd in falling:
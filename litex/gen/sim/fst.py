@@ -0,0 +1,287 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import gzip
+import time
+import zlib
+import struct
+
+from litex.gen.fhdl.namer import build_signal_namespace
+
+# FST constants ------------------------------------------------------------------------------------
+
+FST_BL_HDR         = 0
+FST_BL_VCDATA      = 1
+FST_BL_GEOM        = 3
+FST_BL_HIER        = 4
+
+FST_ST_VCD_SCOPE   = 254
+FST_ST_VCD_UPSCOPE = 255
+FST_ST_VCD_MODULE  = 0
+
+FST_VT_VCD_WIRE    = 16
+FST_VD_IMPLICIT    = 0
+
+FST_FT_VERILOG     = 0
+
+# Header payload: start/end time, endianness double, memory use, scopes/vars/handles/blocks
+# counts, timescale, version (128), date (119), filetype, timezero.
+_header_fmt = ">QQ8sQQQQQb128s119sBq"
+_header_len = 8 + struct.calcsize(_header_fmt)
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _varint(v):
+    r = bytearray()
+    while v > 0x7f:
+        r.append((v & 0x7f) | 0x80)
+        v >>= 7
+    r.append(v)
+    return bytes(r)
+
+
+def _u64(v):
+    return struct.pack(">Q", v)
+
+
+def _compress(data, level):
+    """Return (data, compressed): FST stores raw data when compression doesn't help."""
+    compressed = zlib.compress(data, level)
+    if len(compressed) < len(data):
+        return compressed, True
+    return data, False
+
+# FST Writer ---------------------------------------------------------------------------------------
+
+class FSTWriter:
+    """Native FST (GTKWave Fast Signal Trace) writer.
+
+    Drop-in replacement for `VCDWriter` producing compressed FST files directly (no vcd2fst).
+    Value changes are collected per timestep and written in value change blocks of up to
+    `block_changes` changes (frame of initial values, per-signal zlib compressed change lists,
+    position and time tables); geometry and hierarchy blocks are written on close and the header
+    is then patched with the final counts. All signals are put in a single top-level scope.
+    """
+    def __init__(self, filename, timescale=-9, block_changes=2**20, compresslevel=4, scope="top"):
+        self.filename      = filename
+        self.timescale     = timescale
+        self.block_changes = block_changes
+        self.compresslevel = compresslevel
+        self.scope         = scope
+        self.out_file      = None
+        self.handles       = dict()
+        self.lengths       = []
+        self.masks         = []
+        self.values        = []
+        self.changes       = dict()
+        self.vns           = None
+        self.t             = 0
+        self.end_time      = 0
+        self.nblocks       = 0
+        self._new_block()
+
+    def _new_block(self):
+        self.frame       = list(self.values)
+        self.block_times = []
+        self.block_waves = [[] for _ in self.values]
+        self.block_count = 0
+        # Readers only use the frame to seek: initial values are dumped as changes at time 0.
+        if not self.nblocks:
+            self.block_times = [0]
+            self.block_waves = [[(0, value)] for value in self.values]
+
+    def init(self, signals, clock_domains=None, ns=None):
+        signals = [s for s in signals if len(s) and s not in self.handles]
+        for signal in signals:
+            self.handles[signal] = len(self.lengths)
+            self.lengths.append(len(signal))
+            self.masks.append((1 << len(signal)) - 1)
+            self.values.append(signal.reset.value & self.masks[-1])
+        if ns is None:
+            ns = build_signal_namespace(self.handles.keys())
+        ns.clock_domains = list(clock_domains or [])
+        self.vns = ns
+        self._new_block()
+
+        self.out_file = open(self.filename, "wb")
+        # Header is patched on close.
+        self.out_file.write(bytes(1 + _header_len))
+
+    def set(self, signal, value):
+        handle = self.handles.get(signal, None)
+        if handle is not None:
+            self.changes[handle] = value
+
+    def _flush_timestep(self):
+        values = self.values
+        masks  = self.masks
+        waves  = self.block_waves
+        times  = self.block_times
+        tindex = len(times)
+        if times and times[-1] == self.t:
+            tindex -= 1
+        n      = 0
+        for handle, value in self.changes.items():
+            value &= masks[handle]
+            if values[handle] != value:
+                values[handle] = value
+                wave = waves[handle]
+                if wave and wave[-1][0] == tindex:
+                    wave[-1] = (tindex, value)
+                else:
+                    wave.append((tindex, value))
+                    n += 1
+        self.changes.clear()
+        if n:
+            if tindex == len(times):
+                times.append(self.t)
+            self.block_count += n
+            if self.block_count >= self.block_changes:
+                self._write_block()
+
+    def delay(self, delay):
+        if self.changes:
+            self._flush_timestep()
+        self.t += delay
+
+    # Blocks ---------------------------------------------------------------------------------------
+
+    def _write_section(self, section_type, payload):
+        self.out_file.write(bytes([section_type]))
+        self.out_file.write(_u64(8 + len(payload)))
+        self.out_file.write(payload)
+
+    def _encode_wave(self, length, changes):
+        r     = bytearray()
+        nbytes = (length + 7)//8
+        pad    = 8*nbytes - length
+        prev   = 0
+        for tindex, value in changes:
+            delta = tindex - prev
+            prev  = tindex
+            if length == 1:
+                r += _varint((delta << 2) | (value << 1))
+            else:
+                r += _varint(delta << 1)
+                r += (value << pad).to_bytes(nbytes, "big")
+        return bytes(r)
+
+    def _write_block(self):
+        if not self.block_times:
+            return
+        level = self.compresslevel
+
+        # Frame: values of all signals at the start of the block.
+        frame = "".join(format(v, "0{}b".format(l)) for v, l in zip(self.frame, self.lengths)).encode()
+        frame_data, _ = _compress(frame, level)
+
+        # Value changes, one chunk per signal, offsets relative to the pack type byte.
+        chunks    = [b"Z"]
+        offset    = 1
+        positions = bytearray()
+        previous  = 0
+        skipped   = 0
+        memory    = 0
+        for handle, changes in enumerate(self.block_waves):
+            if not changes:
+                skipped += 1
+                continue
+            if skipped:
+                positions += _varint(skipped << 1)
+                skipped = 0
+            wave = self._encode_wave(self.lengths[handle], changes)
+            data, compressed = _compress(wave, level)
+            chunk = _varint(len(wave) if compressed else 0) + data
+            positions += _varint(((offset - previous) << 1) | 1)
+            previous = offset
+            offset  += len(chunk)
+            memory  += len(wave)
+            chunks.append(chunk)
+        if skipped:
+            positions += _varint(skipped << 1)
+
+        # Time table.
+        times    = bytearray()
+        previous = 0
+        for t in self.block_times:
+            times   += _varint(t - previous)
+            previous = t
+        times_data, _ = _compress(bytes(times), level)
+
+        payload = b"".join([
+            _u64(self.block_times[0]),
+            _u64(self.block_times[-1]),
+            _u64(memory),
+            _varint(len(frame)),
+            _varint(len(frame_data)),
+            _varint(len(self.lengths)),
+            frame_data,
+            _varint(len(self.lengths)),
+            *chunks,
+            bytes(positions),
+            _u64(len(positions)),
+            times_data,
+            _u64(len(times)),
+            _u64(len(times_data)),
+            _u64(len(self.block_times)),
+        ])
+        self._write_section(FST_BL_VCDATA, payload)
+        self.nblocks += 1
+        self._new_block()
+
+    def _write_geometry(self):
+        geometry = b"".join(_varint(l) for l in self.lengths)
+        data, _  = _compress(geometry, self.compresslevel)
+        self._write_section(FST_BL_GEOM, _u64(len(geometry)) + _u64(len(self.lengths)) + data)
+
+    def _write_hierarchy(self):
+        hierarchy = bytearray()
+        hierarchy += bytes([FST_ST_VCD_SCOPE, FST_ST_VCD_MODULE])
+        hierarchy += self.scope.encode() + b"\0" + b"\0"
+        for signal, handle in self.handles.items():
+            hierarchy += bytes([FST_VT_VCD_WIRE, FST_VD_IMPLICIT])
+            hierarchy += self.vns.get_name(signal).encode() + b"\0"
+            hierarchy += _varint(self.lengths[handle]) + _varint(0)
+        hierarchy += bytes([FST_ST_VCD_UPSCOPE])
+        data = gzip.compress(bytes(hierarchy), self.compresslevel)
+        self._write_section(FST_BL_HIER, _u64(len(hierarchy)) + data)
+
+    def _write_header(self):
+        header = struct.pack(_header_fmt,
+            0,                              # Start time.
+            self.end_time,                  # End time.
+            struct.pack("<d", 2.7182818284590452354), # Endianness test (e).
+            0,                              # Writer memory use.
+            1,                              # Scopes.
+            len(self.lengths),              # Vars.
+            len(self.lengths),              # Handles.
+            self.nblocks,                   # Value change blocks.
+            self.timescale,
+            b"LiteX",
+            time.asctime().encode(),
+            FST_FT_VERILOG,
+            0,                              # Timezero.
+        )
+        self.out_file.seek(0)
+        self.out_file.write(bytes([FST_BL_HDR]))
+        self.out_file.write(_u64(_header_len))
+        self.out_file.write(header)
+
+    def close(self):
+        if self.out_file is None:
+            return
+        if self.changes:
+            self._flush_timestep()
+        # Extend the trace to the end of the simulation.
+        if self.block_times and self.block_times[-1] != self.t:
+            self.block_times.append(self.t)
+        self.end_time = self.t
+        self._write_block()
+        self._write_geometry()
+        self._write_hierarchy()
+        self._write_header()
+        self.out_file.close()
+        self.out_file = None
@@ -0,0 +1,130 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import gc
+import os
+import time
+import traceback
+import multiprocessing
+from dataclasses import dataclass, field
+
+from migen.fhdl.structure import _Fragment
+
+from litex.gen.sim.core import Simulator
+
+# Jobs/Results -------------------------------------------------------------------------------------
+
+@dataclass
+class SimJob:
+    """Simulation job.
+
+    `factory` returns the design (Module or Fragment) and `generators(dut)` the generators to run
+    on it (as accepted by `Simulator`). The optional `result(dut)` is called once the simulation is
+    done and its (picklable) return value is reported: generators can store their observations on
+    the design for it. Other `Simulator` arguments (vcd_name, backend, ...) can be passed in
+    `kwargs`.
+    """
+    factory    : object
+    generators : object
+    clocks     : dict   = field(default_factory=lambda: {"sys": 10})
+    name       : str    = None
+    result     : object = None
+    kwargs     : dict   = field(default_factory=dict)
+
+
+@dataclass
+class SimResult:
+    name     : str
+    passed   : bool
+    result   : object = None
+    error    : str    = None
+    duration : float  = 0.0
+
+# Helpers ------------------------------------------------------------------------------------------
+
+# Jobs prepared by the parent process, inherited by forked workers.
+_prepared = None
+
+
+def _elaborate(factory):
+    dut = factory()
+    fragment = dut if isinstance(dut, _Fragment) else dut.get_fragment()
+    return dut, fragment
+
+
+def _run_job(index, job, dut, fragment):
+    name  = "job{}".format(index) if job.name is None else job.name
+    start = time.perf_counter()
+    try:
+        sim = Simulator(fragment, job.generators(dut), clocks=job.clocks, **job.kwargs)
+        with sim:
+            sim.run()
+        result = None if job.result is None else job.result(dut)
+        return SimResult(name, True, result, None, time.perf_counter() - start)
+    except Exception:
+        return SimResult(name, False, None, traceback.format_exc(), time.perf_counter() - start)
+
+
+def _run_prepared(index):
+    job, design = _prepared[index]
+    return index, _run_job(index, job, *design)
+
+
+def _run_spawned(args):
+    index, job = args
+    return index, _run_job(index, job, *_elaborate(job.factory))
+
+# Runner -------------------------------------------------------------------------------------------
+
+def run_simulations(jobs, processes=None, share_elaboration=True):
+    """Run independent simulation jobs across a process pool.
+
+    Returns one `SimResult` per job, in job order; exceptions raised by a job (including failed
+    assertions in its generators) are reported in its result and don't stop the other jobs.
+
+    When the platform supports fork, designs are elaborated in the parent process (once per
+    factory when `share_elaboration` is set, each job then works on its own copy-on-write copy)
+    and workers are forked afterwards; otherwise each worker elaborates its job and job
+    factories/generators must be picklable.
+    """
+    global _prepared
+    jobs = list(jobs)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(jobs)))
+    results   = [None]*len(jobs)
+
+    # Serial run: the simulator modifies fragments, so each job gets its own elaboration.
+    if processes == 1:
+        for i, job in enumerate(jobs):
+            results[i] = _run_job(i, job, *_elaborate(job.factory))
+        return results
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        designs  = {}
+        prepared = []
+        for i, job in enumerate(jobs):
+            key = job.factory if share_elaboration else i
+            if key not in designs:
+                designs[key] = _elaborate(job.factory)
+            prepared.append((job, designs[key]))
+        _prepared = prepared
+        # Keep the elaborated designs out of the collector so forked pages stay shared.
+        gc.freeze()
+        try:
+            # The simulator modifies the design: fork a fresh worker from the parent for each job.
+            context = multiprocessing.get_context("fork")
+            with context.Pool(processes, maxtasksperchild=1) as pool:
+                for i, result in pool.imap_unordered(_run_prepared, range(len(jobs))):
+                    results[i] = result
+        finally:
+            gc.unfreeze()
+            _prepared = None
+    else:
+        with multiprocessing.get_context().Pool(processes) as pool:
+            for i, result in pool.imap_unordered(_run_spawned, enumerate(jobs)):
+                results[i] = result
+    return results
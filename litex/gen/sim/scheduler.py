@@ -0,0 +1,218 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import heapq
+import collections
+
+from migen.fhdl.structure import *
+from migen.fhdl.structure import _Operator, _Slice, _ArrayProxy, _Assign
+from migen.fhdl.specials import _MemoryLocation
+from migen.fhdl.tools import group_by_targets
+
+# Sensitivity Lists --------------------------------------------------------------------------------
+
+class _SensitivityLister:
+    """List the signals whose committed value is read by statements.
+
+    Unlike `migen.fhdl.tools.list_inputs`, this also covers Array keys and Memory indexes used in
+    assignment targets, resolves ClockSignal/ResetSignal and skips the read-modify-write done on
+    the base of sliced targets (which sees the pending value, not the committed one).
+    """
+    def __init__(self, clock_domains, replaced_memories):
+        self.clock_domains     = clock_domains
+        self.replaced_memories = replaced_memories
+        self.signals           = set()
+
+    def value(self, node):
+        if isinstance(node, Signal):
+            self.signals.add(node)
+        elif isinstance(node, _Operator):
+            for operand in node.operands:
+                self.value(operand)
+        elif isinstance(node, _Slice):
+            self.value(node.value)
+        elif isinstance(node, Cat):
+            for element in node.l:
+                self.value(element)
+        elif isinstance(node, Replicate):
+            self.value(node.v)
+        elif isinstance(node, _ArrayProxy):
+            self.value(node.key)
+            for choice in node.choices:
+                self.value(choice)
+        elif isinstance(node, _MemoryLocation):
+            self.value(node.index)
+            self.signals.update(self.replaced_memories[node.memory])
+        elif isinstance(node, ClockSignal):
+            self.signals.add(self.clock_domains[node.cd].clk)
+        elif isinstance(node, ResetSignal):
+            rst = self.clock_domains[node.cd].rst
+            if rst is not None:
+                self.signals.add(rst)
+
+    def target(self, node):
+        if isinstance(node, Cat):
+            for element in node.l:
+                self.target(element)
+        elif isinstance(node, _Slice):
+            self.target(node.value)
+        elif isinstance(node, _ArrayProxy):
+            self.value(node.key)
+            for choice in node.choices:
+                self.target(choice)
+        elif isinstance(node, _MemoryLocation):
+            self.value(node.index)
+
+    def statements(self, statements):
+        for s in statements:
+            if isinstance(s, _Assign):
+                self.value(s.r)
+                self.target(s.l)
+            elif isinstance(s, If):
+                self.value(s.cond)
+                self.statements(s.t)
+                self.statements(s.f)
+            elif isinstance(s, Case):
+                self.value(s.test)
+                for body in s.cases.values():
+                    self.statements(body)
+            elif isinstance(s, collections.abc.Iterable):
+                self.statements(s)
+            elif isinstance(s, Display):
+                self.signals.update(arg for arg in s.args if isinstance(arg, Signal))
+        return self.signals
+
+
+def list_sensitivity(statements, clock_domains, replaced_memories):
+    return _SensitivityLister(clock_domains, replaced_memories).statements(statements)
+
+# Topological Ranking ------------------------------------------------------------------------------
+
+def _rank_nodes(successors):
+    """Rank the nodes of a directed graph in topological order.
+
+    Strongly connected components (combinatorial loops) are collapsed, their nodes keep their
+    original order. Returns the rank of each node.
+    """
+    n       = len(successors)
+    index   = [None]*n
+    lowlink = [0]*n
+    onstack = [False]*n
+    stack   = []
+    sccs    = []
+    counter = 0
+    # Iterative Tarjan: large designs would exceed the recursion limit.
+    for root in range(n):
+        if index[root] is not None:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                onstack[node] = True
+            recurse = False
+            for j in range(i, len(successors[node])):
+                succ = successors[node][j]
+                if index[succ] is None:
+                    work.append((node, j + 1))
+                    work.append((succ, 0))
+                    recurse = True
+                    break
+                elif onstack[succ]:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            if recurse:
+                continue
+            if lowlink[node] == index[node]:
+                scc = []
+                while True:
+                    member = stack.pop()
+                    onstack[member] = False
+                    scc.append(member)
+                    if member == node:
+                        break
+                sccs.append(sorted(scc))
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+    # Tarjan emits SCCs in reverse topological order.
+    rank = [0]*n
+    for r, node in enumerate(node for scc in reversed(sccs) for node in scc):
+        rank[node] = r
+    return rank
+
+# Comb Scheduler -----------------------------------------------------------------------------------
+
+class CombScheduler:
+    """Event-driven combinatorial propagation.
+
+    Comb statements are grouped by targets (as for Verilog always blocks, each group starting
+    with the reset of its targets) and each group is compiled to an action by the evaluator. A
+    group is only re-executed when one of the signals it reads changes; pending groups are
+    executed in topological order and their results committed immediately, so an acyclic comb
+    network settles in a single pass whatever the statement order.
+    """
+    def __init__(self, evaluator, statements):
+        self.evaluator = evaluator
+        groups         = group_by_targets(statements)
+        self.actions   = evaluator.compile_many([statements for targets, statements in groups])
+
+        # Sensitivity lists (by signal slot).
+        writers = {}
+        for i, (targets, _) in enumerate(groups):
+            for target in targets:
+                writers[evaluator.slot(target)] = i
+        readers    = collections.defaultdict(list)
+        successors = [set() for _ in groups]
+        for i, (_, statements) in enumerate(groups):
+            for signal in list_sensitivity(statements,
+                evaluator.clock_domains, evaluator.replaced_memories):
+                slot = evaluator.slot(signal)
+                readers[slot].append(i)
+                if slot in writers:
+                    successors[writers[slot]].add(i)
+
+        # Execution order.
+        rank         = _rank_nodes([sorted(s) for s in successors])
+        self.order   = sorted(range(len(groups)), key=lambda i: rank[i])
+        self.actions = [self.actions[i] for i in self.order]
+        self.readers = [[] for _ in evaluator.values]
+        for slot, groups in readers.items():
+            self.readers[slot] = sorted(rank[i] for i in groups)
+
+    def propagate(self, modified, all_groups=False):
+        """Propagate `modified` (committed) signal slots through the comb logic.
+
+        Returns the set of all slots modified, including `modified`.
+        """
+        evaluator    = self.evaluator
+        actions      = self.actions
+        readers      = self.readers
+        nreaders     = len(readers)
+        all_modified = set(modified)
+        pending      = list(range(len(actions))) if all_groups else []
+        queued       = set(pending)
+
+        def schedule(slots):
+            for slot in slots:
+                if slot < nreaders:
+                    for r in readers[slot]:
+                        if r not in queued:
+                            queued.add(r)
+                            heapq.heappush(pending, r)
+
+        schedule(modified)
+        while pending:
+            r = heapq.heappop(pending)
+            queued.discard(r)
+            actions[r]()
+            modified = evaluator.commit()
+            if modified:
+                all_modified.update(modified)
+                schedule(modified)
+        return all_modified
@@ -7,10 +7,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 from itertools import count
-import tempfile
-import os
 from collections import OrderedDict
-import shutil
 
 from litex.gen.fhdl.namer import build_signal_namespace
 
@@ -26,87 +23,91 @@ def vcd_codes():
 
 
 class VCDWriter:
-    def __init__(self, filename):
-        self.filename = filename
-        self.out_file = None
-        self.buffer_file = tempfile.TemporaryFile(
-            dir=os.path.dirname(filename) or None, mode="w+")
-        self.initialized = False
-        self.codegen = vcd_codes()
-        self.codes = OrderedDict()
+    """Streaming VCD writer.
+
+    All signals are registered by `init`, which writes the header once; value changes are then
+    collected per timestep (last value wins) and written when time advances, through a large
+    buffered file. Signals not registered by `init` are not traced. A namespace built over a
+    larger set of signals can be passed to keep the names of a full dump.
+    """
+    def __init__(self, filename, buffer_size=2**20):
+        self.filename      = filename
+        self.buffer_size   = buffer_size
+        self.out_file      = None
+        self.codegen       = vcd_codes()
+        self.codes         = OrderedDict()
+        self.formats       = dict()
         self.signal_values = dict()
-        self.vns = None
-        self.t = 0
-
-    def _write_value(self, signal, value):
-        l = len(signal)
-        if value < 0:
-            value += 2**l
+        self.changes       = dict()
+        self.vns           = None
+        self.t             = 0
+
+    def _register(self, signal):
+        code = next(self.codegen)
+        l    = len(signal)
+        esc  = code.replace("{", "{{").replace("}", "}}")
         if l > 1:
-            fmtstr = "b{:0" + str(l) + "b} {}\n"
+            fmtstr = "b{:0" + str(l) + "b} " + esc + "\n"
         else:
-            fmtstr = "{}{}\n"
-        try:
-            code = self.codes[signal]
-        except KeyError:
-            code = next(self.codegen)
-            self.codes[signal] = code
-            self.init(self.codes.keys())
-
-        return fmtstr.format(value, code)
+            fmtstr = "{}" + esc + "\n"
+        self.codes[signal]   = code
+        self.formats[signal] = (fmtstr.format, (1 << l) - 1)
 
-    def _write(self, s):
-        self.out_file.write(s)
-        self.buffer_file.write(s)
-
-    def init(self, signals, clock_domains=None):
-        self.out_file = open(self.filename, "w")
+    def _write_value(self, signal, value):
+        fmt, mask = self.formats[signal]
+        return fmt(value & mask)
 
-        # generate codes
+    def init(self, signals, clock_domains=None, ns=None):
         for signal in signals:
-            try:
-                code = self.codes[signal]
-            except KeyError:
-                code = next(self.codegen)
-                self.codes[signal] = code
+            if signal not in self.codes:
+                self._register(signal)
 
         # write vcd header
         header = ""
-        ns = build_signal_namespace(self.codes.keys())
+        if ns is None:
+            ns = build_signal_namespace(self.codes.keys())
         ns.clock_domains = list(clock_domains or [])
         self.vns = ns
         for signal, code in self.codes.items():
             name = ns.get_name(signal)
             header += "$var wire {len} {code} {name} $end\n".format(name=name, code=code, len=len(signal))
+        header += "$enddefinitions $end\n"
         header += "$dumpvars\n"
         for signal in self.codes.keys():
             header += self._write_value(signal, signal.reset.value)
+            self.signal_values[signal] = signal.reset.value
         header += "$end\n"
-        self.out_file.write(header)
-
-        if self.initialized:
-            self.buffer_file.seek(0)
-            shutil.copyfileobj(self.buffer_file, self.out_file)
-            self.buffer_file.seek(0, 2)
-        else:
-            # init time
-            self._write("#0\n")
 
-        self.initialized = True
+        self.out_file = open(self.filename, "w", buffering=self.buffer_size)
+        self.out_file.write(header)
+        self.out_file.write("#0\n")
+
+    def _flush_timestep(self):
+        lines = []
+        values = self.signal_values
+        for signal, value in self.changes.items():
+            if values[signal] != value:
+                values[signal] = value
+                lines.append(self._write_value(signal, value))
+        self.changes.clear()
+        if lines:
+            if self.t:
+                self.out_file.write("#{}\n".format(self.t))
+            self.out_file.write("".join(lines))
 
     def set(self, signal, value):
-        if (signal not in self.signal_values
-                or self.signal_values[signal] != value):
-            self._write(self._write_value(signal, value))
-            self.signal_values[signal] = value
+        if signal in self.formats:
+            self.changes[signal] = value
 
     def delay(self, delay):
+        if self.changes:
+            self._flush_timestep()
         self.t += delay
-        self._write("#{}\n".format(self.t))
 
     def close(self):
-        self.out_file.close()
-        self.buffer_file.close()
+        if self.out_file is not None:
+            self._flush_timestep()
+            self.out_file.close()
 
 
 class DummyVCDWriter:
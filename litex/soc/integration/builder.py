@@ -27,6 +27,7 @@ from litex.gen import colorer
 from litex.build.bundle import BuildBundle, get_pythonpath_roots, remap_path
 from litex.build.tools import write_to_file
 from litex.build.log import build_log_context
+from litex.build.profile import build_profile_context, profile_enabled_from_env, profile_phase
 
 from litex.soc.integration import export, soc
 
@@ -90,6 +91,7 @@ class Builder:
         compile_gateware = True,
         build_backend    = "litex",
         build_log        = True,
+        profile          = False,
 
         # Exports.
         csr_json         = None,
@@ -118,7 +120,8 @@ class Builder:
         bundle_include         = None,
         bundle_pythonpath_root = None,
         bundle_auto_pythonpath = False,
-        bundle_strict          = "warn"):
+        bundle_strict          = "warn",
+        bundle_compression     = "gz"):
 
         # SoC/Builder Attach.
         self.soc         = soc   # Attach SoC to Builder.
@@ -136,6 +139,7 @@ class Builder:
         self.compile_gateware = compile_gateware
         self.build_backend    = build_backend
         self.build_log        = build_log
+        self.profile          = profile or profile_enabled_from_env()
 
         # Exports (Generated by default to output_dir with default name unless explicitly specified).
         self.csr_csv  = csr_csv  if csr_csv  else os.path.join(self.output_dir, "csr.csv")
@@ -166,6 +170,7 @@ class Builder:
         self.bundle_pythonpath_root = [] if bundle_pythonpath_root is None else list(bundle_pythonpath_root)
         self.bundle_auto_pythonpath = bundle_auto_pythonpath
         self.bundle_strict          = bundle_strict
+        self.bundle_compression     = bundle_compression
         self.last_build_bundle      = None
 
         # Software packages and libraries.
@@ -449,6 +454,13 @@ class Builder:
             return os.path.abspath(self.build_log)
         return os.path.join(self.output_dir, "litex.log")
 
+    def get_profile_filename(self):
+        # Written next to the build log (output_dir when the log is disabled).
+        log_filename = self.get_build_log_filename()
+        if log_filename is None:
+            return os.path.join(self.output_dir, "litex_profile.json")
+        return os.path.splitext(log_filename)[0] + "_profile.json"
+
     def _get_source_support_paths(self):
         paths = []
         try:
@@ -476,6 +488,7 @@ class Builder:
             command       = [sys.executable] + sys.argv,
             strict        = self.bundle_strict,
             exclude_dirs  = [self.output_dir],
+            compression   = self.bundle_compression,
         )
 
         # User-selected roots/includes.
@@ -518,7 +531,8 @@ class Builder:
 
     def build(self, **kwargs):
         with build_log_context(self.get_build_log_filename()):
-            return self._build(**kwargs)
+            with build_profile_context(self.profile, self.get_profile_filename()):
+                return self._build(**kwargs)
 
     def _build(self, **kwargs):
         # Pass Output Directory to Platform.
@@ -555,25 +569,29 @@ class Builder:
             _create_dir(self.software_dir, remove_if_exists=software_full_rebuild)
 
         # Finalize the SoC.
-        self.soc.finalize()
-        if with_bios:
-            self.soc.cpu.prepare_software(self)
+        with profile_phase("finalize"):
+            self.soc.finalize()
+            if with_bios:
+                self.soc.cpu.prepare_software(self)
         bundle_platform_sources += [
             source for source in self.soc.platform.sources
             if source not in bundle_platform_sources
         ]
 
         # Generate Software Includes/Files.
-        self._generate_includes(with_bios=with_bios)
+        with profile_phase("includes"):
+            self._generate_includes(with_bios=with_bios)
 
         # Export SoC Mapping.
-        self._generate_csr_map()
+        with profile_phase("csr_map"):
+            self._generate_csr_map()
 
         # Archive resolved build inputs before invoking external tools.
-        self._create_build_bundle(
-            with_bios        = with_bios,
-            platform_sources = bundle_platform_sources,
-        )
+        with profile_phase("build_bundle"):
+            self._create_build_bundle(
+                with_bios        = with_bios,
+                platform_sources = bundle_platform_sources,
+            )
 
         # Compile the BIOS when the SoC uses it.
         if self.soc.cpu_type is not None:
@@ -588,8 +606,9 @@ class Builder:
                 if use_bios:
                     self.soc.check_bios_requirements()
                     self._check_meson()
-                self._prepare_rom_software()
-                self._generate_rom_software(compile_bios=use_bios)
+                with profile_phase("bios"):
+                    self._prepare_rom_software()
+                    self._generate_rom_software(compile_bios=use_bios)
 
             # Initialize Memories.
             # Allow User Design to optionally initialize Memories through SoC.init_ram/init_rom.
@@ -613,7 +632,8 @@ class Builder:
         kwargs["build_backend"] = self.build_backend
 
         # Build SoC and pass Verilog Name Space to do_exit.
-        vns = self.soc.build(build_dir=self.gateware_dir, **kwargs)
+        with profile_phase("gateware"):
+            vns = self.soc.build(build_dir=self.gateware_dir, **kwargs)
         self.soc.do_exit(vns=vns)
 
         # Generate SoC Documentation.
@@ -654,6 +674,7 @@ def builder_args(parser):
     builder_group.add_argument("--build-backend",         default="litex",     choices=["litex", "edalize"], help="Select build backend.")
     builder_group.add_argument("--build-log",             default=True, nargs="?", const=True, help="Write build log to file (default: output_dir/litex.log).")
     builder_group.add_argument("--no-build-log",          dest="build_log", action="store_false", help="Disable build log generation.")
+    builder_group.add_argument("--profile",               action="store_true", help="Write per-phase time/memory profile next to the build log (or set LITEX_PROFILE=1).")
     builder_group.add_argument("--no-compile",            action="store_true", help="Disable software and gateware compilation.")
     builder_group.add_argument("--no-compile-software",   action="store_true", help="Disable software compilation only.")
     builder_group.add_argument("--no-compile-gateware",   action="store_true", help="Disable gateware compilation only.")
@@ -671,6 +692,7 @@ def builder_args(parser):
     bundle_group.add_argument("--bundle-pythonpath-root", default=[], action="append",                         help="Add Python import root to bundle.")
     bundle_group.add_argument("--bundle-auto-pythonpath", action="store_true",                                 help="Auto-bundle LiteX Python import roots.")
     bundle_group.add_argument("--bundle-strict",          default="warn", choices=["warn", "error"],           help="Missing bundle input handling.")
+    bundle_group.add_argument("--bundle-compression",     default="gz", choices=["gz", "pigz", "zstd"],        help="Build bundle compression (pigz: multi-threaded gzip).")
     bios_group = parser.add_argument_group(title="BIOS options") # FIXME: Move?
     bios_group.add_argument("--bios-lto",     action="store_true", help="Enable BIOS LTO (Link Time Optimization) compilation.")
     bios_group.add_argument("--bios-format",  default="integer",   help="Select BIOS printf format.",  choices=["integer", "float", "double"])
@@ -689,6 +711,7 @@ def builder_argdict(args):
         "generated_dir"            : args.generated_dir,
         "build_backend"            : args.build_backend,
         "build_log"                : args.build_log,
+        "profile"                  : args.profile,
         "compile_software"         : (not args.no_compile) and (not args.no_compile_software),
         "compile_gateware"         : (not args.no_compile) and (not args.no_compile_gateware),
         "csr_csv"                  : args.soc_csv,
@@ -710,4 +733,5 @@ def builder_argdict(args):
         "bundle_pythonpath_root"   : args.bundle_pythonpath_root,
         "bundle_auto_pythonpath"   : args.bundle_auto_pythonpath,
         "bundle_strict"            : args.bundle_strict,
+        "bundle_compression"       : args.bundle_compression,
     }
@@ -5,9 +5,10 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
+import sys
 import math
 import json
-import struct
+import array
 
 from migen import *
 
@@ -37,6 +38,44 @@ def get_mem_regions(filename_or_regions, offset):
             regions = {filename: f"{offset:08x}"}
     return regions
 
+def _get_array_typecode(itemsize):
+    for typecode in "ILQ":
+        if array.array(typecode).itemsize == itemsize:
+            return typecode
+    raise NotImplementedError(f"No {itemsize}-byte unsigned array type on this platform.")
+
+def _read_mem_file(filename, size, bytes_per_data):
+    # Read file in one pass into a buffer zero-padded to a whole number of data words.
+    buf = bytearray(math.ceil(size/bytes_per_data)*bytes_per_data)
+    with open(filename, "rb") as f:
+        f.readinto(memoryview(buf)[:size])
+    return buf
+
+def _unpack_mem_data(buf, data_width, endianness):
+    # Data words are made of 32-bit words with the requested endianness (first one in LSBs): once
+    # 32-bit words are converted to little-endian, data words are plain little-endian integers.
+    if endianness == "big":
+        words = array.array(_get_array_typecode(4))
+        words.frombytes(buf)
+        words.byteswap()
+        buf = memoryview(words).cast("B")
+    # Decode them with the largest native integer type...
+    itemsize = min(data_width//8, 8)
+    items    = array.array(_get_array_typecode(itemsize))
+    items.frombytes(buf)
+    if sys.byteorder != "little":
+        items.byteswap()
+    items = items.tolist()
+    # ...and assemble wider data words from them.
+    n = data_width//(8*itemsize)
+    if n == 1:
+        return items
+    data = items[0::n]
+    for i in range(1, n):
+        shift = 8*itemsize*i
+        data  = [d | (w << shift) for d, w in zip(data, items[i::n])]
+    return data
+
 def get_mem_data(filename_or_regions, data_width=32, endianness="big", mem_size=None, offset=0):
     if data_width % 32:
         raise ValueError("data_width must be a multiple of 32.")
@@ -81,25 +120,13 @@ def get_mem_data(filename_or_regions, data_width=32, endianness="big", mem_size=
 
     # Fill data.
     data = [0]*math.ceil(data_size/bytes_per_data)
-    for filename, base, _ in data_regions:
-        with open(filename, "rb") as f:
-            i = 0
-            while True:
-                w = f.read(bytes_per_data)
-                if not w:
-                    break
-                if len(w) != bytes_per_data:
-                    for _ in range(len(w), bytes_per_data):
-                        w += b'\x00'
-                unpack_order = {
-                    "little": "<I",
-                    "big":    ">I"
-                }[endianness]
-                data[(base - offset)//bytes_per_data + i] = 0
-                for filled_data_width in range(0, data_width, 32):
-                    cur_byte = filled_data_width//8
-                    data[(base - offset)//bytes_per_data + i] |= (struct.unpack(unpack_order, w[cur_byte:cur_byte+4])[0] << filled_data_width)
-                i += 1
+    for filename, base, size in data_regions:
+        region_data = _unpack_mem_data(
+            buf        = _read_mem_file(filename, size, bytes_per_data),
+            data_width = data_width,
+            endianness = endianness)
+        start = (base - offset)//bytes_per_data
+        data[start:start + len(region_data)] = region_data
     return data
 
 def get_boot_address(filename_or_regions, offset=0):
@@ -337,6 +337,86 @@ int serialboot(void)
 				uart_write(SFL_ACK_SUCCESS);
 				break;
 			}
+			/* On SFL_CMD_CRC... */
+			case SFL_CMD_CRC: {
+				unsigned char *crc_addr;
+				uint32_t block_size;
+				unsigned int count;
+				unsigned int n;
+				unsigned int crc;
+				size_t max_size;
+
+				if(frame.payload_length < 9) {
+					uart_write(SFL_ACK_ERROR);
+					if(serialboot_fail(&failures))
+						return 1;
+					break;
+				}
+
+				/* Reset failures */
+				failures = 0;
+
+				/* Check blocks are in writable memory */
+				crc_addr   = (unsigned char *)(uintptr_t) get_uint32(&frame.payload[0]);
+				block_size = get_uint32(&frame.payload[4]);
+				count      = frame.payload[8];
+				if ((count > SFL_CRC_MAX_BLOCKS) ||
+				    !boot_load_max_size((unsigned long)crc_addr, &max_size) ||
+				    ((uint64_t)block_size*count > max_size)) {
+					uart_write(SFL_ACK_ERROR);
+					if(serialboot_fail(&failures))
+						return 1;
+					break;
+				}
+
+				/* Acknowledge and send the CRC32 of each block */
+				uart_write(SFL_ACK_SUCCESS);
+				for(n = 0; n < count; n++) {
+					crc = crc32(crc_addr + n*block_size, block_size);
+					uart_write((crc >> 24) & 0xff);
+					uart_write((crc >> 16) & 0xff);
+					uart_write((crc >>  8) & 0xff);
+					uart_write((crc >>  0) & 0xff);
+				}
+				break;
+			}
+			/* On SFL_CMD_FILL... */
+			case SFL_CMD_FILL: {
+				char *fill_addr;
+				uint32_t fill_size;
+				size_t max_size;
+
+				if(frame.payload_length < 9) {
+					uart_write(SFL_ACK_ERROR);
+					if(serialboot_fail(&failures))
+						return 1;
+					break;
+				}
+
+				/* Reset failures */
+				failures = 0;
+
+				/* Fill when it fits in writable memory */
+				fill_addr = (char *)(uintptr_t) get_uint32(&frame.payload[0]);
+				fill_size = get_uint32(&frame.payload[4]);
+				if (!boot_load_max_size((unsigned long)fill_addr, &max_size) ||
+				    (fill_size > max_size)) {
+					uart_write(SFL_ACK_ERROR);
+					if(serialboot_fail(&failures))
+						return 1;
+					break;
+				}
+				memset(fill_addr, frame.payload[8], fill_size);
+
+#ifdef HAS_CLEAN_CPU_DCACHE_RANGE
+				if(fill_size != 0)
+					clean_cpu_dcache_range(fill_addr, fill_size);
+#endif
+
+				/* Acknowledge and continue */
+				uart_write(SFL_ACK_SUCCESS);
+				break;
+			}
 			/* On SFL_CMD_JUMP ... */
 			case SFL_CMD_JUMP: {
 				uint32_t jump_addr;
@@ -19,6 +19,10 @@ struct sfl_frame {
 #define SFL_CMD_ABORT		0x00
 #define SFL_CMD_LOAD		0x01
 #define SFL_CMD_JUMP		0x02
+#define SFL_CMD_CRC		0x03 /* addr, block size, count: replies ACK + count CRC32s (big-endian) */
+#define SFL_CMD_FILL		0x04 /* addr, length, value: fills length bytes with value */
+
+#define SFL_CRC_MAX_BLOCKS	64
 
 /* Replies */
 #define SFL_ACK_SUCCESS		'K'
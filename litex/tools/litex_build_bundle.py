@@ -147,6 +147,27 @@ def _safe_extractall(archive, path):
     archive.extractall(path)
 
 
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _open_archive(archive_path, work_dir):
+    # zstd bundles are decompressed to a plain tar first (zstandard module or zstd command).
+    with open(archive_path, "rb") as f:
+        magic = f.read(4)
+    if magic != _ZSTD_MAGIC:
+        return tarfile.open(archive_path, "r:*")
+    tar_path = os.path.join(work_dir, "input.tar")
+    with open(archive_path, "rb") as f, open(tar_path, "wb") as tar:
+        try:
+            import zstandard
+            zstandard.ZstdDecompressor().copy_stream(f, tar)
+        except ImportError:
+            if shutil.which("zstd") is None:
+                raise OSError("zstd bundle requires the zstandard Python module or the zstd command.")
+            subprocess.check_call(["zstd", "-q", "-d", "-c"], stdin=f, stdout=tar)
+    return tarfile.open(tar_path, "r:")
+
+
 def create_bundle(args):
     from litex.build.bundle import BuildBundle, get_pythonpath_roots
 
@@ -157,6 +178,7 @@ def create_bundle(args):
         command      = args.command,
         env          = env,
         strict       = args.strict,
+        compression  = getattr(args, "compression", "gz"),
     )
 
     roots = args.root if args.root else [os.getcwd()]
@@ -186,7 +208,7 @@ def run_local(archive_path, work_dir=None):
     try:
         extract_dir = os.path.join(work_dir, "src")
         os.makedirs(extract_dir, exist_ok=True)
-        with tarfile.open(archive_path, "r:gz") as archive:
+        with _open_archive(archive_path, work_dir) as archive:
             _safe_extractall(archive, extract_dir)
 
         with open(os.path.join(extract_dir, "manifest.json"), encoding="utf-8") as f:
@@ -220,6 +242,7 @@ def main():
     parser.add_argument("--no-auto-pythonpath",      action="store_true",             help="Do not auto-bundle LiteX Python roots.")
     parser.add_argument("--env",                     default=[], action="append",     help="Environment variable to pass (KEY or KEY=VALUE).")
     parser.add_argument("--strict",                  default="warn", choices=["warn", "error"], help="Missing input handling.")
+    parser.add_argument("--compression",             default="gz", choices=["gz", "pigz", "zstd"], help="Archive compression.")
 
     # Bundle replay.
     parser.add_argument("--run-local",               default=None,                    help="Replay an existing bundle locally.")
@@ -8,20 +8,26 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
+import sys
 import time
+import queue
 import threading
 import argparse
 import socket
+from array import array
 
 from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord
 from litex.tools.remote.etherbone import EtherboneReads, EtherboneWrites
 from litex.tools.remote.etherbone import EtherboneIPC
-from litex.tools.remote.csr_builder import CSRBuilder
+from litex.tools.remote.csr_builder import CSRBuilder, batch_read_groups
+
+from litex.soc.integration.common import _get_array_typecode
 
 # Remote Client ------------------------------------------------------------------------------------
 
 class RemoteClient(EtherboneIPC, CSRBuilder):
-    max_burst_length = 255
+    max_burst_length   = 255
+    max_batch_inflight = 64
 
     def __init__(self, host="localhost", port=1234, base_address=0, csr_csv=None, csr_data_width=None,
         csr_bus_address_width=None, debug=False, timeout=2.0, raise_on_timeout=False):
@@ -174,6 +180,90 @@ class RemoteClient(EtherboneIPC, CSRBuilder):
             for i, data in enumerate(datas):
                 print("write 0x{:08x} @ 0x{:08x}".format(data, self.base_address + addr + 4*incr*i))
 
+    def batch_execute(self, ops):
+        # Pipelined execution: records are sent back to back and read responses received in order,
+        # with up to max_batch_inflight read records in flight.
+        addr_size = self.csr_bus_address_width // 8
+        records   = []
+        for kind, group in batch_read_groups(ops):
+            if kind == "write":
+                addr, datas = group[1], group[2]
+                for offset in range(0, len(datas), self.max_burst_length):
+                    record = EtherboneRecord(addr_size)
+                    record.writes = EtherboneWrites(
+                        base_addr = self.base_address + addr + 4*offset,
+                        addr_size = addr_size,
+                        datas     = datas[offset:offset + self.max_burst_length]
+                    )
+                    record.wcount = len(record.writes)
+                    records.append(record)
+                continue
+            # Reads between two writes are packed in records (merged in bursts by the server).
+            addrs = [self.base_address + op[1] + 4*i for op in group for i in range(op[2])]
+            for offset in range(0, len(addrs), self.max_burst_length):
+                record = EtherboneRecord(addr_size)
+                record.reads  = EtherboneReads(addr_size=addr_size, addrs=addrs[offset:offset + self.max_burst_length])
+                record.rcount = len(record.reads)
+                records.append(record)
+            records.append(("results", group))
+
+        datas   = []
+        pending = 0 # Read records in flight.
+        for i, record in enumerate(records):
+            if isinstance(record, tuple):
+                # End of a read group: return its datas to each read.
+                for op in record[1]:
+                    op[3].set_result(datas[:op[2]])
+                    datas = datas[op[2]:]
+                continue
+            self._send_record(record)
+            if record.reads is not None:
+                pending += 1
+            # Receive responses when the window is full or when the results of a group are needed.
+            last = (i + 1 == len(records)) or isinstance(records[i + 1], tuple)
+            while pending and (last or pending >= self.max_batch_inflight):
+                response = self._receive_read_response(addr_size)
+                if response is None:
+                    self._batch_timeout(ops, records[i + 1:])
+                    return
+                datas.extend(response)
+                pending -= 1
+        if self.debug:
+            print("batch: {} records".format(sum(not isinstance(record, tuple) for record in records)))
+
+    def _send_record(self, record):
+        packet = EtherbonePacket(self.csr_bus_address_width)
+        packet.records = [record]
+        packet.encode()
+        self.send_packet(self.socket, packet)
+
+    def _receive_read_response(self, addr_size):
+        response = self.receive_packet(self.socket, addr_size)
+        if response == 0:
+            return None
+        packet = EtherbonePacket(addr_width=self.csr_bus_address_width, init=response)
+        packet.decode()
+        return packet.records.pop().writes.get_datas()
+
+    def _batch_timeout(self, ops, records):
+        # Responses of the other records in flight can still arrive: reconnect to resynchronize the
+        # stream (so that they are not received by later reads) instead of waiting for each of them.
+        if self.debug:
+            message = "Timeout occurred during batch read."
+            message += " Raising TimeoutError." if self.raise_on_timeout else " Returning default values."
+            print(message)
+        self.close()
+        self.open()
+        if self.raise_on_timeout:
+            raise TimeoutError("Timeout occurred during batch read.")
+        # Writes not sent yet are still done, unresolved reads return default values.
+        for record in records:
+            if not isinstance(record, tuple) and record.writes is not None:
+                self._send_record(record)
+        for op in ops:
+            if op[0] == "read" and not op[3].done():
+                op[3].set_result([0]*op[2])
+
 # Utils --------------------------------------------------------------------------------------------
 
 def reg2addr(host, csr_csv, reg):
@@ -209,19 +299,130 @@ def dump_registers(host, csr_csv, port, filter=None, binary=False, timeout=2.0,
         timeout          = timeout,
         raise_on_timeout = raise_on_timeout,
     ) as bus:
-        for name, register in bus.regs.__dict__.items():
-            if (filter is None) or filter in name:
-                register_value = {
-                    True  : f"0b{register.read():032b}",
-                    False : f"0x{register.read():08x}",
-                }[binary]
-                print("0x{:08x} : {} {}".format(register.addr, register_value, name))
+        # Read all the registers in a single batch (one round trip per 64 records).
+        registers = [(name, register) for name, register in bus.regs.d.items()
+            if (filter is None) or filter in name]
+        with bus.batch() as batch:
+            values = [batch.read(register) for name, register in registers]
+        for (name, register), value in zip(registers, values):
+            register_value = {
+                True  : f"0b{value.result():032b}",
+                False : f"0x{value.result():08x}",
+            }[binary]
+            print("0x{:08x} : {} {}".format(register.addr, register_value, name))
 
 def _word_count(length):
     return (length + 3) // 4
 
+def _pipelined(iterable, depth=4):
+    """Run iterable in a background thread (up to depth items ahead) and yield its items.
+
+    Allows overlapping the producer's I/O (bridge or file) with the consumer's.
+    """
+    items = queue.Queue(depth)
+    stop  = threading.Event()
+    end   = object()
+
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set():
+                    return
+            item = end
+        except BaseException as e:
+            item = e
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is end:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+def _words_to_bytes(datas, endianness):
+    words = array(_get_array_typecode(4), datas)
+    if endianness != sys.byteorder:
+        words.byteswap()
+    return words.tobytes()
+
+def _bytes_to_words(data, endianness):
+    words = array(_get_array_typecode(4))
+    words.frombytes(data + bytes(-len(data) % 4))
+    if endianness != sys.byteorder:
+        words.byteswap()
+    return words.tolist()
+
+def _check_chunk_size(chunk_size):
+    if chunk_size <= 0 or chunk_size % 4:
+        raise ValueError("chunk_size must be a positive multiple of 4.")
+
+def _report_throughput(action, length, elapsed):
+    elapsed = max(elapsed, 1e-6)
+    print(f"{action} {length} bytes in {elapsed:.2f}s ({length/elapsed/1e6:.2f}MB/s).")
+
+def stream_read_memory(bus, addr, length, f, endianness="little", chunk_size=2**20):
+    """Read length bytes at addr to file object f, in chunks (constant memory).
+
+    Bridge reads are done in a background thread while the previous chunks are written to f.
+    Returns (bytes read, elapsed time in seconds).
+    """
+    _check_chunk_size(chunk_size)
+    def chunks():
+        for offset in range(0, length, chunk_size):
+            n = min(chunk_size, length - offset)
+            datas = bus.read(addr + offset, _word_count(n), burst="incr")
+            yield _words_to_bytes(datas, endianness)[:n]
+
+    start = time.time()
+    for chunk in _pipelined(chunks()):
+        f.write(chunk)
+    return length, time.time() - start
+
+def stream_write_memory(bus, addr, f, length=None, endianness="little", chunk_size=2**20):
+    """Write the content of file object f (up to length bytes) at addr, in chunks (constant memory).
+
+    File reads are done in a background thread while the previous chunks are written to the bridge.
+    Returns (bytes written, elapsed time in seconds).
+    """
+    _check_chunk_size(chunk_size)
+    def chunks():
+        remaining = length
+        while remaining is None or remaining > 0:
+            data = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not data:
+                return
+            if remaining is not None:
+                remaining -= len(data)
+            yield _bytes_to_words(data, endianness)
+
+    start   = time.time()
+    written = 0
+    for datas in _pipelined(chunks()):
+        bus.write(addr + 4*(written//4), datas, burst="incr")
+        written += 4*len(datas)
+    return written, time.time() - start
+
 def read_memory(host, csr_csv, port, addr, length, binary=False, file=None, endianness="little", timeout=2.0,
-    raise_on_timeout=False):
+    raise_on_timeout=False, chunk_size=2**20):
     word_count = _word_count(length)
 
     with RemoteClient(
@@ -231,24 +432,26 @@ def read_memory(host, csr_csv, port, addr, length, binary=False, file=None, endi
         timeout          = timeout,
         raise_on_timeout = raise_on_timeout,
     ) as bus:
+        if file:
+            # Read from memory and write to file in binary mode.
+            with open(file, "wb") as f:
+                length, elapsed = stream_read_memory(bus, addr, length, f,
+                    endianness = endianness,
+                    chunk_size = chunk_size)
+            _report_throughput("Read", length, elapsed)
+            return
         datas = [] if word_count == 0 else bus.read(addr, word_count, burst="incr")
 
-    if file:
-        # Read from memory and write to file in binary mode.
-        with open(file, "wb") as f:
-            data = b"".join([data.to_bytes(4, byteorder=endianness) for data in datas])[:length]
-            f.write(data)
-    else:
-        # Print to console.
-        for offset, data in enumerate(datas):
-            register_value = {
-                True  : f"0b{data:032b}",
-                False : f"0x{data:08x}",
-            }[binary]
-            print(f"0x{addr + 4 * offset:08x} : {register_value}")
+    # Print to console.
+    for offset, data in enumerate(datas):
+        register_value = {
+            True  : f"0b{data:032b}",
+            False : f"0x{data:08x}",
+        }[binary]
+        print(f"0x{addr + 4 * offset:08x} : {register_value}")
 
 def write_memory(host, csr_csv, port, addr, data, file=None, length=None, endianness="little", timeout=2.0,
-    raise_on_timeout=False):
+    raise_on_timeout=False, chunk_size=2**20):
     with RemoteClient(
         host             = host,
         csr_csv          = csr_csv,
@@ -259,19 +462,11 @@ def write_memory(host, csr_csv, port, addr, data, file=None, length=None, endian
         if file:
             # Read from file and write to memory.
             with open(file, "rb") as f:
-                if length:
-                    data = f.read(length)
-                else:
-                    data = f.read()
-
-            datas = []
-            for i in range(0, len(data), 4):
-                chunk = data[i:i + 4]
-                chunk += bytes(4 - len(chunk))
-                datas.append(int.from_bytes(chunk, byteorder=endianness))
-
-            if datas:
-                bus.write(addr, datas, burst="incr")
+                written, elapsed = stream_write_memory(bus, addr, f,
+                    length     = length or None,
+                    endianness = endianness,
+                    chunk_size = chunk_size)
+            _report_throughput("Wrote", written, elapsed)
         else:
             # Write single data value to memory.
             bus.write(addr, data)
@@ -455,13 +650,13 @@ def run_gui(host, csr_csv, port, timeout=2.0, raise_on_timeout=False):
         dpg.add_text("CSR Registers:")
         with dpg.filter_set(id="csr_filter"):
             def reg_callback(tag, data):
-                for name, reg in  bus.regs.__dict__.items():
+                for name, reg in  bus.regs.d.items():
                     if (tag == name):
                         try:
                             reg.write(int(data, 0))
                         except ValueError:
                             pass
-            for name, reg in bus.regs.__dict__.items():
+            for name, reg in bus.regs.d.items():
                 dpg.add_input_text(
                     indent     = 16,
                     label      = f"0x{reg.addr:08x} - {name}",
@@ -513,7 +708,7 @@ def run_gui(host, csr_csv, port, timeout=2.0, raise_on_timeout=False):
             dpg.add_table_column(label="Size")
             dpg.add_table_column(label="Type")
 
-            for region_name, region_obj in bus.mems.__dict__.items():
+            for region_name, region_obj in bus.mems.d.items():
                 with dpg.table_row():
                     dpg.add_text(f"{region_name}")
                     dpg.add_text(f"0x{region_obj.base:08X}")
@@ -655,7 +850,7 @@ def run_gui(host, csr_csv, port, timeout=2.0, raise_on_timeout=False):
             now = time.time()
 
             # CSR Update.
-            for name, reg in bus.regs.__dict__.items():
+            for name, reg in bus.regs.d.items():
                 value = reg.read()
                 dpg.set_value(item=name, value=f"0x{value:x}")
 
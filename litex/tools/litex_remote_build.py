@@ -78,7 +78,7 @@ def _runner_path():
 
 def _default_job_name(archive_path):
     base = os.path.basename(archive_path)
-    for suffix in [".tar.gz", ".tgz"]:
+    for suffix in [".tar.gz", ".tgz", ".tar.zst"]:
         if base.endswith(suffix):
             base = base[:-len(suffix)]
     base = re.sub(r"[^A-Za-z0-9_.-]+", "_", base).strip("._") or "bundle"
@@ -13,70 +13,15 @@ import argparse
 import os
 import sys
 import socket
+import struct
+import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord, EtherboneWrites
 from litex.tools.remote.etherbone import EtherboneIPC
-
-# Read Merger --------------------------------------------------------------------------------------
-
-def _read_merger(addrs, max_length=255, bursts=None):
-    """Sequential reads merger
-
-    Take a list of read addresses as input and merge the sequential/fixed reads in (base, length, burst) tuples:
-    Example: [0x0, 0x4, 0x10, 0x14, 0x20, 0x20] input  will return [(0x0,2, "incr"), (0x10,2, "incr"), (0x20,2, "fixed")].
-
-    This is useful for UARTBone/Etherbone where command/response roundtrip delay is responsible for
-    most of the access delay and allows minimizing number of commands by grouping them in UARTBone
-    packets.
-    """
-    bursts = ["incr", "fixed"] if bursts is None else bursts
-
-    if max_length <= 0:
-        raise ValueError("max_length must be greater than 0.")
-    if "incr" not in bursts:
-        raise ValueError("Read merger requires incr burst support.")
-    for burst in bursts:
-        if burst not in ["incr", "fixed"]:
-            raise ValueError("Unsupported burst mode: {}".format(burst))
-
-    if not addrs:
-        return
-
-    burst_base   = addrs[0]
-    burst_length = 1
-    burst_type   = "incr"
-    for addr in addrs[1:]:
-        merged = False
-        # Try to merge to a "fixed" burst if supported
-        if ("fixed" in bursts):
-            # If current burst matches
-            if (burst_type == "fixed") or (burst_length == 1):
-                # If addr matches
-                if (addr == burst_base):
-                    if (burst_length != max_length):
-                        burst_type   = "fixed"
-                        burst_length += 1
-                        merged       = True
-
-        # Try to merge to an "incr" burst if supported
-        if ("incr" in bursts):
-            # If current burst matches
-            if (burst_type == "incr") or (burst_length == 1):
-                # If addr matches
-                if (addr == burst_base + (4 * burst_length)):
-                    if (burst_length != max_length):
-                        burst_type   = "incr"
-                        burst_length += 1
-                        merged       = True
-
-        # Generate current burst if addr has not able to merge
-        if not merged:
-            yield (burst_base, burst_length, burst_type)
-            burst_base   = addr
-            burst_length = 1
-            burst_type   = "incr"
-    yield (burst_base, burst_length, burst_type)
+from litex.tools.remote.etherbone import etherbone_packet_header_length, etherbone_record_header_length
+from litex.tools.remote.read_merger import read_merger as _read_merger
 
 # Remote Server ------------------------------------------------------------------------------------
 
@@ -90,10 +35,10 @@ class RemoteServer(EtherboneIPC):
         self.addr_size  = self.addr_width // 8
 
         comm_name = comm.__class__.__name__
-        self.read_max_length = {
+        self.read_max_length = getattr(comm, "read_max_length", {
             "CommUART": 255,
             "CommUDP":    1,
-        }.get(comm_name, 1)
+        }.get(comm_name, 1))
         self.read_bursts = {
             "CommUART": ["incr", "fixed"]
         }.get(comm_name, ["incr"])
@@ -182,6 +127,191 @@ class RemoteServer(EtherboneIPC):
             self.serve_thread.daemon = True
             self.serve_thread.start()
 
+# Async Remote Server ------------------------------------------------------------------------------
+
+class AsyncRemoteServer(RemoteServer):
+    """Asyncio Etherbone server.
+
+    Clients are served concurrently and their records are queued in arrival order (order is kept
+    per client and between clients). The dispatcher takes all the records queued while the bridge
+    was busy and coalesces them into larger bridge transactions: contiguous writes are merged and
+    reads between two writes are merged through `read_merger`. The resulting read bursts are kept
+    in flight (up to `inflight`) on backends that allow it (`max_inflight` attribute of the Comm, or
+    PCIe/DevMem); writes are barriers.
+    """
+    def __init__(self, comm, bind_ip, bind_port=1234, addr_width=32, inflight=None, queue_depth=1024):
+        RemoteServer.__init__(self, comm, bind_ip, bind_port, addr_width)
+        comm_name = comm.__class__.__name__
+        if inflight is None:
+            inflight = getattr(comm, "max_inflight", {
+                "CommPCIe"   : 4,
+                "CommDevMem" : 4,
+            }.get(comm_name, 1))
+        self.inflight         = max(1, int(inflight))
+        self.write_max_length = 255
+        self.queue_depth      = queue_depth
+        self.loop             = None
+        self.serve_task       = None
+        self.serve_thread     = None
+
+    def open(self):
+        RemoteServer.open(self)
+        self.socket.listen(64)
+
+    def close(self):
+        if self.serve_task is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.serve_task.cancel)
+        if self.serve_thread is not None:
+            self.serve_thread.join(5)
+        RemoteServer.close(self)
+
+    # Clients --------------------------------------------------------------------------------------
+
+    async def _receive_packet(self, reader):
+        header_length = etherbone_packet_header_length + etherbone_record_header_length
+        try:
+            header = await reader.readexactly(header_length)
+            wcount, rcount = struct.unpack(">BB", header[header_length - 2:])
+            length = 0
+            if wcount != 0:
+                length += 4*wcount + self.addr_size
+            if rcount != 0:
+                length += (rcount + 1)*self.addr_size
+            return header + await reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    async def _serve_client(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        print("Connected with {}:{}".format(*peer[:2]))
+        writer.write(bytes(":".join([self.comm.__class__.__name__, str(self.bind_ip), str(self.bind_port)]), "UTF-8"))
+        try:
+            while True:
+                packet = await self._receive_packet(reader)
+                if packet is None:
+                    break
+                packet = EtherbonePacket(self.addr_width, packet)
+                packet.decode()
+                record = packet.records.pop()
+
+                # Queue record, wait for read datas and send them back.
+                future = None if record.reads is None else asyncio.get_running_loop().create_future()
+                await self.queue.put((record, future))
+                if future is not None:
+                    reads = await future
+                    record = EtherboneRecord(self.addr_size)
+                    record.writes = EtherboneWrites(addr_size=self.addr_size, datas=reads)
+                    record.wcount = len(record.writes)
+
+                    packet = EtherbonePacket(self.addr_width)
+                    packet.records = [record]
+                    packet.encode()
+                    writer.write(packet.bytes)
+                    await writer.drain()
+        except Exception as e:
+            print("Client error: {}".format(e))
+        finally:
+            print("Disconnect")
+            writer.close()
+
+    # Bridge ---------------------------------------------------------------------------------------
+
+    def _coalesce(self, items):
+        """Turn queued (record, future) items into bridge operations.
+
+        Returns a list of ("write", base, datas) and ("read", addrs, [(future, count)...]).
+        """
+        ops = []
+        for record, future in items:
+            if record.writes is not None:
+                base  = record.writes.base_addr
+                datas = record.writes.get_datas()
+                last  = ops[-1] if ops else None
+                if (last is not None and last[0] == "write" and
+                    last[1] + 4*len(last[2]) == base and
+                    len(last[2]) + len(datas) <= self.write_max_length):
+                    last[2].extend(datas)
+                else:
+                    ops.append(("write", base, list(datas)))
+            if record.reads is not None:
+                addrs = record.reads.get_addrs()
+                last  = ops[-1] if ops else None
+                if last is not None and last[0] == "read":
+                    last[1].extend(addrs)
+                    last[2].append((future, len(addrs)))
+                else:
+                    ops.append(("read", list(addrs), [(future, len(addrs))]))
+        return ops
+
+    async def _read(self, addrs, requests):
+        # Issue bursts to the executor (at most `inflight` run concurrently), keep them in order.
+        loop   = asyncio.get_running_loop()
+        bursts = [loop.run_in_executor(self.executor, self.comm.read, addr, length, burst)
+            for addr, length, burst in _read_merger(addrs,
+                max_length = self.read_max_length,
+                bursts     = self.read_bursts)]
+        try:
+            datas = [data for burst_datas in await asyncio.gather(*bursts) for data in burst_datas]
+        except Exception as e:
+            for future, _ in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        # Return its datas to each request.
+        offset = 0
+        for future, count in requests:
+            if not future.done():
+                future.set_result(datas[offset:offset + count])
+            offset += count
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            while not self.queue.empty():
+                items.append(self.queue.get_nowait())
+
+            # Reads and writes alternate in coalesced operations: each one is done before the next.
+            for op in self._coalesce(items):
+                if op[0] == "write":
+                    try:
+                        await loop.run_in_executor(self.executor, self.comm.write, op[1], op[2])
+                    except Exception as e:
+                        print("Bridge write error: {}".format(e))
+                else:
+                    await self._read(op[1], op[2])
+
+    async def serve(self):
+        """Serve clients until cancelled."""
+        self.queue    = asyncio.Queue(self.queue_depth)
+        self.executor = ThreadPoolExecutor(max_workers=self.inflight)
+        dispatcher    = asyncio.ensure_future(self._dispatch())
+        server        = await asyncio.start_server(self._serve_client, sock=self.socket)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+            self.executor.shutdown(wait=False)
+
+    def _serve_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.serve_task = self.loop.create_task(self.serve())
+        try:
+            self.loop.run_until_complete(self.serve_task)
+        except asyncio.CancelledError:
+            pass # Cancelled by close().
+        finally:
+            self.loop.close()
+
+    def start(self, nthreads=None):
+        # Single event loop thread (nthreads kept for compatibility with RemoteServer).
+        self.serve_thread = threading.Thread(target=self._serve_loop)
+        self.serve_thread.daemon = True
+        self.serve_thread.start()
+
 # Run ----------------------------------------------------------------------------------------------
 
 def main():
@@ -191,6 +321,8 @@ def main():
     parser.add_argument("--bind-port",       default=1234,           help="Host bind port.")
     parser.add_argument("--addr-width",      default=32,             help="bus address width.")
     parser.add_argument("--debug",           action="store_true",    help="Enable debug.")
+    parser.add_argument("--async-server",    action="store_true",    help="Use asyncio server (concurrent clients, coalesced/pipelined bridge accesses).")
+    parser.add_argument("--inflight",        default=None,           help="Max bridge reads in flight with --async-server (default: backend dependent).")
 
     # UART arguments
     parser.add_argument("--uart",            action="store_true",    help="Select UART interface.")
@@ -207,6 +339,7 @@ def main():
     parser.add_argument("--udp-ip",          default="192.168.1.50", help="Set UDP remote IP address.")
     parser.add_argument("--udp-port",        default=1234,           help="Set UDP remote port.")
     parser.add_argument("--udp-scan",        action="store_true",    help="Scan network for available UDP devices.")
+    parser.add_argument("--udp-window",      default=1,              help="Max UDP read records in flight.")
 
     # PCIe arguments
     parser.add_argument("--pcie",            action="store_true",    help="Select PCIe interface.")
@@ -271,7 +404,7 @@ def main():
             return
         else:
             print("[CommUDP] ip: {} / port: {} / ".format(udp_ip, udp_port), end="")
-            comm = CommUDP(udp_ip, udp_port, debug=args.debug, addr_width=int(args.addr_width))
+            comm = CommUDP(udp_ip, udp_port, debug=args.debug, addr_width=int(args.addr_width), window=int(args.udp_window))
 
     # PCIe mode
     elif args.pcie:
@@ -304,7 +437,11 @@ def main():
         print("[CommDevMem] base: 0x{:08x} / size: 0x{:08x} / ".format(devmem_base, devmem_size), end="")
         comm = CommDevMem(base=devmem_base, size=devmem_size, debug=args.debug)
 
-    server = RemoteServer(comm, args.bind_ip, int(args.bind_port), addr_width=int(args.addr_width))
+    if args.async_server:
+        inflight = None if args.inflight is None else int(args.inflight)
+        server = AsyncRemoteServer(comm, args.bind_ip, int(args.bind_port), addr_width=int(args.addr_width), inflight=inflight)
+    else:
+        server = RemoteServer(comm, args.bind_ip, int(args.bind_port), addr_width=int(args.addr_width))
     server.open()
     server.start(4)
     try:
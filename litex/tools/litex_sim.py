@@ -11,13 +11,18 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
+import json
 import subprocess
 
 from migen import *
 
 from litex.build.generic_platform import *
 from litex.build.sim              import SimPlatform
+from litex.build.sim              import verilator
 from litex.build.sim.config       import SimConfig
+from litex.build.sim.snapshot     import SimSnapshots
+from litex.build.sim.benchmark    import SimBenchmark, get_benchmark_variants
+from litex.build.sim.benchmark    import format_benchmark_results, write_benchmark_results
 from litex.build.sim.qemu.cosim   import qemu_add_args, qemu_configure, qemu_add_sim_modules
 from litex.build.sim.qemu.cosim   import qemu_add_shared_ram, qemu_command, qemu_spawn_when_bridge_ready
 
@@ -489,6 +494,23 @@ def sim_args(parser):
     parser.add_argument("--gtkwave-savefile",     action="store_true",     help="Generate GTKWave savefile.")
     parser.add_argument("--non-interactive",      action="store_true",     help="Run simulation without user input.")
 
+    # Snapshots.
+    parser.add_argument("--snapshot-save",        default=None,            help="Save a named simulation snapshot and exit.")
+    parser.add_argument("--snapshot-time",        default=None,            help="Simulated time of the saved snapshot (ps).")
+    parser.add_argument("--snapshot-until",       default=None,            help="Save the snapshot when this string is printed on the console (ex: 'litex> ').")
+    parser.add_argument("--snapshot-restore",     default=None,            help="Start the simulation from a saved snapshot.")
+    parser.add_argument("--snapshot-list",        action="store_true",     help="List the saved simulation snapshots and exit.")
+    parser.add_argument("--snapshot-fork",        default=None,            help="Restore a snapshot into parallel simulations (one per stimulus).")
+    parser.add_argument("--snapshot-stimuli",     default=None,            help="Stimuli JSON file for --snapshot-fork (list of {name, stdin, env, until, timeout}).")
+    parser.add_argument("--snapshot-jobs",        default=None, type=int,  help="Maximum number of parallel simulations for --snapshot-fork.")
+
+    # Benchmark.
+    parser.add_argument("--benchmark",            action="store_true",     help="Benchmark the simulation over thread counts/optimization levels and exit.")
+    parser.add_argument("--benchmark-threads",    default="1,2,4",         help="Comma-separated simulation thread counts to benchmark.")
+    parser.add_argument("--benchmark-opt-levels", default="O3",            help="Comma-separated compilation optimization levels to benchmark.")
+    parser.add_argument("--benchmark-cycles",     default=1e6, type=float, help="Number of sys_clk cycles simulated per variant.")
+    parser.add_argument("--benchmark-json",       default=None,            help="Benchmark results JSON file (default: <gateware>/benchmark.json).")
+
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(description="LiteX SoC Simulation utility")
@@ -500,6 +522,10 @@ def main():
         parser.error("--ram-init cannot be used with --with-sdram; use --sdram-init.")
     if args.sim_speed_interval <= 0:
         parser.error("--sim-speed-interval must be greater than 0.")
+    if args.snapshot_save is not None and (args.snapshot_time is None) == (args.snapshot_until is None):
+        parser.error("--snapshot-save requires either --snapshot-time or --snapshot-until.")
+    if args.snapshot_fork is not None and args.snapshot_stimuli is None:
+        parser.error("--snapshot-fork requires --snapshot-stimuli.")
 
     soc_kwargs = soc_core_argdict(args)
     qemu_enabled = qemu_configure(args, parser, soc_kwargs)
@@ -667,18 +693,74 @@ def main():
                 timeout = args.qemu_wait_timeout,
             )
 
-    builder = Builder(soc, **parser.builder_argdict)
+    builder   = Builder(soc, **parser.builder_argdict)
+    snapshots = SimSnapshots(builder.gateware_dir, build_name=soc.get_build_name())
+    if args.snapshot_list:
+        print_snapshots(snapshots)
+        return
+    snapshot_run      = args.snapshot_save is not None or args.snapshot_fork is not None
+    toolchain_argdict = dict(parser.toolchain_argdict)
+    if snapshot_run or args.benchmark:
+        toolchain_argdict["run"] = False # Compiled below, then run by SimSnapshots/SimBenchmark.
+    if args.snapshot_restore is not None:
+        os.environ["LITEX_SIM_LOAD_FILE"] = snapshots.get(args.snapshot_restore)["filename"]
     try:
         builder.build(
             sim_config       = sim_config,
             interactive      = not args.non_interactive,
             video            = args.with_video_framebuffer or args.with_video_terminal or args.with_video_colorbars,
-            pre_run_callback = pre_run_callback,
-            **parser.toolchain_argdict,
+            pre_run_callback = None if (snapshot_run or args.benchmark) else pre_run_callback,
+            savable          = snapshot_run or args.snapshot_restore is not None,
+            **toolchain_argdict,
         )
+        if args.benchmark:
+            run_benchmark(builder, soc, sim_config, sys_clk_freq, args)
+        if snapshot_run:
+            snapshots.compile()
+        if args.snapshot_save is not None:
+            snapshot = snapshots.save(args.snapshot_save,
+                time_ps = None if args.snapshot_time is None else int(float(args.snapshot_time)),
+                until   = args.snapshot_until,
+                restore = args.snapshot_restore,
+            )
+            print("[litex_sim] Snapshot {} saved at {}ps.".format(snapshot["name"], snapshot["time_ps"]))
+        if args.snapshot_fork is not None:
+            with open(args.snapshot_stimuli, "r") as f:
+                stimuli = json.load(f)
+            results = snapshots.fork(args.snapshot_fork, stimuli, jobs=args.snapshot_jobs)
+            for r in results:
+                print("[litex_sim] {:<16} returncode={:<4} matched={!s:<5} elapsed={:.1f}s log={}".format(
+                    r["name"], r["returncode"], r["matched"], r["elapsed"], r["log"]))
     finally:
         if qemu_proc is not None and qemu_proc.poll() is None:
             qemu_proc.terminate()
 
+def run_benchmark(builder, soc, sim_config, sys_clk_freq, args):
+    benchmark = SimBenchmark(builder.gateware_dir,
+        sources      = soc.platform.sources,
+        sys_clk_freq = sys_clk_freq,
+        cycles       = int(args.benchmark_cycles),
+        build_name   = soc.get_build_name(),
+        jobs         = args.jobs,
+        modules      = [m["module"] for m in sim_config.modules],
+        extra_files  = verilator._normalize_verilator_extra_sources(args.verilator_extra_sources),
+        build_kwargs = {"video": args.with_video_framebuffer or args.with_video_terminal or args.with_video_colorbars},
+    )
+    variants = get_benchmark_variants(
+        threads    = [int(t) for t in args.benchmark_threads.split(",")],
+        opt_levels = args.benchmark_opt_levels.split(","),
+    )
+    results = benchmark.run(variants)
+    print(format_benchmark_results(results))
+    json_file = args.benchmark_json or os.path.join(builder.gateware_dir, "benchmark.json")
+    write_benchmark_results(results, json_file)
+    print("[litex_sim] Benchmark results written to {}.".format(json_file))
+
+def print_snapshots(snapshots):
+    print("{:<24} {:>16} {:>12} {:<24} {}".format("Name", "Time (ps)", "Size", "Parent", "Created"))
+    for s in snapshots.list():
+        print("{:<24} {:>16} {:>12} {:<24} {}".format(
+            s["name"], s["time_ps"], s["size"], s["parent"] or "-", s["created"]))
+
 if __name__ == "__main__":
     main()
@@ -13,7 +13,11 @@ import sys
 import signal
 import os
 import time
+import queue
+import struct
 import serial
+import zlib
+import binascii
 import threading
 import argparse
 import json
@@ -250,11 +254,17 @@ sfl_address_length  = 4
 sfl_data_length     = sfl_payload_length - sfl_address_length
 sfl_safe_data_length = 64
 sfl_default_outstanding = 8
+sfl_prepared_frames = 64
+sfl_delta_block_size = 4096
+sfl_crc_max_blocks   = 64
+sfl_fill_max_length  = 2**20
 
 # General commands
 sfl_cmd_abort       = b"\x00"
 sfl_cmd_load        = b"\x01"
 sfl_cmd_jump        = b"\x02"
+sfl_cmd_crc         = b"\x03"
+sfl_cmd_fill        = b"\x04"
 
 # Replies
 sfl_ack_success  = b"K"
@@ -278,11 +288,21 @@ class SFLFrame:
         return crc16(self.cmd + self.payload)
 
     def encode(self):
-        packet = bytes([len(self.payload)])
-        packet += self.compute_crc().to_bytes(2, "big")
-        packet += self.cmd
-        packet += self.payload
-        return packet
+        return sfl_encode_frame(self.cmd, self.payload)
+
+
+def sfl_encode_frame(cmd, payload, address=None):
+    """Encode an SFL frame (length, crc16, cmd, [address], payload) in a preallocated bytearray."""
+    header_length  = 3 + len(cmd)
+    address_length = 0 if address is None else sfl_address_length
+    frame = bytearray(header_length + address_length + len(payload))
+    frame[0] = address_length + len(payload)
+    frame[3:header_length] = cmd
+    if address is not None:
+        struct.pack_into(">I", frame, header_length, address)
+    frame[header_length + address_length:] = payload
+    struct.pack_into(">H", frame, 1, binascii.crc_hqx(memoryview(frame)[3:], 0))
+    return frame
 
 # CRC16 --------------------------------------------------------------------------------------------
 
@@ -323,15 +343,15 @@ crc16_table = [
 
 
 def crc16(l):
-    crc = 0
-    for d in l:
-        crc = crc16_table[((crc >> 8) ^ d) & 0xff] ^ (crc << 8)
-    return crc & 0xffff
+    # CRC-16/CCITT (XMODEM), same polynomial/init than crc16_table: use binascii's C implementation.
+    if not isinstance(l, (bytes, bytearray, memoryview)):
+        l = bytes(l)
+    return binascii.crc_hqx(l, 0)
 
 # LiteXTerm ----------------------------------------------------------------------------------------
 
 class LiteXTerm:
-    def __init__(self, serial_boot, kernel_image, kernel_address, json_images, safe, exit_on=None):
+    def __init__(self, serial_boot, kernel_image, kernel_address, json_images, safe, exit_on=None, delta=False):
         self.serial_boot = serial_boot
         if kernel_image is not None and json_images is not None:
             raise ValueError("LiteXTerm cannot use both kernel_image and json_images.")
@@ -363,6 +383,7 @@ class LiteXTerm:
         self.sigint_time_last = 0
 
         self.safe        = safe
+        self.delta       = delta
         self.delay       = 0
         self.length      = sfl_safe_data_length if safe else sfl_data_length
         self.outstanding = 1 if safe else sfl_default_outstanding
@@ -421,6 +442,9 @@ class LiteXTerm:
             raise SFLUploadError("timed out waiting for device reply")
         return reply
 
+    def read_sfl_data(self, length, timeout=1.0):
+        return b"".join(self.read_sfl_reply(timeout=timeout) for _ in range(length))
+
     def write_sfl_data(self, data, timeout=1.0):
         if not hasattr(self.port, "write_timeout"):
             return self.port.write(data)
@@ -562,12 +586,17 @@ class LiteXTerm:
         if not self.safe:
             self.upload_calibration(address, length)
 
+        # Delta upload plan.
+        plan = None
+        if self.delta:
+            plan = self.delta_upload_plan(filename, address, length)
+
         profiles = self.upload_profiles()
         last_error = None
         for n, (data_length, outstanding) in enumerate(profiles):
             self.check_upload_abort()
             try:
-                uploaded = self.upload_once(filename, address, length, data_length, outstanding)
+                uploaded = self.upload_once(filename, address, length, data_length, outstanding, plan=plan)
                 self.length = data_length
                 self.outstanding = outstanding
                 if not self.safe and data_length <= sfl_safe_data_length and outstanding == 1:
@@ -608,84 +637,205 @@ class LiteXTerm:
                 profiles.append(profile)
         return profiles
 
-    def upload_once(self, filename, address, length, data_length, max_outstanding):
+    def request_block_crcs(self, address, block_size, count, retries=4):
+        # Get the CRC32 of count blocks of the device's memory, None if not supported by the BIOS.
+        crcs = []
+        while len(crcs) < count:
+            self.check_upload_abort()
+            n = min(count - len(crcs), sfl_crc_max_blocks)
+            payload = struct.pack(">IB", block_size, n)
+            frame   = sfl_encode_frame(sfl_cmd_crc, payload, address=address + len(crcs)*block_size)
+            for _ in range(retries):
+                self.write_sfl_data(frame)
+                reply = self.read_sfl_reply(timeout=5.0)
+                if reply != sfl_ack_crcerror:
+                    break
+            if reply == sfl_ack_unknown:
+                return None
+            if reply != sfl_ack_success:
+                raise SFLUploadError(f"got unexpected response to CRC request '{reply}'", reply=reply)
+            data = self.read_sfl_data(4*n, timeout=5.0)
+            crcs.extend(struct.unpack(f">{n}I", data))
+        return crcs
+
+    def delta_upload_plan(self, filename, address, length, block_size=sfl_delta_block_size):
+        """Compare the image to the device's memory and return the segments to upload.
+
+        Segments are (cmd, address, offset, size) tuples: blocks with the same CRC32 on both sides
+        are skipped, changed zero blocks are sent as fills and other changed blocks as loads (the
+        last partial block is always loaded). Returns None when the BIOS does not support it.
+        """
+        nblocks = length//block_size
+        self.drain()
+        remote_crcs = self.request_block_crcs(address, block_size, nblocks)
+        if remote_crcs is None:
+            print("[LITEX-TERM] Device does not support delta upload, uploading full image.")
+            return None
+
+        plan = []
+        zero = bytes(block_size)
+        def add(cmd, offset, size):
+            # Merge with previous segment when contiguous and of the same type.
+            if plan and plan[-1][0] == cmd and plan[-1][2] + plan[-1][3] == offset and \
+                (cmd != "fill" or plan[-1][3] + size <= sfl_fill_max_length):
+                plan[-1] = (cmd, plan[-1][1], plan[-1][2], plan[-1][3] + size)
+            else:
+                plan.append((cmd, address + offset, offset, size))
+        with open(filename, "rb") as f:
+            for n, remote_crc in enumerate(remote_crcs):
+                data = f.read(block_size)
+                if zlib.crc32(data) == remote_crc:
+                    continue
+                add("fill" if data == zero else "load", n*block_size, block_size)
+        if length % block_size:
+            add("load", nblocks*block_size, length % block_size)
+
+        loads = sum(size for cmd, _, _, size in plan if cmd == "load")
+        fills = sum(size for cmd, _, _, size in plan if cmd == "fill")
+        print(f"[LITEX-TERM] Delta upload: {loads} bytes to load, {fills} bytes to fill, "
+              f"{length - loads - fills} bytes unchanged.")
+        return plan
+
+    def upload_frames(self, f, plan, data_length):
+        # Encode the frames of the upload plan, yield (frame, length).
+        for cmd, address, offset, size in plan:
+            if cmd == "fill":
+                yield sfl_encode_frame(sfl_cmd_fill, struct.pack(">IB", size, 0), address=address), size
+                continue
+            f.seek(offset)
+            position = 0
+            while position < size:
+                data = f.read(min(size - position, data_length))
+                if not data:
+                    raise SFLUploadError("unexpected end of file")
+                yield sfl_encode_frame(sfl_cmd_load, data, address=address + position), len(data)
+                position += len(data)
+
+    def prepare_frames(self, frames_iter, frames, stop):
+        # Prepare the frames ahead of the serial writer (None marks the end).
+        try:
+            for item in frames_iter:
+                if stop.is_set():
+                    break
+                while not stop.is_set():
+                    try:
+                        frames.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+            item = None
+        except Exception as e:
+            item = e
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+    def next_prepared_frame(self, frames):
+        while True:
+            self.check_upload_abort()
+            try:
+                item = frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if isinstance(item, Exception):
+                raise item
+            if item is None:
+                raise SFLUploadError("frame preparation ended early")
+            return item
+
+    def upload_once(self, filename, address, length, data_length, max_outstanding, plan=None):
+        if plan is None:
+            plan = [("load", address, 0, length)]
+        frames = queue.Queue(sfl_prepared_frames)
+        stop   = threading.Event()
         with open(filename, "rb") as f:
-            current_address = address
-            position        = 0
-            start           = time.time()
-            remaining       = length
-            outstanding     = deque()
-            current_window  = 1
-            window_successes = 0
-            last_progress_update = 0.0
-            while remaining or outstanding:
+            preparer = threading.Thread(target=self.prepare_frames,
+                args=(self.upload_frames(f, plan, data_length), frames, stop))
+            preparer.daemon = True
+            preparer.start()
+            try:
+                self._upload_once(frames, sum(size for _, _, _, size in plan), data_length, max_outstanding)
+                return length
+            finally:
+                stop.set()
+                preparer.join()
+
+    def _upload_once(self, frames, length, data_length, max_outstanding):
+        position        = 0
+        start           = time.time()
+        remaining       = length
+        outstanding     = deque()
+        current_window  = 1
+        window_successes = 0
+        last_progress_update = 0.0
+        while remaining or outstanding:
+            self.check_upload_abort()
+            # Show progress (throttled to 10 Hz to avoid overloading terminal/X11)
+            now = time.time()
+            if length and now - last_progress_update >= 0.1:
+                sys.stdout.write("|{}>{}| {}%\r".format(
+                    "=" * (20*position//length),
+                    " " * (20-20*position//length),
+                    100*position//length))
+                sys.stdout.flush()
+                last_progress_update = now
+
+            # Send frame if max outstanding not reached.
+            while remaining and len(outstanding) < current_window:
                 self.check_upload_abort()
-                # Show progress (throttled to 10 Hz to avoid overloading terminal/X11)
-                now = time.time()
-                if length and now - last_progress_update >= 0.1:
-                    sys.stdout.write("|{}>{}| {}%\r".format(
-                        "=" * (20*position//length),
-                        " " * (20-20*position//length),
-                        100*position//length))
-                    sys.stdout.flush()
-                    last_progress_update = now
-
-                # Send frame if max outstanding not reached.
-                while remaining and len(outstanding) < current_window:
-                    self.check_upload_abort()
-                    # Prepare frame.
-                    frame_data = f.read(min(remaining, data_length))
-                    frame = self.make_load_frame(current_address, frame_data)
-                    encoded_frame = frame.encode()
-
-                    # Encode frame and send it.
-                    write_timeout = max(1.0, self.frame_time(data_length) + 0.5)
-                    self.write_sfl_data(encoded_frame, timeout=write_timeout)
+                # Get prepared frame.
+                encoded_frame, frame_length = self.next_prepared_frame(frames)
 
-                    # Update parameters
-                    current_address += len(frame_data)
-                    position        += len(frame_data)
-                    remaining       -= len(frame_data)
-                    outstanding.append({"frame": encoded_frame, "retries": 0})
+                # Send frame.
+                write_timeout = max(1.0, self.frame_time(data_length) + 0.5)
+                self.write_sfl_data(encoded_frame, timeout=write_timeout)
 
-                    # Inter-frame delay.
-                    time.sleep(self.delay)
+                # Update parameters
+                position        += frame_length
+                remaining       -= frame_length
+                outstanding.append({"frame": encoded_frame, "retries": 0})
 
-                if not outstanding:
-                    continue
+                # Inter-frame delay.
+                time.sleep(self.delay)
 
-                self.check_upload_abort()
-                try:
-                    ack = self.receive_upload_response(
-                        timeout=max(1.0, self.frame_time(data_length) * (len(outstanding) + 1) + 0.5)
-                    )
-                except SFLUploadError as e:
-                    if (
-                        e.reply == sfl_ack_crcerror and
-                        len(outstanding) == 1 and
-                        outstanding[0]["retries"] < 16
-                    ):
-                        outstanding[0]["retries"] += 1
-                        write_timeout = max(1.0, self.frame_time(data_length) + 0.5)
-                        self.write_sfl_data(outstanding[0]["frame"], timeout=write_timeout)
-                        current_window = 1
+            if not outstanding:
+                continue
+
+            self.check_upload_abort()
+            try:
+                ack = self.receive_upload_response(
+                    timeout=max(1.0, self.frame_time(data_length) * (len(outstanding) + 1) + 0.5)
+                )
+            except SFLUploadError as e:
+                if (
+                    e.reply == sfl_ack_crcerror and
+                    len(outstanding) == 1 and
+                    outstanding[0]["retries"] < 16
+                ):
+                    outstanding[0]["retries"] += 1
+                    write_timeout = max(1.0, self.frame_time(data_length) + 0.5)
+                    self.write_sfl_data(outstanding[0]["frame"], timeout=write_timeout)
+                    current_window = 1
+                    window_successes = 0
+                    continue
+                raise
+
+            if ack:
+                outstanding.popleft()
+                if current_window < max_outstanding:
+                    window_successes += 1
+                    if window_successes >= current_window:
+                        current_window += 1
                         window_successes = 0
-                        continue
-                    raise
-
-                if ack:
-                    outstanding.popleft()
-                    if current_window < max_outstanding:
-                        window_successes += 1
-                        if window_successes >= current_window:
-                            current_window += 1
-                            window_successes = 0
-
-            # Compute speed.
-            end     = time.time()
-            elapsed = end - start
-            print("[LITEX-TERM] Upload complete ({0:.1f}KB/s).".format(length/(elapsed*1024)))
-            return length
+
+        # Compute speed.
+        end     = time.time()
+        elapsed = max(end - start, 1e-6)
+        print("[LITEX-TERM] Upload complete ({0:.1f}KB/s).".format(length/(elapsed*1024)))
+        return length
 
     def boot(self):
         print("[LITEX-TERM] Booting the device.")
@@ -862,6 +1012,7 @@ def _get_args():
     parser.add_argument("--kernel-adr",     default="0x40000000",               help="Kernel address.")
     parser.add_argument("--images",         default=None,                       help="JSON description of the images to load to memory.")
     parser.add_argument("--safe",           action="store_true",                help="Safe serial boot mode, disable upload speed optimizations.")
+    parser.add_argument("--delta",          action="store_true",                help="Only upload blocks that differ from device's memory (requires BIOS support).")
     parser.add_argument("--exit-on",        default=None,                       help="Exit when this string is received from the device.")
 
     parser.add_argument("--csr-csv",        default=None,                       help="SoC CSV file.")
@@ -877,7 +1028,7 @@ def _get_args():
 
 def main():
     args = _get_args()
-    term = LiteXTerm(args.serial_boot, args.kernel, args.kernel_adr, args.images, args.safe, args.exit_on)
+    term = LiteXTerm(args.serial_boot, args.kernel, args.kernel_adr, args.images, args.safe, args.exit_on, args.delta)
 
     if sys.platform == "win32":
         if args.port in ["crossover", "jtag"]:
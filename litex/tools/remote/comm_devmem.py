@@ -9,16 +9,18 @@ import mmap
 import ctypes
 
 from litex.tools.remote.csr_builder import CSRBuilder
+from litex.tools.remote.comm_mmap   import MMAPBulkAccess
 
 # CommDevMem ---------------------------------------------------------------------------------------
 
-class CommDevMem(CSRBuilder):
+class CommDevMem(CSRBuilder, MMAPBulkAccess):
     """Direct /dev/mem access to a memory-mapped LiteX SoC.
 
     Useful when the LiteX SoC is accessible from a Hard CPU running Linux (ex Zynq7000's GP0 at
     0x4000_0000 or Cyclone V HPS's H2F LW bridge at 0xff20_0000): running litex_server --devmem on
     the Hard CPU then allows remote litex_cli/litescope accesses. Addresses are physical addresses;
-    base/size define the mmap'ed window.
+    base/size define the mmap'ed window. Memories can be accessed in bulk with read_bulk/read_bytes/
+    read_into/write_bulk.
     """
     def __init__(self, base=0xff20_0000, size=0x0020_0000, dev="/dev/mem", csr_csv=None, debug=False):
         CSRBuilder.__init__(self, comm=self, csr_csv=csr_csv)
@@ -0,0 +1,66 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import sys
+from array import array
+
+# MMAP Bulk Accesses -------------------------------------------------------------------------------
+
+class MMAPBulkAccess:
+    """Bulk accesses to a mmap'ed window (CommPCIe/CommDevMem).
+
+    Data is copied with a single slice operation between the mmap and the caller's buffer, without
+    per-word objects. Words are little-endian 32-bit. Copies may be done with wider accesses than
+    32-bit: use read/write for CSRs and the bulk accesses for memories (DMA buffers, SRAM, etc...).
+    Requires `self.mmap` and `self._offset(addr)` (mmap offset of a word address).
+    """
+    def _bulk_slice(self, addr, nbytes):
+        if addr % 4 or nbytes % 4:
+            raise ValueError("Bulk accesses must be 32-bit aligned.")
+        start = self._offset(addr)
+        if nbytes:
+            self._offset(addr + nbytes - 4) # Check end of access.
+        return slice(start, start + nbytes)
+
+    def read_into(self, addr, buffer):
+        """Read len(buffer) bytes from addr into buffer (bytearray, memoryview, array('I'), ...)."""
+        buffer = memoryview(buffer).cast("B")
+        with memoryview(self.mmap) as mm:
+            buffer[:] = mm[self._bulk_slice(addr, len(buffer))]
+        if self.debug:
+            print("read {:d} bytes @ 0x{:08x}".format(len(buffer), addr))
+        return len(buffer)
+
+    def read_bytes(self, addr, nbytes):
+        """Read nbytes from addr as bytes."""
+        data = self.mmap[self._bulk_slice(addr, nbytes)]
+        if self.debug:
+            print("read {:d} bytes @ 0x{:08x}".format(nbytes, addr))
+        return data
+
+    def read_bulk(self, addr, length):
+        """Read length words from addr as an array('I')."""
+        data = array("I")
+        with memoryview(self.mmap) as mm:
+            data.frombytes(mm[self._bulk_slice(addr, 4*length)])
+        if sys.byteorder == "big":
+            data.byteswap()
+        if self.debug:
+            print("read {:d} words @ 0x{:08x}".format(length, addr))
+        return data
+
+    def write_bulk(self, addr, data):
+        """Write data (bytes, bytearray, memoryview, array('I') or list of words) to addr."""
+        if isinstance(data, list):
+            data = array("I", data)
+        if isinstance(data, array) and sys.byteorder == "big":
+            data = array(data.typecode, data)
+            data.byteswap()
+        data = memoryview(data).cast("B")
+        with memoryview(self.mmap) as mm:
+            mm[self._bulk_slice(addr, len(data))] = data
+        if self.debug:
+            print("write {:d} bytes @ 0x{:08x}".format(len(data), addr))
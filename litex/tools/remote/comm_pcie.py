@@ -10,10 +10,11 @@ import ctypes
 import subprocess
 
 from litex.tools.remote.csr_builder import CSRBuilder
+from litex.tools.remote.comm_mmap   import MMAPBulkAccess
 
 # CommPCIe -----------------------------------------------------------------------------------------
 
-class CommPCIe(CSRBuilder):
+class CommPCIe(CSRBuilder, MMAPBulkAccess):
     def __init__(self, bar, csr_csv=None, debug=False):
         # Initialize CSRBuilder and set up BAR path.
         CSRBuilder.__init__(self, comm=self, csr_csv=csr_csv)
@@ -60,6 +61,11 @@ class CommPCIe(CSRBuilder):
         os.close(self.file)
         del self.file
 
+    def _offset(self, addr):
+        # BAR offset of a word address (and check BAR size).
+        assert 0 <= addr <= (self.size - 4), f"Address 0x{addr:08x} outside of PCIe BAR."
+        return addr
+
     def read(self, addr, length=None, burst="incr"):
         # Read data from mmap (incr burst only).
         assert burst == "incr"
@@ -16,14 +16,27 @@ from litex.tools.remote.csr_builder import CSRBuilder
 # CommUDP ------------------------------------------------------------------------------------------
 
 class CommUDP(CSRBuilder):
-    def __init__(self, server="192.168.1.50", port=1234, csr_csv=None, debug=False, timeout=1.0, addr_width=32):
+    """Etherbone over UDP.
+
+    Reads are split in records of up to `max_length` words, each tagged by its `base_ret_addr`.
+    With `window` > 1, up to `window` records are kept in flight and replies are reordered on their
+    tag, so bulk reads are limited by the link bandwidth instead of the round-trip time.
+    """
+    def __init__(self, server="192.168.1.50", port=1234, csr_csv=None, debug=False, timeout=1.0, addr_width=32,
+        window=1, max_length=255):
         CSRBuilder.__init__(self, comm=self, csr_csv=csr_csv)
+        assert 1 <= max_length <= 255
+        assert window >= 1
         self.server = server
         self.port   = port
         self.debug  = debug
         self.timeout= timeout
         self.read_counter = 0
         self.addr_width   = addr_width
+        self.window       = window
+        self.max_length   = max_length
+        # Max read length accepted by read() in a single call (used by litex_server).
+        self.read_max_length = 1 if window == 1 else window*max_length
 
     def open(self, probe=True):
         if hasattr(self, "socket"):
@@ -81,51 +94,64 @@ class CommUDP(CSRBuilder):
             if self.probe(ip=ip.format(str(i)), port=self.port, loose=True):
                 print("- {}".format(ip.format(i)))
 
+    def _send_read(self, addr, length):
+        self.read_counter = (self.read_counter + 1) % 2**self.addr_width
+        record = EtherboneRecord(addr_size=self.addr_width//8)
+        record.reads = EtherboneReads(addr_size=self.addr_width//8, addrs=[addr+4*j for j in range(length)])
+        record.rcount = len(record.reads)
+        record.reads.base_ret_addr = self.read_counter
+
+        packet = EtherbonePacket(addr_width=self.addr_width)
+        packet.records = [record]
+        packet.encode()
+
+        self.socket.sendto(packet.bytes, (self.server, self.port))
+        return self.read_counter
+
     def read(self, addr, length=None, burst="incr"):
         assert burst == "incr"
         length_int = 1 if length is None else length
 
         retries = 10
 
-        for r in range(retries):
-            self.read_counter += 1
-
-            record = EtherboneRecord(addr_size=self.addr_width//8)
-            record.reads = EtherboneReads(addr_size=self.addr_width//8, addrs=[addr+4*j for j in range(length_int)])
-            record.rcount = len(record.reads)
-            record.reads.base_ret_addr = self.read_counter
-
-            packet = EtherbonePacket(addr_width=self.addr_width)
-            packet.records = [record]
-            packet.encode()
+        # Split read in records of up to max_length words.
+        chunks  = [(addr + 4*offset, min(self.max_length, length_int - offset))
+            for offset in range(0, length_int, self.max_length)]
+        results = [None]*len(chunks)
+        pending = {} # tag: (chunk index, tries).
+        sent    = 0
+        done    = 0
+        while done < len(chunks):
+            # Keep up to window records in flight.
+            while sent < len(chunks) and len(pending) < self.window:
+                pending[self._send_read(*chunks[sent])] = (sent, 1)
+                sent += 1
 
-            self.socket.sendto(packet.bytes, (self.server, self.port))
-
-            timed_out = False
-            while True:
-                try:
-                    datas, dummy = self.socket.recvfrom(8192)
-                except socket.timeout:
-                    if self.debug:
-                        print("socket timeout, retrying ({}/{})".format(r+1, retries))
-                    timed_out = True
-                    break
-
-                packet = EtherbonePacket(self.addr_width, datas)
-                packet.decode()
-                record = packet.records.pop()
-                datas = record.writes.get_datas()
-                if record.writes.base_addr == self.read_counter:
-                    break
-                else:
+            try:
+                datas, dummy = self.socket.recvfrom(8192)
+            except socket.timeout:
+                # Resend the records still in flight with new tags.
+                for tag, (index, tries) in list(pending.items()):
                     if self.debug:
-                        print(f"WARNING: request/response id mismatch: 0x{self.read_counter:08x} != 0x{record.writes.base_addr:08x}")
-
-            if not timed_out:
-                break
+                        print("socket timeout, retrying ({}/{})".format(tries, retries))
+                    if tries >= retries:
+                        raise socket.timeout
+                    del pending[tag]
+                    pending[self._send_read(*chunks[index])] = (index, tries + 1)
+                continue
 
-        else:
-            raise socket.timeout
+            packet = EtherbonePacket(self.addr_width, datas)
+            packet.decode()
+            record = packet.records.pop()
+            tag    = record.writes.base_addr
+            if tag in pending:
+                index, tries = pending.pop(tag)
+                results[index] = record.writes.get_datas()
+                done += 1
+            elif self.debug:
+                print(f"WARNING: unexpected response id: 0x{tag:08x}")
+
+        datas = [data for chunk_datas in results for data in chunk_datas]
 
         if self.debug:
             for i, value in enumerate(datas):
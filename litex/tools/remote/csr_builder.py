@@ -5,8 +5,11 @@
 # Copyright (c) 2016 Tim 'mithro' Ansell <mithro@mithis.com>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import os
 import csv
 
+from litex.tools.remote.read_merger import read_merger
+
 # CSR Elements -------------------------------------------------------------------------------------
 
 class CSRElements:
@@ -24,6 +27,46 @@ class CSRElements:
             pass
         raise AttributeError("No such element " + attr)
 
+class CSRRegisters(CSRElements):
+    """CSRRegister elements, built on first access from an index of name: (addr, length, mode).
+
+    Startup cost no longer grows with the number of registers; `d` (and `__dict__`, for scripts
+    iterating over it) builds all of them, in CSR map order.
+    """
+    __slots__ = ("_index", "_build")
+
+    def __init__(self, index, build):
+        self._index = index
+        self._build = build
+
+    def __getattribute__(self, attr):
+        if attr == "__dict__":
+            return object.__getattribute__(self, "d")
+        return object.__getattribute__(self, attr)
+
+    @property
+    def d(self):
+        registers = object.__getattribute__(self, "__dict__")
+        if len(registers) != len(self._index):
+            d = {name: registers.get(name) or self._build(name, *entry)
+                for name, entry in self._index.items()}
+            registers.clear()
+            registers.update(d)
+        return registers
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        try:
+            entry = self._index[attr]
+        except KeyError:
+            raise AttributeError("No such element " + attr)
+        register = object.__getattribute__(self, "__dict__")[attr] = self._build(attr, *entry)
+        return register
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(self._index)
+
 class CSRRegister:
     def __init__(self, readfn, writefn, name, addr, length, data_width, mode):
         self.readfn     = readfn
@@ -34,10 +77,15 @@ class CSRRegister:
         self.data_width = data_width
         self.mode       = mode
 
-    def read(self):
+    def check_readable(self):
         if self.mode not in ["rw", "ro"]:
             raise KeyError(self.name + "register not readable")
-        datas = self.readfn(self.addr, length=self.length)
+
+    def check_writable(self):
+        if self.mode not in ["rw", "wo"]:
+            raise KeyError(self.name + "register not writable")
+
+    def decode(self, datas):
         if isinstance(datas, int):
             return datas
         else:
@@ -47,13 +95,19 @@ class CSRRegister:
                 data |= datas[i]
             return data
 
-    def write(self, value):
-        if self.mode not in ["rw", "wo"]:
-            raise KeyError(self.name + "register not writable")
+    def encode(self, value):
         datas = []
         for i in range(self.length):
             datas.append((value >> ((self.length-1-i)*self.data_width)) & (2**self.data_width-1))
-        self.writefn(self.addr, datas)
+        return datas
+
+    def read(self):
+        self.check_readable()
+        return self.decode(self.readfn(self.addr, length=self.length))
+
+    def write(self, value):
+        self.check_writable()
+        self.writefn(self.addr, self.encode(value))
 
 class CSRMemoryRegion:
     def __init__(self, base, size, type):
@@ -61,12 +115,142 @@ class CSRMemoryRegion:
         self.size = size
         self.type = type
 
+# CSR Batch ----------------------------------------------------------------------------------------
+
+class CSRFuture:
+    """Result of a batched read, available once the batch has been flushed."""
+    def __init__(self, length=None, decode=None):
+        self.length  = length
+        self.decode  = decode
+        self._done   = False
+        self._result = None
+
+    def set_result(self, datas):
+        if self.decode is not None:
+            datas = self.decode(datas)
+        elif self.length is None:
+            datas = datas[0]
+        self._result = datas
+        self._done   = True
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        if not self._done:
+            raise RuntimeError("Batch not flushed yet.")
+        return self._result
+
+class CSRBatch:
+    """Batch of CSR/memory accesses.
+
+    Reads and writes are collected and executed in order on flush (at the end of the `with` block)
+    with as few round trips as the backend allows. Reads return a `CSRFuture`; results are also
+    available in the `results` dict (keyed by register name or address unless `key` is given).
+    """
+    def __init__(self, comm):
+        self.comm    = comm
+        self.ops     = []
+        self.results = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.flush()
+
+    def read(self, target, length=None, key=None):
+        if isinstance(target, CSRRegister):
+            target.check_readable()
+            future = CSRFuture(target.length, target.decode)
+            key    = target.name if key is None else key
+            target = target.addr
+            length = future.length
+        else:
+            future = CSRFuture(length)
+            key    = target if key is None else key
+        self.ops.append(("read", target, 1 if length is None else length, future, key))
+        return future
+
+    def write(self, target, value):
+        if isinstance(target, CSRRegister):
+            target.check_writable()
+            datas  = target.encode(value)
+            target = target.addr
+        else:
+            datas = value if isinstance(value, list) else [value]
+        self.ops.append(("write", target, datas))
+
+    def flush(self):
+        ops, self.ops = self.ops, []
+        if ops:
+            self.comm.batch_execute(ops)
+        for op in ops:
+            if op[0] == "read":
+                self.results[op[4]] = op[3].result()
+        return self.results
+
+def batch_read_groups(ops):
+    """Split batch operations in (write, reads) groups: writes are barriers for the reads after them."""
+    groups = []
+    reads  = []
+    for op in ops:
+        if op[0] == "write":
+            if reads:
+                groups.append(("reads", reads))
+                reads = []
+            groups.append(("write", op))
+        else:
+            reads.append(op)
+    if reads:
+        groups.append(("reads", reads))
+    return groups
+
+# CSR Map ------------------------------------------------------------------------------------------
+
+class CSRMap:
+    """Pre-indexed CSR map (csr.csv items grouped by type and parsed once)."""
+    def __init__(self, items):
+        self.items     = items
+        self.bases     = {}
+        self.registers = {}
+        self.constants = {}
+        self.memories  = {}
+        for group, name, value, arg0, arg1 in items:
+            if group == "csr_base":
+                self.bases[name] = int(value.replace("0x", ""), 16)
+            elif group == "csr_register":
+                self.registers[name] = (int(value.replace("0x", ""), 16), int(arg0), arg1)
+            elif group == "constant":
+                try:
+                    self.constants[name] = int(value)
+                except ValueError:
+                    self.constants[name] = value
+            elif group == "memory_region":
+                self.memories[name] = (int(value, 16), int(arg0), arg1)
+
+_csr_map_cache = {}
+
+def load_csr_map(csr_csv):
+    """Return the CSRMap of csr_csv, cached (per process) until the file's mtime/size change."""
+    path = os.path.abspath(csr_csv)
+    st   = os.stat(path)
+    key  = (st.st_mtime_ns, st.st_size)
+    cached = _csr_map_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    csr_map = CSRMap(CSRBuilder.get_csr_items(path))
+    _csr_map_cache[path] = (key, csr_map)
+    return csr_map
+
 # CSR Builder --------------------------------------------------------------------------------------
 
 class CSRBuilder:
     def __init__(self, comm, csr_csv, csr_data_width=None, csr_bus_address_width=None):
         if csr_csv is not None:
-            self.items     = self.get_csr_items(csr_csv)
+            self.csr_map   = load_csr_map(csr_csv)
+            self.items     = self.csr_map.items
             self.constants = self.build_constants()
 
             # Load csr_data_width from the constants, otherwise it must be provided
@@ -95,44 +279,47 @@ class CSRBuilder:
             self.regs  = self.build_registers(comm.read, comm.write)
             self.mems  = self.build_memories()
 
+    def batch(self):
+        """Return a CSRBatch collecting accesses done on flush/at the end of a `with` block."""
+        return CSRBatch(self)
+
+    def batch_execute(self, ops, max_length=255, bursts=("incr",)):
+        # Generic execution: contiguous reads between writes are merged in bursts.
+        for kind, group in batch_read_groups(ops):
+            if kind == "write":
+                self.write(group[1], group[2])
+                continue
+            addrs = [op[1] + 4*i for op in group for i in range(op[2])]
+            datas = []
+            for addr, length, burst in read_merger(addrs, max_length=max_length, bursts=bursts):
+                datas.extend(self.read(addr, length, burst))
+            offset = 0
+            for op in group:
+                op[3].set_result(datas[offset:offset + op[2]])
+                offset += op[2]
+
     @staticmethod
     def get_csr_items(csr_csv):
         with open(csr_csv, encoding="utf-8") as f:
             return list(csv.reader(filter(lambda row: row[0] != "#", f)))
 
+    def get_csr_map(self):
+        csr_map = getattr(self, "csr_map", None)
+        if csr_map is None or csr_map.items is not self.items:
+            csr_map = self.csr_map = CSRMap(self.items)
+        return csr_map
+
     def build_bases(self):
-        d = {}
-        for item in self.items:
-            group, name, addr, dummy0, dummy1 = item
-            if group == "csr_base":
-                d[name] = int(addr.replace("0x", ""), 16)
-        return CSRElements(d)
+        return CSRElements(dict(self.get_csr_map().bases))
 
     def build_registers(self, readfn, writefn):
-        d = {}
-        for item in self.items:
-            group, name, addr, length, mode = item
-            if group == "csr_register":
-                addr = int(addr.replace("0x", ""), 16)
-                length = int(length)
-                d[name] = CSRRegister(readfn, writefn, name, addr, length, self.csr_data_width, mode)
-        return CSRElements(d)
+        data_width = self.csr_data_width
+        def build(name, addr, length, mode):
+            return CSRRegister(readfn, writefn, name, addr, length, data_width, mode)
+        return CSRRegisters(self.get_csr_map().registers, build)
 
     def build_constants(self):
-        d = {}
-        for item in self.items:
-            group, name, value, dummy0, dummy1 = item
-            if group == "constant":
-                try:
-                    d[name] = int(value)
-                except ValueError:
-                    d[name] = value
-        return CSRElements(d)
+        return CSRElements(dict(self.get_csr_map().constants))
 
     def build_memories(self):
-        d = {}
-        for item in self.items:
-            group, name, base, size, type = item
-            if group == "memory_region":
-                d[name] = CSRMemoryRegion(int(base, 16), int(size), type)
-        return CSRElements(d)
+        return CSRElements({name: CSRMemoryRegion(*region) for name, region in self.get_csr_map().memories.items()})
@@ -7,6 +7,8 @@
 
 import math
 import struct
+import functools
+from collections import namedtuple
 
 from litex.soc.interconnect.packet import HeaderField, Header
 
@@ -62,6 +64,22 @@ unpack_uint32_from = struct.Struct('>I').unpack
 pack_to_uint64 = struct.Struct('>Q').pack
 unpack_uint64_from = struct.Struct('>Q').unpack
 
+def _addr_format(addr_size):
+    return "I" if addr_size == 4 else "Q"
+
+@functools.lru_cache(maxsize=None)
+def _writes_struct(addr_size, count):
+    # Base address followed by count 32-bit datas.
+    return struct.Struct(">{}{}I".format(_addr_format(addr_size), count))
+
+@functools.lru_cache(maxsize=None)
+def _reads_struct(addr_size, count):
+    # Base return address followed by count addresses.
+    return struct.Struct(">{}{}".format(count + 1, _addr_format(addr_size)))
+
+_packet_header_struct = struct.Struct(">HBB4x")
+_record_header_struct = struct.Struct(">BBBB")
+
 # Packet -------------------------------------------------------------------------------------------
 
 class Packet(list):
@@ -117,31 +135,17 @@ class EtherboneWrites(Packet):
     def encode(self):
         if self.encoded:
             raise ValueError
-        ba = bytearray()
-        if self.addr_size == 4:
-            ba += pack_to_uint32(self.base_addr)
-        else:
-            ba += pack_to_uint64(self.base_addr)
-        for write in self.writes:
-            ba += pack_to_uint32(write.data)
-        self.bytes   = ba
+        datas = [write.data for write in self.writes]
+        self.bytes   = bytearray(_writes_struct(self.addr_size, len(datas)).pack(self.base_addr, *datas))
         self.encoded = True
 
     def decode(self):
         if not self.encoded:
             raise ValueError
-        ba = self.bytes
-        if self.addr_size == 4:
-            self.base_addr = unpack_uint32_from(ba[:self.addr_size])[0]
-        else:
-            self.base_addr = unpack_uint64_from(ba[:self.addr_size])[0]
-        writes = []
-        offset = self.addr_size
-        length = len(ba)
-        while length > offset:
-            writes.append(EtherboneWrite(unpack_uint32_from(ba[offset:offset+4])[0]))
-            offset += 4
-        self.writes  = writes
+        ba    = self.bytes
+        count = (len(ba) - self.addr_size)//4
+        self.base_addr, *datas = _writes_struct(self.addr_size, count).unpack_from(ba)
+        self.writes  = [EtherboneWrite(data) for data in datas]
         self.encoded = False
 
     def __repr__(self):
@@ -181,39 +185,17 @@ class EtherboneReads(Packet):
     def encode(self):
         if self.encoded:
             raise ValueError
-        ba = bytearray()
-        if (self.addr_size == 4):
-            ba += pack_to_uint32(self.base_ret_addr)
-        else:
-            ba += pack_to_uint64(self.base_ret_addr)
-        for read in self.reads:
-            if self.addr_size == 4:
-                ba += pack_to_uint32(read.addr)
-            else:
-                ba += pack_to_uint64(read.addr)
-        self.bytes   = ba
+        addrs = [read.addr for read in self.reads]
+        self.bytes   = bytearray(_reads_struct(self.addr_size, len(addrs)).pack(self.base_ret_addr, *addrs))
         self.encoded = True
 
     def decode(self):
         if not self.encoded:
             raise ValueError
-        ba = self.bytes
-        if self.addr_size == 4:
-            base_ret_addr = unpack_uint32_from(ba[:self.addr_size])[0]
-        else:
-            base_ret_addr = unpack_uint64_from(ba[:self.addr_size])[0]
-        self.base_ret_addr = base_ret_addr
-        reads  = []
-        offset = self.addr_size
-        length = len(ba)
-        while length > offset:
-            v = ba[offset:offset+self.addr_size]
-            if self.addr_size == 4:
-                reads.append(EtherboneRead(unpack_uint32_from(v)[0]))
-            else:
-                reads.append(EtherboneRead(unpack_uint64_from(v)[0]))
-            offset += self.addr_size
-        self.reads   = reads
+        ba    = self.bytes
+        count = len(ba)//self.addr_size - 1
+        self.base_ret_addr, *addrs = _reads_struct(self.addr_size, count).unpack_from(ba)
+        self.reads   = [EtherboneRead(addr) for addr in addrs]
         self.encoded = False
 
     def __repr__(self):
@@ -400,6 +382,57 @@ class EtherbonePacket(Packet):
                 r += record.__repr__(i)
         return r
 
+# Etherbone Fast Encoder/Decoder ------------------------------------------------------------------
+
+# Decoded record: flags byte (bca/rca/rff/cyc/wca/wff), byte_enable, writes base_addr/datas and reads
+# base_ret_addr/addrs (datas/addrs are tuples, empty when no writes/reads).
+EtherboneRecordData = namedtuple("EtherboneRecordData",
+    ["flags", "byte_enable", "base_addr", "datas", "base_ret_addr", "addrs"])
+
+def encode_etherbone_record(addr_size, base_addr=0, datas=(), base_ret_addr=0, addrs=(), byte_enable=0xf, flags=0):
+    """Encode a record to bytes with precompiled structs (one pack per writes/reads section)."""
+    if len(datas) > 255 or len(addrs) > 255:
+        raise ValueError("Burst size exceeds maximum of 255 allowed by Etherbone.")
+    ba = _record_header_struct.pack(flags, byte_enable, len(datas), len(addrs))
+    if datas:
+        ba += _writes_struct(addr_size, len(datas)).pack(base_addr, *datas)
+    if addrs:
+        ba += _reads_struct(addr_size, len(addrs)).pack(base_ret_addr, *addrs)
+    return ba
+
+def encode_etherbone_packet(addr_width, records, pf=0, pr=0, nr=0):
+    """Encode a packet from records already encoded with encode_etherbone_record."""
+    header = _packet_header_struct.pack(etherbone_magic,
+        (etherbone_version << 4) | (nr << 2) | (pr << 1) | pf,
+        ((addr_width//8) << 4) | 4)
+    return header + b"".join(records)
+
+def decode_etherbone_records(buf, addr_size=None, offset=0):
+    """Decode the records of a packet (bytes/bytearray/memoryview) to EtherboneRecordData tuples.
+
+    Datas/addrs are unpacked directly from the buffer in one call per section. addr_size defaults
+    to the one of the packet header.
+    """
+    if addr_size is None:
+        addr_size = buf[offset + 3] >> 4
+    offset += etherbone_packet_header_length
+    records = []
+    while len(buf) > offset:
+        flags, byte_enable, wcount, rcount = _record_header_struct.unpack_from(buf, offset)
+        offset += etherbone_record_header_length
+        base_addr, datas = 0, ()
+        if wcount:
+            values = _writes_struct(addr_size, wcount).unpack_from(buf, offset)
+            base_addr, datas = values[0], values[1:]
+            offset += 4*wcount + addr_size
+        base_ret_addr, addrs = 0, ()
+        if rcount:
+            values = _reads_struct(addr_size, rcount).unpack_from(buf, offset)
+            base_ret_addr, addrs = values[0], values[1:]
+            offset += (rcount + 1)*addr_size
+        records.append(EtherboneRecordData(flags, byte_enable, base_addr, datas, base_ret_addr, addrs))
+    return records
+
 # Etherbone IPC ------------------------------------------------------------------------------------
 
 class EtherboneIPC:
@@ -0,0 +1,65 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2015-2021 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Read Merger --------------------------------------------------------------------------------------
+
+def read_merger(addrs, max_length=255, bursts=None):
+    """Sequential reads merger
+
+    Take a list of read addresses as input and merge the sequential/fixed reads in (base, length, burst) tuples:
+    Example: [0x0, 0x4, 0x10, 0x14, 0x20, 0x20] input  will return [(0x0,2, "incr"), (0x10,2, "incr"), (0x20,2, "fixed")].
+
+    This is useful for UARTBone/Etherbone where command/response roundtrip delay is responsible for
+    most of the access delay and allows minimizing number of commands by grouping them in UARTBone
+    packets.
+    """
+    bursts = ["incr", "fixed"] if bursts is None else bursts
+
+    if max_length <= 0:
+        raise ValueError("max_length must be greater than 0.")
+    if "incr" not in bursts:
+        raise ValueError("Read merger requires incr burst support.")
+    for burst in bursts:
+        if burst not in ["incr", "fixed"]:
+            raise ValueError("Unsupported burst mode: {}".format(burst))
+
+    if not addrs:
+        return
+
+    burst_base   = addrs[0]
+    burst_length = 1
+    burst_type   = "incr"
+    for addr in addrs[1:]:
+        merged = False
+        # Try to merge to a "fixed" burst if supported
+        if ("fixed" in bursts):
+            # If current burst matches
+            if (burst_type == "fixed") or (burst_length == 1):
+                # If addr matches
+                if (addr == burst_base):
+                    if (burst_length != max_length):
+                        burst_type   = "fixed"
+                        burst_length += 1
+                        merged       = True
+
+        # Try to merge to an "incr" burst if supported
+        if ("incr" in bursts):
+            # If current burst matches
+            if (burst_type == "incr") or (burst_length == 1):
+                # If addr matches
+                if (addr == burst_base + (4 * burst_length)):
+                    if (burst_length != max_length):
+                        burst_type   = "incr"
+                        burst_length += 1
+                        merged       = True
+
+        # Generate current burst if addr has not able to merge
+        if not merged:
+            yield (burst_base, burst_length, burst_type)
+            burst_base   = addr
+            burst_length = 1
+            burst_type   = "incr"
+    yield (burst_base, burst_length, burst_type)
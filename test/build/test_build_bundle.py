@@ -7,12 +7,14 @@
 import os
 import sys
 import json
+import shutil
 import tarfile
 import tempfile
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from litex.build import bundle as bundle_module
 from litex.build.bundle import BuildBundle, remap_path
 from litex.build.generic_platform import GenericPlatform
 from litex.tools.litex_build_bundle import create_bundle, run_local
@@ -106,6 +108,85 @@ class TestBuildBundle(unittest.TestCase):
             with self.assertRaisesRegex(OSError, "Missing build bundle input"):
                 bundle.create()
 
+    def _project(self, tmp_dir):
+        root = os.path.join(tmp_dir, "project")
+        os.makedirs(root)
+        for name in ["top.v", "cpu.v"]:
+            with open(os.path.join(root, name), "w", encoding="utf-8") as f:
+                f.write(f"// {name}\n")
+        return root
+
+    def _create(self, tmp_dir, root, **kwargs):
+        bundle = BuildBundle(output_dir=os.path.join(tmp_dir, "build"), command=["target.py"], **kwargs)
+        bundle.add_root(root, role="project")
+        with patch.object(bundle_module, "_file_digest", wraps=bundle_module._file_digest) as file_digest:
+            result = bundle.create()
+        return result, file_digest.call_count
+
+    def test_bundle_reuses_archive_and_digest_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = self._project(tmp_dir)
+            first, hashed = self._create(tmp_dir, root)
+            self.assertFalse(first["reused"])
+            self.assertEqual(hashed, 2)
+            archive_mtime = os.stat(first["archive"]).st_mtime_ns
+
+            # Same inputs: nothing re-hashed, archive not re-created.
+            second, hashed = self._create(tmp_dir, root)
+            self.assertTrue(second["reused"])
+            self.assertEqual(hashed, 0)
+            self.assertEqual(second["archive"], first["archive"])
+            self.assertEqual(os.stat(second["archive"]).st_mtime_ns, archive_mtime)
+
+            # Touched but identical file: re-hashed only, same archive.
+            top = os.path.join(root, "top.v")
+            os.utime(top, ns=(archive_mtime + 10**9, archive_mtime + 10**9))
+            third, hashed = self._create(tmp_dir, root)
+            self.assertTrue(third["reused"])
+            self.assertEqual(hashed, 1)
+
+            # Modified file: new digest/archive.
+            with open(top, "a", encoding="utf-8") as f:
+                f.write("module top(); endmodule\n")
+            fourth, hashed = self._create(tmp_dir, root)
+            self.assertFalse(fourth["reused"])
+            self.assertEqual(hashed, 1)
+            self.assertNotEqual(fourth["digest"], first["digest"])
+
+    def test_bundle_pigz_compression_is_gzip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result, _ = self._create(tmp_dir, self._project(tmp_dir), compression="pigz")
+            self.assertTrue(result["archive"].endswith(".tar.gz"))
+            with tarfile.open(result["archive"], "r:gz") as archive:
+                self.assertIn("manifest.json", archive.getnames())
+
+    def test_bundle_rejects_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            BuildBundle(output_dir="build", compression="lzma")
+
+    @unittest.skipIf(shutil.which("zstd") is None, "zstd not available")
+    def test_bundle_utility_replays_zstd_archive(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self._project(tmp_dir)
+            script  = os.path.join(project, "target.py")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("open('ran.txt', 'w').write('ok')\n")
+            args = SimpleNamespace(
+                output             = None,
+                output_dir         = os.path.join(tmp_dir, "build"),
+                root               = [project],
+                include            = [],
+                pythonpath_root    = [],
+                no_auto_pythonpath = True,
+                env                = [],
+                strict             = "warn",
+                compression        = "zstd",
+                command            = [sys.executable, script],
+            )
+            result = create_bundle(args)
+            self.assertTrue(result["archive"].endswith(".tar.zst"))
+            self.assertEqual(run_local(result["archive"], work_dir=os.path.join(tmp_dir, "replay")), 0)
+
     def test_bundle_utility_replays_command_from_archive(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             project = os.path.join(tmp_dir, "project")
@@ -0,0 +1,153 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import re
+import time
+import tempfile
+import subprocess
+import unittest
+from unittest import mock
+
+from migen import ClockDomain, Module, Signal
+
+from litex.build.generic_platform import GenericPlatform, Pins
+from litex.build.generic_toolchain import GenericToolchain
+from litex.build.matrix import BuildMatrix, BuildTarget, format_build_matrix_summary
+
+# Stand-in toolchain: runs a shell script given by the test.
+class _ScriptToolchain(GenericToolchain):
+    def __init__(self, script):
+        GenericToolchain.__init__(self)
+        self.script = script
+
+    def build_io_constraints(self):
+        return ("", "")
+
+    def build_script(self):
+        script_file = "build_" + self._build_name + ".sh"
+        with open(script_file, "w") as f:
+            f.write(self.script)
+        return script_file
+
+    def run_script(self, script):
+        print("running " + script)
+        if subprocess.call(["bash", script]) != 0:
+            raise OSError("Error occured during script execution.")
+
+
+class _Platform(GenericPlatform):
+    def __init__(self, script):
+        GenericPlatform.__init__(self, "matrix-device", [("clk", 0, Pins("A1")), ("led", 0, Pins("A2"))])
+        self.toolchain = _ScriptToolchain(script)
+
+    def build(self, *args, **kwargs):
+        return self.toolchain.build(self, *args, **kwargs)
+
+
+class _Design(Module):
+    def __init__(self, platform):
+        self.clock_domains.cd_sys = ClockDomain("sys")
+        counter = Signal(8, name="counter")
+        self.comb += self.cd_sys.clk.eq(platform.request("clk"))
+        self.sync += counter.eq(counter + 1)
+        self.comb += platform.request("led").eq(counter[7])
+
+
+def _target(tmp_dir, name, script):
+    platform = _Platform(script)
+    return BuildTarget(name, platform, lambda: _Design(platform), build_dir=os.path.join(tmp_dir, name))
+
+
+class TestBuildMatrix(unittest.TestCase):
+    def run_matrix(self, targets, **kwargs):
+        logs    = []
+        results = BuildMatrix(targets, **kwargs).run(log=logs.append)
+        return results, logs
+
+    def test_targets_run_concurrently_with_logs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # a only passes when b runs at the same time; c waits for a free job.
+            wait_b = ("for i in $(seq 100); do [ -f ../b/started ] && break; sleep 0.05; done;"
+                " [ -f ../b/started ] && sleep 0.3\n")
+            targets = [
+                _target(tmp_dir, "a", wait_b),
+                _target(tmp_dir, "b", "touch started; sleep 0.3; echo bitstream > top.bit\n"),
+                _target(tmp_dir, "c", "sleep 0.3\n"),
+            ]
+            start = time.monotonic()
+            results, logs = self.run_matrix(targets, jobs=2)
+            wall  = time.monotonic() - start
+            self.assertEqual([r["status"] for r in results], ["pass", "pass", "pass"])
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "b", "top.bit")))
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "b", "top.v")))
+            with open(results[1]["log"]) as f:
+                self.assertIn("running build_top.sh", f.read())
+
+            # Summary total covers the whole matrix (c only started once a or b was done).
+            self.assertIn("3/3 target(s) passed", logs[-1])
+            elapsed = float(re.search(r"passed in ([\d.]+)s", logs[-1]).group(1))
+            first   = min(results[0]["run_time"], results[1]["run_time"])
+            self.assertGreaterEqual(elapsed + 0.01, first + results[2]["run_time"])
+            self.assertLessEqual(elapsed, wall + 0.01)
+
+    def test_identical_fragments_share_verilog_conversion(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            targets = [_target(tmp_dir, name, "true\n") for name in ["a", "b"]]
+            matrix  = BuildMatrix(targets, jobs=1)
+            results = matrix.run(log=lambda s: None)
+            self.assertEqual([r["status"] for r in results], ["pass", "pass"])
+            self.assertEqual(matrix.verilog_cache.hits, 1)
+            with open(os.path.join(tmp_dir, "a", "top.v")) as a, open(os.path.join(tmp_dir, "b", "top.v")) as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_failures_are_reported_per_target(self):
+        def broken_design():
+            raise ValueError("Broken design.")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            targets = [
+                _target(tmp_dir, "ok",     "true\n"),
+                _target(tmp_dir, "script", "echo timing failed; exit 1\n"),
+                BuildTarget("design", _Platform("true\n"), broken_design, build_dir=os.path.join(tmp_dir, "design")),
+            ]
+            results, logs = self.run_matrix(targets, jobs=2)
+            self.assertEqual([r["status"] for r in results], ["pass", "fail", "fail"])
+            self.assertIn("see", results[1]["error"])
+            with open(results[1]["log"]) as f:
+                self.assertIn("timing failed", f.read())
+            self.assertIn("Broken design.", results[2]["error"])
+            self.assertIsNone(results[2]["log"])
+            summary = format_build_matrix_summary(results)
+            self.assertIn("1/3 target(s) passed.", summary)
+            self.assertIn("Broken design.", summary)
+
+    def test_toolchains_run_sequentially_without_fork(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            targets = [
+                _target(tmp_dir, "a", "sleep 0.2; touch done\n"),
+                _target(tmp_dir, "b", "[ -f ../a/done ] && echo after a\n"),
+                _target(tmp_dir, "c", "echo timing failed; exit 1\n"),
+            ]
+            cwd = os.getcwd()
+            with mock.patch("litex.build.matrix.multiprocessing.get_all_start_methods", return_value=["spawn"]):
+                results, logs = self.run_matrix(targets, jobs=3)
+            self.assertEqual(os.getcwd(), cwd)
+            self.assertIn("fork not supported", "\n".join(logs))
+            self.assertEqual([r["status"] for r in results], ["pass", "pass", "fail"])
+            with open(results[1]["log"]) as f:
+                self.assertIn("after a", f.read())
+            with open(results[2]["log"]) as f:
+                log = f.read()
+            self.assertIn("timing failed", log)
+            self.assertIn("OSError", log)
+
+    def test_target_names_must_be_unique(self):
+        with self.assertRaises(ValueError):
+            BuildMatrix([_target("build", "a", ""), _target("build", "a", "")])
+
+
+if __name__ == "__main__":
+    unittest.main()
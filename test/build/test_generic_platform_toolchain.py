@@ -6,12 +6,13 @@
 
 import os
 import sys
+import json
 import tempfile
 import types
 import unittest
 from unittest import mock
 
-from migen import ClockDomain, Module, Signal
+from migen import ClockDomain, Memory, Module, Signal
 
 from litex.build.generic_platform import (
     ConstraintError,
@@ -25,6 +26,7 @@ from litex.build.generic_platform import (
 )
 from litex.build.gowin.gowin import _build_cst
 from litex.build.generic_toolchain import GenericToolchain
+from litex.build.profile import build_profile_context
 
 
 _IO = [
@@ -755,5 +757,93 @@ class TestGowinCST(unittest.TestCase):
         self.assertNotIn('IO_LOC "rx_n"', cst)
 
 
+def _build_design(build_dir, value=42, **kwargs):
+    platform  = _make_platform()
+    toolchain = _DummyToolchain()
+    platform.toolchain = toolchain
+    dut    = Module()
+    dut.clock_domains.cd_sys = ClockDomain("sys")
+    serial = platform.request("serial")
+    count  = Signal(8)
+    mem    = Memory(8, 16, init=list(range(16)))
+    port   = mem.get_port()
+    dut.specials += mem, port
+    dut.sync += count.eq(count + value)
+    dut.comb += [port.adr.eq(count), serial.tx.eq(port.dat_r[0] ^ serial.rx)]
+    toolchain.build(platform, dut, build_dir=build_dir, **kwargs)
+    return toolchain, (count, serial.tx)
+
+
+class TestVerilogCache(unittest.TestCase):
+    def _build(self, build_dir, value=42, **kwargs):
+        return _build_design(build_dir, value=value, run=False, **kwargs)
+
+    def _read(self, build_dir):
+        with open(os.path.join(build_dir, "top.v")) as f:
+            return f.read(), os.stat(os.path.join(build_dir, "top.v")).st_mtime_ns
+
+    def test_unchanged_design_reuses_verilog(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            toolchain0, signals0 = self._build(build_dir)
+            verilog0, mtime0 = self._read(build_dir)
+            os.utime(os.path.join(build_dir, "top.v"), ns=(mtime0 - 10**9, mtime0 - 10**9))
+            mtime0 -= 10**9
+
+            # Same design/options (new objects): file untouched, namespace restored.
+            toolchain1, signals1 = self._build(build_dir)
+            verilog1, mtime1 = self._read(build_dir)
+            self.assertEqual((verilog1, mtime1), (verilog0, mtime0))
+            for s0, s1 in zip(signals0, signals1):
+                self.assertEqual(toolchain0._vns.get_name(s0), toolchain1._vns.get_name(s1))
+            self.assertIn(toolchain1._vns.get_name(signals1[0]), verilog1)
+
+            # Modified design: regenerated.
+            self._build(build_dir, value=3)
+            verilog2, mtime2 = self._read(build_dir)
+            self.assertNotEqual(verilog2, verilog0)
+            self.assertIn("+ 2'd3", verilog2)
+
+    def test_modified_verilog_is_regenerated(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            self._build(build_dir)
+            verilog0, _ = self._read(build_dir)
+            with open(os.path.join(build_dir, "top.v"), "a") as f:
+                f.write("// edit\n")
+            self._build(build_dir)
+            self.assertEqual(self._read(build_dir)[0].split("Date")[0], verilog0.split("Date")[0])
+
+    def test_cache_can_be_disabled(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            self._build(build_dir, verilog_cache=False)
+            self.assertFalse(os.path.exists(os.path.join(build_dir, "top.v.cache.json")))
+            _, mtime0 = self._read(build_dir)
+            os.utime(os.path.join(build_dir, "top.v"), ns=(mtime0 - 10**9, mtime0 - 10**9))
+            self._build(build_dir, verilog_cache=False)
+            self.assertNotEqual(self._read(build_dir)[1], mtime0 - 10**9)
+
+
+class TestBuildProfile(unittest.TestCase):
+    def test_profile_records_toolchain_and_convert_phases(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profile_file = os.path.join(tmp_dir, "litex_profile.json")
+            with build_profile_context(True, profile_file):
+                _build_design(os.path.join(tmp_dir, "build"), run=True, verilog_cache=False)
+            with open(profile_file) as f:
+                phases = [p["phase"] for p in json.load(f)["phases"]]
+            for phase in ["finalize", "verilog", "constraints", "project", "run"]:
+                self.assertIn("build/" + phase, phases)
+            for phase in ["lower", "namespace", "comb", "sync", "specials"]:
+                self.assertIn("build/verilog/" + phase, phases)
+
+    def test_profile_is_inactive_outside_build(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with build_profile_context(False, os.path.join(tmp_dir, "litex_profile.json")) as profiler:
+                _build_design(os.path.join(tmp_dir, "build"), run=False)
+            self.assertIsNone(profiler)
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, "litex_profile.json")))
+
 if __name__ == "__main__":
     unittest.main()
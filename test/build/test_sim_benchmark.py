@@ -0,0 +1,92 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import json
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from litex.build.sim import verilator
+from litex.build.sim.benchmark import SimBenchmark, parse_sim_summary, get_benchmark_variants
+from litex.build.sim.benchmark import format_benchmark_results, write_benchmark_results
+
+# Fake Vsim: simulates LITEX_SIM_MAX_TIME_PS at a speed depending on its THREADS build argument,
+# loading the ROM contents like $readmemh (relative to the simulation directory).
+FAKE_VSIM = """\
+#!{python}
+import os
+print("rom: " + open("sim_rom.init").read().strip())
+max_time_ps = int(os.environ["LITEX_SIM_MAX_TIME_PS"])
+elapsed_ms  = 400 / {threads}
+print("[sim] sys_clk=1.000MHz, simulated=%.3fms, elapsed=%.3fms, performance=0.1x realtime" % (
+    max_time_ps/1e9, elapsed_ms))
+"""
+
+
+class TestSimBenchmark(unittest.TestCase):
+    def test_parse_sim_summary(self):
+        output = "boot\n[sim] sys_clk=1.000MHz, simulated=2.000ms, elapsed=1.500s, performance=0.001x realtime\n"
+        self.assertEqual(parse_sim_summary(output), (2e-3, 1.5))
+        self.assertIsNone(parse_sim_summary("no summary"))
+
+    def test_variants(self):
+        variants = get_benchmark_variants(threads=[1, 2], opt_levels=["O2", "O3"])
+        self.assertEqual([v["name"] for v in variants],
+            ["threads1_O2", "threads1_O3", "threads2_O2", "threads2_O3"])
+
+    def test_benchmark_runs_each_variant_for_cycle_budget(self):
+        def compile_sim(build_name, verbose):
+            # Emulate the build script: fake Vsim whose speed scales with the threads.
+            with open("build_{}.sh".format(build_name)) as f:
+                threads = 4 if "THREADS=4" in f.read() else 1
+            os.makedirs("obj_dir", exist_ok=True)
+            with open("obj_dir/Vsim", "w") as f:
+                f.write(FAKE_VSIM.format(python=sys.executable, threads=threads))
+            os.chmod("obj_dir/Vsim", os.stat("obj_dir/Vsim").st_mode | stat.S_IEXEC)
+
+        with tempfile.TemporaryDirectory() as build_dir:
+            for f in ["sim.v", "sim_init.cpp", "sim_config.js"]:
+                with open(os.path.join(build_dir, f), "w") as fd:
+                    fd.write("\n")
+            with open(os.path.join(build_dir, "sim_rom.init"), "w") as fd:
+                fd.write("deadbeef\n")
+            benchmark = SimBenchmark(build_dir,
+                sources      = [(os.path.join(build_dir, "sim.v"), "verilog", "work")],
+                sys_clk_freq = int(1e6),
+                cycles       = 2000,
+            )
+            with mock.patch.object(verilator, "_compile_sim", side_effect=compile_sim):
+                with mock.patch("builtins.print"):
+                    results = benchmark.run(get_benchmark_variants(threads=[1, 4]), log=lambda s: None)
+            self.assertTrue(os.path.exists(os.path.join(build_dir, "benchmark", "threads4_O3", "sim_config.js")))
+            # Each variant runs with the memory init files of the build.
+            for variant in ["threads1_O3", "threads4_O3"]:
+                with open(os.path.join(build_dir, "benchmark", variant, "benchmark.log")) as f:
+                    self.assertIn("rom: deadbeef", f.read())
+
+            self.assertEqual([r["name"] for r in results], ["threads1_O3", "threads4_O3"])
+            self.assertEqual([r["cycles"] for r in results], [2000, 2000])
+            # 2000 cycles in 400ms (1 thread) / 100ms (4 threads).
+            self.assertEqual([r["sim_khz"] for r in results], [5.0, 20.0])
+            for r in results:
+                self.assertIn("build_time_s", r)
+                self.assertIn("cpu_percent", r)
+
+            table = format_benchmark_results(results)
+            self.assertIn("threads4_O3", table.splitlines()[2])
+            self.assertTrue(table.splitlines()[2].endswith(" *"))
+
+            json_file = os.path.join(build_dir, "benchmark.json")
+            write_benchmark_results(results, json_file)
+            with open(json_file) as f:
+                self.assertEqual(json.load(f), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import stat
+import tempfile
+import unittest
+
+from litex.build.sim.snapshot import SimSnapshots
+
+# Fake Vsim implementing the snapshot runtime interface of veril.cpp: the simulated time is the
+# only state, saved to/restored from the snapshot files.
+FAKE_VSIM = """\
+#!{python}
+import os, sys, time, select, signal
+
+env       = os.environ
+save_time = int(env.get("LITEX_SIM_SAVE_TIME", -1))
+save_file = env.get("LITEX_SIM_SAVE_FILE", "sim_default.vlt")
+save_exit = int(env.get("LITEX_SIM_SAVE_EXIT", "0"))
+requests  = []
+signal.signal(signal.SIGUSR1, lambda *args: requests.append(1))
+signal.signal(signal.SIGINT,  lambda *args: sys.exit(0))
+
+t = 0
+if "LITEX_SIM_LOAD_FILE" in env:
+    t = int(open(env["LITEX_SIM_LOAD_FILE"]).read())
+    print("MDEBUG: Restored state at time %d" % t, flush=True)
+else:
+    print("Booting...", flush=True)
+saved = False
+while t < 10**9:
+    if t == 50000 and "LITEX_SIM_LOAD_FILE" not in env:
+        print("litex> ", flush=True)
+    if (not saved and save_time >= 0 and t >= save_time) or requests:
+        requests.clear()
+        saved = True
+        print("MDEBUG: Saving state at time %d to %s" % (t, save_file), flush=True)
+        open(save_file, "w").write(str(t))
+        if save_exit:
+            sys.exit(0)
+    if select.select([sys.stdin], [], [], 0)[0]:
+        line = sys.stdin.readline().strip()
+        print("cmd %s at %d: %s" % (line, t, "PASS" if line != "fail" else "FAIL"), flush=True)
+    t += 1000
+    time.sleep(0.0005)
+"""
+
+
+class TestSimSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        build_dir = self.tmp.name
+        os.makedirs(os.path.join(build_dir, "obj_dir"))
+        os.makedirs(os.path.join(build_dir, "modules"))
+        vsim = os.path.join(build_dir, "obj_dir", "Vsim")
+        with open(vsim, "w") as f:
+            f.write(FAKE_VSIM.format(python=sys.executable))
+        os.chmod(vsim, os.stat(vsim).st_mode | stat.S_IEXEC)
+        with open(os.path.join(build_dir, "sim_config.js"), "w") as f:
+            f.write("[]")
+        self.set_digest("0123")
+        self.snapshots = SimSnapshots(build_dir)
+
+    def set_digest(self, digest):
+        with open(os.path.join(self.tmp.name, "obj_dir", "litex_sim.sha256"), "w") as f:
+            f.write(digest + "\n")
+
+    def test_save_at_time_and_list(self):
+        snapshot = self.snapshots.save("early", time_ps=20000, timeout=30)
+        self.assertEqual(snapshot["time_ps"], 20000)
+        self.assertEqual(snapshot["digest"], "0123")
+        self.snapshots.save("boot", until="litex> ", timeout=30)
+        self.assertEqual([s["name"] for s in self.snapshots.list()], ["early", "boot"])
+        self.assertGreaterEqual(self.snapshots.get("boot")["time_ps"], 50000)
+        self.snapshots.remove("early")
+        self.assertEqual([s["name"] for s in self.snapshots.list()], ["boot"])
+
+    def test_save_from_snapshot(self):
+        self.snapshots.save("boot", until="litex> ", timeout=30)
+        boot_time = self.snapshots.get("boot")["time_ps"]
+        snapshot  = self.snapshots.save("later", time_ps=boot_time + 10000, restore="boot", timeout=30)
+        self.assertEqual(snapshot["time_ps"], boot_time + 10000)
+        self.assertEqual(snapshot["parent"], "boot")
+
+    def test_fork_runs_stimuli_in_parallel_from_snapshot(self):
+        self.snapshots.save("boot", until="litex> ", timeout=30)
+        boot_time = self.snapshots.get("boot")["time_ps"]
+        stimuli = [
+            {"name": "test0", "stdin": "mem_test\n",  "until": "PASS", "timeout": 30},
+            {"name": "test1", "stdin": "fail\n",      "until": "PASS", "timeout": 2},
+        ]
+        results = self.snapshots.fork("boot", stimuli, jobs=2)
+        self.assertEqual([r["name"] for r in results], ["test0", "test1"])
+        self.assertEqual([r["matched"] for r in results], [True, False])
+        with open(results[0]["log"]) as f:
+            log = f.read()
+        # Simulation resumed from the snapshot, not from reset.
+        self.assertIn("Restored state at time {}".format(boot_time), log)
+        self.assertNotIn("Booting", log)
+        self.assertTrue(os.path.exists(os.path.join(results[1]["directory"], "sim_config.js")))
+
+    def test_snapshot_from_other_build_is_rejected(self):
+        self.snapshots.save("boot", time_ps=1000, timeout=30)
+        self.set_digest("4567")
+        with self.assertRaises(ValueError):
+            self.snapshots.fork("boot", [{}])
+
+    def test_invalid_requests(self):
+        with self.assertRaises(ValueError):
+            self.snapshots.save("boot")
+        with self.assertRaises(ValueError):
+            self.snapshots.get_filename("../boot")
+        with self.assertRaises(ValueError):
+            self.snapshots.get("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
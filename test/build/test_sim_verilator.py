@@ -8,6 +8,7 @@ import argparse
 import os
 import signal
 import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -119,6 +120,79 @@ class TestSimVerilatorUserHooks(unittest.TestCase):
         self.assertEqual(argdict["verilator_extra_sources"], ["force.cpp", "trace.cpp"])
 
 
+class TestSimVerilatorIncremental(unittest.TestCase):
+    def setUp(self):
+        cwd = os.getcwd()
+        self.build_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.build_dir.name)
+        self.addCleanup(self.build_dir.cleanup)
+        self.addCleanup(os.chdir, cwd)
+        for filename in ["sim.v", "sim_init.cpp", "sim_header.h", "variables.mak"]:
+            Path(filename).write_text(filename + "\n")
+
+    def build(self, **kwargs):
+        kwargs = {
+            "sources"     : [("sim.v", "verilog", "work"), ("mem.init", None, None)],
+            "jobs"        : None,
+            "threads"     : 1,
+            "coverage"    : False,
+            "modules"     : ["clocker", "serial2console"],
+            "incremental" : True,
+            **kwargs,
+        }
+        with mock.patch("builtins.print") as log:
+            verilator._build_sim("sim", **kwargs)
+        return Path("build_sim.sh").read_text(), log.call_args.args[0] if log.called else ""
+
+    def compile(self, script):
+        # Emulate a successful run of the build script.
+        digest = script.split("&& echo ")[1].split(" ")[0]
+        os.makedirs("obj_dir", exist_ok=True)
+        Path("obj_dir/Vsim").write_text("")
+        Path(verilator._sim_digest_file).write_text(digest + "\n")
+
+    def test_first_build_rebuilds_and_records_digest(self):
+        script, log = self.build()
+        self.assertIn("rm -rf obj_dir/", script)
+        self.assertIn("> obj_dir/litex_sim.sha256", script)
+        self.assertIn("not built yet", log)
+
+    def test_unchanged_inputs_reuse_obj_dir(self):
+        self.compile(self.build()[0])
+        script, log = self.build()
+        self.assertNotIn("make", script)
+        self.assertIn("reusing obj_dir", log)
+        # Runtime files (memory init) and compile parallelism do not force a rebuild.
+        Path("mem.init").write_text("deadbeef\n")
+        self.assertNotIn("make", self.build(jobs=8)[0])
+
+    def test_changed_inputs_rebuild(self):
+        self.compile(self.build()[0])
+        Path("sim.v").write_text("module sim(); endmodule\n")
+        script, log = self.build()
+        self.assertIn("rm -rf obj_dir/", script)
+        self.assertIn("changed", log)
+        self.compile(script)
+        self.assertIn("rm -rf obj_dir/", self.build(trace=True)[0])
+        self.assertIn("rm -rf obj_dir/", self.build(modules=["clocker"])[0])
+        self.assertIn("rm -rf obj_dir/", self.build(incremental=False)[0])
+
+    def test_ccache_is_passed_to_verilated_makefile(self):
+        with mock.patch.object(verilator, "which", return_value="/usr/bin/ccache"):
+            script, _ = self.build(ccache=True)
+        self.assertIn("OBJCACHE=ccache", script)
+
+    def test_build_argdict_incremental_and_ccache(self):
+        parser = argparse.ArgumentParser()
+        verilator.verilator_build_args(parser)
+        argdict = verilator.verilator_build_argdict(parser.parse_args([]))
+        self.assertTrue(argdict["incremental"])
+        self.assertFalse(argdict["ccache"])
+        argdict = verilator.verilator_build_argdict(parser.parse_args(["--no-incremental", "--ccache"]))
+        self.assertFalse(argdict["incremental"])
+        self.assertTrue(argdict["ccache"])
+
+
 class TestSimVerilatorRun(unittest.TestCase):
     def test_ctrl_c_while_waiting_exits_without_traceback(self):
         proc = mock.Mock()
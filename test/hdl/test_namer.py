@@ -0,0 +1,89 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import time
+import unittest
+
+from migen import *
+
+from litex.gen.fhdl.namer import build_signal_namespace
+
+# Synthetic Designs --------------------------------------------------------------------------------
+
+def _signal(backtrace, related=None):
+    s = Signal(8)
+    s.backtrace = backtrace
+    s.related   = related
+    return s
+
+
+def synthetic_signals(n, fanout=16):
+    """n signals in a 3-level hierarchy of numbered instances, 1/4 of them with a related signal."""
+    signals = []
+    names   = ["valid", "ready", "data", "level", "count", "state"]
+    i = 0
+    while len(signals) < n:
+        path = [("top", None)]
+        k    = i
+        for level in range(3):
+            k, r = divmod(k, fanout)
+            path.append(("core" if level else "fifo", 1000*level + r))
+        s = _signal(path + [(names[i % len(names)], None)])
+        signals.append(s)
+        if i % 4 == 0:
+            signals.append(_signal([("sub", None)], related=s))
+        i += 1
+    return signals[:n]
+
+
+def sibling_signals(n, per=4):
+    """n signals in n/per sibling instances of the same module (ex CSR banks, register files)."""
+    names = ["storage", "re", "we", "status"]
+    return [_signal([("top", None), ("csr", 5000 + i//per), (names[i % per], None)])
+        for i in range(n)]
+
+
+def _time_naming(signals):
+    start = time.perf_counter()
+    ns    = build_signal_namespace(signals)
+    names = [ns.get_name(s) for s in signals]
+    return time.perf_counter() - start, names
+
+# Tests --------------------------------------------------------------------------------------------
+
+class TestNamer(unittest.TestCase):
+    def test_names(self):
+        a0  = _signal([("top", None), ("fifo", 10), ("level", None)])
+        a1  = _signal([("top", None), ("fifo", 12), ("level", None)])
+        b   = _signal([("top", None), ("uart", 3), ("level", None)])
+        c   = _signal([("top", None), ("uart", 3), ("tx", None)])
+        r   = _signal([("sub", None)], related=a1)
+        ns  = build_signal_namespace([a0, a1, b, c, r])
+        self.assertEqual([ns.get_name(s) for s in [a0, a1, b, c, r]],
+            ["fifo_level0", "fifo_level1", "uart_level", "uart_tx", "fifo_level1_sub"])
+
+    def test_names_are_unique(self):
+        for signals in [synthetic_signals(5000), sibling_signals(5000)]:
+            _, names = _time_naming(signals)
+            self.assertEqual(len(set(names)), len(names))
+
+    def test_sibling_scaling(self):
+        # Naming conflicts between siblings used to be checked pairwise (quadratic).
+        # Best of a few runs to be robust to timing noise (GC, loaded machines).
+        small   = sibling_signals(1000)
+        large   = sibling_signals(16000)
+        t_small = min(_time_naming(small)[0] for _ in range(3))
+        t_large = min(_time_naming(large)[0] for _ in range(3))
+        self.assertLess(t_large, 64*max(t_small, 1e-3))
+
+    @unittest.skipUnless(os.environ.get("LITEX_BENCHMARK") == "1", "Set LITEX_BENCHMARK=1 to run.")
+    def test_benchmark(self):
+        print()
+        for n in [10_000, 100_000, 1_000_000]:
+            for name, generator in [("hierarchy", synthetic_signals), ("siblings", sibling_signals)]:
+                duration, _ = _time_naming(generator(n))
+                print(f"{name:>9s} {n:>9d} signals: {duration:7.2f}s ({1e6*duration/n:.1f}us/signal)")
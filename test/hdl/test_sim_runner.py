@@ -0,0 +1,75 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen.sim import SimJob, run_simulations
+
+
+class CounterDUT(Module):
+    def __init__(self):
+        self.enable = Signal()
+        self.count  = Signal(16)
+        self.sync += If(self.enable, self.count.eq(self.count + 1))
+
+
+def counter_generators(n, expected):
+    def generators(dut):
+        def generator():
+            yield dut.enable.eq(1)
+            for _ in range(n):
+                yield
+            yield dut.enable.eq(0)
+            yield
+            dut.observed = (yield dut.count)
+            assert dut.observed == expected
+        return generator()
+    return generators
+
+
+class TestSimRunner(unittest.TestCase):
+    def jobs(self):
+        jobs = [SimJob(CounterDUT, counter_generators(n, n), name=f"count{n}",
+            result=lambda dut: dut.observed) for n in range(1, 9)]
+        jobs.append(SimJob(CounterDUT, counter_generators(4, 5), name="bad"))
+        return jobs
+
+    def check(self, results):
+        self.assertEqual([r.name for r in results], [f"count{n}" for n in range(1, 9)] + ["bad"])
+        for r in results[:-1]:
+            self.assertTrue(r.passed, r.error)
+            self.assertEqual(r.result, int(r.name[5:]))
+            self.assertGreater(r.duration, 0)
+        self.assertFalse(results[-1].passed)
+        self.assertIn("AssertionError", results[-1].error)
+
+    def test_parallel(self):
+        self.check(run_simulations(self.jobs(), processes=4))
+
+    def test_serial(self):
+        self.check(run_simulations(self.jobs(), processes=1))
+
+    def test_clock_domains_and_shared_elaboration(self):
+        elaborations = []
+        def factory():
+            elaborations.append(1)
+            return ClockDomainsRenamer("slow")(CounterDUT())
+        def generators(dut):
+            def generator():
+                yield dut.enable.eq(1)
+                for _ in range(10):
+                    yield
+                dut.observed = (yield dut.count)
+            return {"slow": generator()}
+        job     = SimJob(factory, generators, clocks={"sys": 10, "slow": 20},
+            result=lambda dut: dut.observed)
+        results = run_simulations([job]*3, processes=3)
+        self.assertEqual([r.name for r in results], ["job0", "job1", "job2"])
+        self.assertEqual([r.result for r in results], [9]*3)
+        # Elaborated once in the parent, then forked.
+        self.assertEqual(len(elaborations), 1)
@@ -0,0 +1,436 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""litex.gen.sim: compiled/interpreted backends and event-driven comb propagation must behave
+exactly like the Migen simulator."""
+
+import os
+import time
+import random
+import unittest
+import importlib.util
+
+from migen import *
+
+from litex.gen import *
+from litex.gen.sim import run_simulation
+from litex.gen.sim.core import Simulator
+from migen.sim.core import Simulator as MigenSimulator
+
+from litex.soc.interconnect import stream
+
+# Designs ------------------------------------------------------------------------------------------
+
+class StreamDUT(LiteXModule):
+    def __init__(self):
+        self.fifo      = stream.SyncFIFO([("data", 32)], depth=8, buffered=True)
+        self.converter = stream.StrideConverter([("data", 32)], [("data", 8)])
+        self.buffer    = stream.Buffer([("data", 8)], pipe_valid=True, pipe_ready=True)
+        self.submodules.pipeline = stream.Pipeline(self.fifo, self.converter, self.buffer)
+        self.sink   = self.pipeline.sink
+        self.source = self.pipeline.source
+
+
+class StatementsDUT(LiteXModule):
+    def __init__(self):
+        self.a   = a   = Signal(8)
+        self.b   = b   = Signal((8, True))
+        self.sel = sel = Signal(3)
+
+        self.cat     = Signal(12)
+        self.sliced  = Signal(16)
+        self.signed  = Signal((10, True))
+        self.case    = Signal(8)
+        self.small   = Signal(4)
+        self.mixed   = Signal(8)
+        self.regs    = regs = Array(Signal(8, name=f"reg{i}") for i in range(6))
+        self.wide    = Signal(16)
+        self.counter = Signal(16)
+        self.rep     = Signal(12)
+
+        hi = Signal(4)
+        lo = Signal(8)
+        self.comb += [
+            Cat(lo, hi).eq(a * 37 + b),
+            self.cat.eq(Cat(hi, lo)),
+            self.sliced[4:12].eq(a ^ 0x5a),
+            self.sliced[0:4].eq(~a),
+            self.signed.eq(b - a),
+            self.rep.eq(Replicate(a[0:3], 4)),
+            Case(sel, {i: self.case.eq(a + i) for i in range(7)} | {"default": self.case.eq(0xff)}),
+            Case(sel, {0: self.small.eq(1), 1: self.small.eq(2)}),
+            self.mixed.eq(Mux(a > b, a[0:4], Array([a, b, hi, lo])[sel[0:2]])),
+        ]
+        self.sync += [
+            regs[sel].eq(a + b),
+            Array([self.wide[0:8], self.wide[8:16], self.counter])[sel[0:2]].eq(a),
+            If(a[0],
+                self.counter.eq(self.counter + 3)
+            ).Elif(b < 0,
+                self.counter.eq(self.counter - 1)
+            ),
+        ]
+
+
+class MemoryDUT(LiteXModule):
+    def __init__(self):
+        self.mem = Memory(16, 32, init=[i*7 for i in range(32)])
+        self.wport = self.mem.get_port(write_capable=True, we_granularity=8)
+        self.rport = self.mem.get_port(async_read=True)
+        self.specials += self.mem, self.wport, self.rport
+
+
+class FSMDUT(LiteXModule):
+    def __init__(self):
+        self.start = Signal()
+        self.count = Signal(4)
+        self.done  = Signal()
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        self.running = fsm.ongoing("RUN")
+        fsm.act("IDLE",
+            If(self.start, NextState("RUN"))
+        )
+        fsm.act("RUN",
+            NextValue(self.count, self.count + 1),
+            If(self.count == 9, NextState("DONE"))
+        )
+        fsm.act("DONE",
+            self.done.eq(1),
+            NextValue(self.count, 0),
+            NextState("IDLE")
+        )
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _trace(dut, stimulus, signals, backend, cycles=200):
+    trace = []
+    def monitor():
+        for _ in range(cycles):
+            trace.append((yield signals))
+            yield
+    if backend == "migen":
+        sim = MigenSimulator(dut, [stimulus(dut), monitor()])
+    else:
+        sim = Simulator(dut, [stimulus(dut), monitor()], backend=backend)
+    sim.run()
+    return trace
+
+
+class TestSimulatorBackends(unittest.TestCase):
+    def check(self, dut_cls, stimulus, signals):
+        traces = []
+        for backend in ["migen", "interpreter", "compiled"]:
+            random.seed(0)
+            dut = dut_cls()
+            traces.append(_trace(dut, stimulus, signals(dut), backend))
+        self.assertEqual(traces[0], traces[1])
+        self.assertEqual(traces[0], traces[2])
+
+    def test_stream(self):
+        def stimulus(dut):
+            for i in range(200):
+                yield dut.sink.valid.eq(random.randrange(2))
+                yield dut.sink.data.eq(random.randrange(2**32))
+                yield dut.source.ready.eq(random.randrange(2))
+                yield
+        signals = lambda dut: [dut.sink.ready, dut.source.valid, dut.source.data, dut.fifo.level]
+        self.check(StreamDUT, stimulus, signals)
+
+    def test_statements(self):
+        def stimulus(dut):
+            for i in range(200):
+                yield dut.a.eq(random.randrange(2**8))
+                yield dut.b.eq(random.randrange(-128, 128))
+                yield dut.sel.eq(random.randrange(8))
+                yield
+        signals = lambda dut: [dut.cat, dut.sliced, dut.signed, dut.case, dut.small, dut.mixed,
+            dut.wide, dut.counter, dut.rep] + list(dut.regs)
+        self.check(StatementsDUT, stimulus, signals)
+
+    def test_memory(self):
+        def stimulus(dut):
+            for i in range(200):
+                yield dut.wport.adr.eq(random.randrange(32))
+                yield dut.wport.dat_w.eq(random.randrange(2**16))
+                yield dut.wport.we.eq(random.randrange(4))
+                yield dut.rport.adr.eq(random.randrange(32))
+                yield
+        signals = lambda dut: [dut.wport.dat_r, dut.rport.dat_r]
+        self.check(MemoryDUT, stimulus, signals)
+
+    def test_fsm(self):
+        def stimulus(dut):
+            for i in range(200):
+                yield dut.start.eq(random.randrange(2))
+                yield
+        signals = lambda dut: [dut.count, dut.done, dut.running]
+        self.check(FSMDUT, stimulus, signals)
+
+    def test_statements_are_compiled(self):
+        for dut in [StreamDUT(), StatementsDUT(), MemoryDUT(), FSMDUT()]:
+            sim = Simulator(dut, [])
+            for f in [*sim.comb.actions, *sim.sync.values()]:
+                self.assertEqual(f.__code__.co_filename, "<litex.gen.sim>")
+
+    def test_signal_slots(self):
+        dut   = FSMDUT()
+        extra = Signal(8, reset=42)
+        def generator():
+            self.assertEqual((yield extra), 42)
+            yield extra.eq(300)
+            yield
+            self.assertEqual((yield extra), 300 & 0xff)
+        sim = Simulator(dut, [generator()])
+        # Fragment signals get dense slots at elaboration, others on first access.
+        self.assertEqual(sorted(sim.evaluator.slots.values()), list(range(len(sim.evaluator.values))))
+        self.assertNotIn(extra, sim.evaluator.slots)
+        sim.run()
+        self.assertEqual(sim.evaluator.slots[extra], len(sim.evaluator.values) - 1)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            Simulator(FSMDUT(), [], backend="verilator")
+
+    @unittest.skipUnless(os.environ.get("LITEX_BENCHMARK") == "1", "Set LITEX_BENCHMARK=1 to run.")
+    def test_benchmark(self):
+        # Migen's simulator is the interpreter litex.gen.sim started from: reference for the speedup.
+        def stimulus(dut):
+            for i in range(1000):
+                yield dut.sink.valid.eq(random.randrange(2))
+                yield dut.sink.data.eq(random.randrange(2**32))
+                yield dut.source.ready.eq(random.randrange(2))
+                yield
+        def duration(backend):
+            random.seed(0)
+            dut   = StreamDUT()
+            start = time.perf_counter()
+            _trace(dut, stimulus, [dut.source.valid], backend, cycles=1000)
+            return time.perf_counter() - start
+        print()
+        durations = {}
+        for backend in ["migen", "interpreter", "compiled"]:
+            durations[backend] = min(duration(backend) for _ in range(2))
+            print(f"{backend:>11s}: {1000/durations[backend]:8.0f} cycles/s")
+        self.assertGreaterEqual(durations["migen"], 10*durations["compiled"])
+
+
+class TestCombScheduler(unittest.TestCase):
+    def test_reversed_chain_settles_in_one_pass(self):
+        # Chain written in reverse dependency order: each stage reads the next one.
+        class DUT(Module):
+            def __init__(self):
+                self.i      = Signal(8)
+                self.stages = [Signal(8) for _ in range(16)]
+                for a, b in zip(self.stages, self.stages[1:]):
+                    self.comb += a.eq(b + 1)
+                self.comb += self.stages[-1].eq(self.i)
+
+        dut = DUT()
+        sim = Simulator(dut, [])
+        def generator():
+            for v in [3, 200, 7]:
+                yield dut.i.eq(v)
+                yield
+                self.assertEqual((yield dut.stages[0]), (v + 15) & 0xff)
+        sim.generators["sys"].append(generator())
+        calls = []
+        actions = sim.comb.actions
+        sim.comb.actions = [lambda a=a: (calls.append(a), a()) for a in actions]
+        sim.run()
+        # Each stage runs at most once per input change (initial settle + 3 changes).
+        self.assertLessEqual(len(calls), 4*len(actions))
+
+    def test_idle_logic_is_not_evaluated(self):
+        class DUT(Module):
+            def __init__(self):
+                self.a = Signal(8)
+                self.b = Signal(8)
+                self.x = Signal(8)
+                self.y = Signal(8)
+                self.comb += self.x.eq(self.a + 1)
+                self.comb += self.y.eq(self.b + 1)
+
+        dut = DUT()
+        def generator():
+            for i in range(10):
+                yield dut.a.eq(i)
+                yield
+            self.assertEqual((yield dut.x), 10)
+            self.assertEqual((yield dut.y), 1)
+        sim = Simulator(dut, [generator()])
+        reader = sim.comb.readers[sim.evaluator.slot(dut.b)][0]
+        calls  = []
+        action = sim.comb.actions[reader]
+        sim.comb.actions[reader] = lambda: (calls.append(1), action())
+        sim.run()
+        self.assertEqual(len(calls), 1)
+
+    def test_comb_loop_through_disjoint_bits(self):
+        # Statement-level loop (a <-> b) without a bit-level cycle.
+        class DUT(Module):
+            def __init__(self):
+                self.i = Signal()
+                self.a = Signal(2)
+                self.b = Signal(2)
+                self.comb += self.a.eq(Cat(self.i, self.b[0]))
+                self.comb += self.b.eq(Cat(~self.a[0], 0))
+
+        dut = DUT()
+        def generator():
+            for v in [0, 1, 0]:
+                yield dut.i.eq(v)
+                yield
+                self.assertEqual((yield dut.a), v | ((1 - v) << 1))
+        run_simulation(dut, generator())
+
+
+class TestVCDWriter(unittest.TestCase):
+    def test_vcd_is_streamed_per_timestep(self):
+        import os
+        import tempfile
+        dut   = FSMDUT()
+        extra = Signal(8)
+        def generator():
+            for i in range(40):
+                yield dut.start.eq(i % 3 == 0)
+                yield extra.eq(i)
+                yield
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "sim.vcd")
+            run_simulation(dut, generator(), vcd_name=filename)
+            with open(filename) as f:
+                lines = f.read().splitlines()
+
+        # Header written once, with the design signals only.
+        self.assertEqual(lines.count("$dumpvars"), 1)
+        names = [l.split()[4] for l in lines if l.startswith("$var")]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn("sys_clk", names)
+
+        # Timesteps strictly increasing, each with at least one change, no redundant change.
+        times   = [int(l[1:]) for l in lines if l.startswith("#")]
+        self.assertEqual(times, sorted(set(times)))
+        current = {}
+        for l in lines[lines.index("$dumpvars") + 1:]:
+            if l.startswith("#") or l == "$end":
+                continue
+            value, code = l.split() if l.startswith("b") else (l[0], l[1:])
+            self.assertNotEqual(current.get(code), value)
+            current[code] = value
+
+    def _run(self, filename, trace_signals=None, **kwargs):
+        dut = FSMDUT()
+        def generator():
+            for i in range(40):
+                yield dut.start.eq(i % 3 == 0)
+                yield
+        if trace_signals is not None:
+            kwargs["trace_signals"] = trace_signals(dut)
+        run_simulation(dut, generator(), vcd_name=filename, **kwargs)
+
+    def _vcd(self, **kwargs):
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "sim.vcd")
+            self._run(filename, **kwargs)
+            with open(filename) as f:
+                lines = f.read().splitlines()
+        names = [l.split()[4] for l in lines if l.startswith("$var")]
+        times = [int(l[1:]) for l in lines if l.startswith("#")]
+        return names, times
+
+    def test_trace_signals(self):
+        all_names, _ = self._vcd()
+        # Glob patterns.
+        names, _ = self._vcd(trace_signals=lambda dut: ["sys_*"])
+        self.assertEqual(names, [n for n in all_names if n.startswith("sys_")])
+        # Signals, names are kept from the full dump.
+        names, _ = self._vcd(trace_signals=lambda dut: ["sys_clk", dut.count, dut.done])
+        self.assertEqual(len(names), 3)
+        self.assertTrue(set(names) < set(all_names))
+        # Module hierarchy.
+        names, _ = self._vcd(trace_signals=lambda dut: [dut.fsm])
+        self.assertNotIn("sys_clk", names)
+        self.assertTrue(0 < len(names) < len(all_names))
+
+    def test_trace_window(self):
+        _, all_times = self._vcd()
+        _, times     = self._vcd(trace_start=10, trace_stop=20)
+        # sys clock period is 10: only the [100, 200[ window is traced (besides the #0 header).
+        self.assertEqual(times[0], 0)
+        self.assertEqual(times[1:], [t for t in all_times if 100 <= t < 200])
+
+    def test_fst_output(self):
+        import os
+        import struct
+        import tempfile
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "sim.fst")
+            self._run(filename, trace_signals=lambda dut: ["sys_clk", dut.count])
+            with open(filename, "rb") as f:
+                data = f.read()
+        # Walk the blocks: header, value changes, geometry, hierarchy.
+        blocks = []
+        offset = 0
+        while offset < len(data):
+            block_type, length = data[offset], struct.unpack(">Q", data[offset + 1:offset + 9])[0]
+            blocks.append((block_type, data[offset + 9:offset + 1 + length]))
+            offset += 1 + length
+        self.assertEqual(offset, len(data))
+        self.assertEqual([b[0] for b in blocks], [0, 1, 3, 4])
+        start, end = struct.unpack(">QQ", blocks[0][1][:16])
+        nvars, nhandles, nblocks = struct.unpack(">QQQ", blocks[0][1][40:64])
+        self.assertEqual((start, nvars, nhandles, nblocks), (0, 2, 2, 1))
+        self.assertGreater(end, 400)
+
+    @unittest.skipIf(importlib.util.find_spec("pylibfst") is None, "pylibfst not available")
+    def test_fst_matches_vcd(self):
+        import os
+        import tempfile
+        import pylibfst
+        from pylibfst import ffi, lib
+
+        # Value changes per signal name from the VCD writer.
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "sim.vcd")
+            self._run(filename)
+            with open(filename) as f:
+                lines = f.read().splitlines()
+        codes = {l.split()[3]: l.split()[4] for l in lines if l.startswith("$var")}
+        vcd   = {name: [] for name in codes.values()}
+        time  = 0
+        for l in lines[lines.index("$dumpvars") + 1:]:
+            if l == "$end":
+                continue
+            if l.startswith("#"):
+                time = int(l[1:])
+                continue
+            value, code = l[1:].split() if l.startswith("b") else (l[0], l[1:])
+            vcd[codes[code]].append((time, int(value, 2)))
+
+        # Value changes per signal name decoded by the reference FST reader (GTKWave's fstapi).
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "sim.fst")
+            self._run(filename)
+            reader = lib.fstReaderOpen(filename.encode())
+            self.assertNotEqual(reader, ffi.NULL)
+            try:
+                _, signals = pylibfst.get_scopes_signals2(reader)
+                names = {handle: signal.name.split(".")[-1] for handle, signal in signals.by_handle.items()}
+                fst   = {name: [] for name in names.values()}
+                def value_change(data, time, handle, value):
+                    fst[names[handle]].append((time, int(ffi.string(value).decode(), 2)))
+                lib.fstReaderSetFacProcessMaskAll(reader)
+                pylibfst.fstReaderIterBlocks(reader, value_change)
+            finally:
+                lib.fstReaderClose(reader)
+
+        # Same waveforms: last value of each signal at each timestep (the VCD $dumpvars initial
+        # values can be followed by #0 changes).
+        def waveforms(changes):
+            return {name: sorted(dict(values).items()) for name, values in changes.items()}
+        self.assertEqual(waveforms(fst), waveforms(vcd))
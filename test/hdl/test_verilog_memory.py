@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from migen import *
@@ -82,5 +84,72 @@ class TestMemoryVerilog(unittest.TestCase):
         self.assertIn("assign p0_dat_r1 = capture_memory[capture_memory_adr0];", verilog)
 
 
+class _InitMemory(Module):
+    def __init__(self, width, init):
+        self.clock_domains.cd_sys = ClockDomain("sys")
+        self.adr   = Signal(4,     name="adr")
+        self.dat_r = Signal(width, name="dat_r")
+        mem  = Memory(width, 16, name="rom", init=init)
+        port = mem.get_port()
+        self.specials += mem, port
+        self.comb += [port.adr.eq(self.adr), self.dat_r.eq(port.dat_r)]
+
+    def get_ios(self):
+        return {self.adr, self.dat_r}
+
+
+class TestMemoryInitFiles(unittest.TestCase):
+    def _convert(self, dut, **kwargs):
+        return convert(dut, ios=dut.get_ios(), name="test", **kwargs)
+
+    def _data_file(self, output, filename):
+        return bytes(output.data_files[filename])
+
+    def test_hex_init_file(self):
+        for width, init, expected in [
+            (32, [0x01, 0xdeadbeef], b"00000001\ndeadbeef\n"),
+            (24, [0x012345, 0xabcdef], b"012345\nabcdef\n"),
+            (12, [0x123, 0xfff],       b"123\nfff\n"),
+            (9,  [0x1ff, 0x01],        b"1ff\n01\n"),
+            (8,  [0x123, 0x45],        b"123\n45\n"), # Out of range words are kept.
+        ]:
+            output = self._convert(_InitMemory(width, init))
+            self.assertIn("$readmemh(\"test_rom.init\", rom);", output.main_source)
+            self.assertEqual(self._data_file(output, "test_rom.init"), expected)
+
+    def test_binary_init_file(self):
+        output = self._convert(_InitMemory(32, [0x01, 0xdeadbeef]), memory_init_format="bin")
+        self.assertIn("$fopen(\"test_rom.bin\", \"rb\");", output.main_source)
+        self.assertIn("$fread(rom, fd);", output.main_source)
+        self.assertEqual(self._data_file(output, "test_rom.bin"), bytes.fromhex("00000001deadbeef"))
+
+    def test_binary_init_file_falls_back_to_hex_for_unaligned_widths(self):
+        output = self._convert(_InitMemory(9, [0x1ff]), memory_init_format="bin")
+        self.assertEqual(list(output.data_files), ["test_rom.init"])
+
+    def test_invalid_init_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._convert(_InitMemory(32, [0]), memory_init_format="mif")
+
+    def test_unchanged_init_file_is_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            try:
+                self._convert(_InitMemory(32, [1, 2])).write("test.v")
+                mtime = os.stat("test_rom.init").st_mtime_ns - 10**9
+                os.utime("test_rom.init", ns=(mtime, mtime))
+
+                self._convert(_InitMemory(32, [1, 2])).write("test.v")
+                self.assertEqual(os.stat("test_rom.init").st_mtime_ns, mtime)
+
+                self._convert(_InitMemory(32, [1, 3])).write("test.v")
+                self.assertNotEqual(os.stat("test_rom.init").st_mtime_ns, mtime)
+                with open("test_rom.init") as f:
+                    self.assertEqual(f.read(), "00000001\n00000003\n")
+            finally:
+                os.chdir(cwd)
+
+
 if __name__ == "__main__":
     unittest.main()
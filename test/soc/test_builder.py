@@ -159,6 +159,10 @@ class TestBuilderArguments(unittest.TestCase):
         self.assertTrue(enabled["build_log"])
         self.assertFalse(disabled["build_log"])
 
+    def test_profile_option_is_mapped(self):
+        self.assertFalse(_make_argdict()["profile"])
+        self.assertTrue(_make_argdict("--profile")["profile"])
+
     def test_export_and_bios_options_are_mapped(self):
         argdict = _make_argdict(
             "--soc-json", "soc.json",
@@ -875,6 +879,47 @@ class TestBuilderBuild(unittest.TestCase):
 
             self.assertFalse(os.path.exists(os.path.join(builder.output_dir, "litex.log")))
 
+    def test_build_writes_profile_next_to_build_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            soc     = _BuildableFakeSoC()
+            builder = _make_builder(tmp_dir, soc=soc, compile_software=False, compile_gateware=False, profile=True)
+
+            builder._generate_includes = Mock()
+            builder._generate_csr_map  = Mock()
+            builder.build()
+
+            self.assertEqual(builder.get_profile_filename(), os.path.join(builder.output_dir, "litex_profile.json"))
+            with open(builder.get_profile_filename(), "r") as f:
+                profile = json.load(f)
+            phases = [p["phase"] for p in profile["phases"]]
+            self.assertEqual(phases[0], "build")
+            for phase in ["finalize", "includes", "csr_map", "build_bundle", "gateware"]:
+                self.assertIn("build/" + phase, phases)
+            for p in profile["phases"]:
+                for k in ["wall_s", "cpu_s", "children_cpu_s", "peak_rss_mb"]:
+                    self.assertIn(k, p)
+
+    def test_build_profile_can_be_enabled_from_env(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"LITEX_PROFILE": "1"}):
+                builder = _make_builder(tmp_dir, soc=_BuildableFakeSoC(), compile_software=False,
+                    compile_gateware=False, build_log=False)
+            builder._generate_includes = Mock()
+            builder._generate_csr_map  = Mock()
+            builder.build()
+
+            self.assertTrue(os.path.exists(os.path.join(builder.output_dir, "litex_profile.json")))
+
+    def test_build_profile_is_disabled_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"LITEX_PROFILE": ""}):
+                builder = _make_builder(tmp_dir, soc=_BuildableFakeSoC(), compile_software=False, compile_gateware=False)
+            builder._generate_includes = Mock()
+            builder._generate_csr_map  = Mock()
+            builder.build()
+
+            self.assertFalse(os.path.exists(builder.get_profile_filename()))
+
     def test_active_build_log_is_not_nested_by_builder(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             log_file = os.path.join(tmp_dir, "litex.log")
@@ -123,6 +123,47 @@ class TestSoCCoreCompatibility(unittest.TestCase):
         self.assertIs(soc_core.soc_mini_argdict, soc_mini_argdict)
 
 
+class TestSoCMemData(unittest.TestCase):
+    def _write(self, tmp_dir, name, data):
+        filename = os.path.join(tmp_dir, name)
+        with open(filename, "wb") as f:
+            f.write(data)
+        return filename
+
+    def test_words_follow_endianness_and_last_word_is_padded(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = self._write(tmp_dir, "mem.bin", bytes(range(1, 10)))
+            self.assertEqual(get_mem_data(filename, endianness="little"), [0x04030201, 0x08070605, 0x00000009])
+            self.assertEqual(get_mem_data(filename, endianness="big"),    [0x01020304, 0x05060708, 0x09000000])
+
+    def test_wide_words_are_built_from_32bit_words(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = self._write(tmp_dir, "mem.bin", bytes(range(1, 17)))
+            self.assertEqual(get_mem_data(filename, data_width=64,  endianness="little"), [0x0807060504030201, 0x100f0e0d0c0b0a09])
+            self.assertEqual(get_mem_data(filename, data_width=64,  endianness="big"),    [0x0506070801020304, 0x0d0e0f10090a0b0c])
+            self.assertEqual(get_mem_data(filename, data_width=128, endianness="big"),    [0x0d0e0f10090a0b0c0506070801020304])
+
+    def test_regions_are_placed_at_their_base(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            regions = {
+                self._write(tmp_dir, "a.bin", bytes([1, 0, 0, 0])) : "0x00000000",
+                self._write(tmp_dir, "b.bin", bytes([2, 0, 0, 0])) : "0x00000010",
+            }
+            self.assertEqual(get_mem_data(regions, endianness="little"), [1, 0, 0, 0, 2])
+            self.assertEqual(get_mem_data(regions, endianness="little", offset=0, mem_size=20), [1, 0, 0, 0, 2])
+            with self.assertRaises(ValueError):
+                get_mem_data(regions, endianness="little", mem_size=16)
+
+    def test_overlapping_and_unaligned_regions_are_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            a = self._write(tmp_dir, "a.bin", bytes(8))
+            b = self._write(tmp_dir, "b.bin", bytes(8))
+            with self.assertRaisesRegex(ValueError, "overlap"):
+                get_mem_data({a: "0x00000000", b: "0x00000004"})
+            with self.assertRaisesRegex(ValueError, "aligned"):
+                get_mem_data({a: "0x00000000", b: "0x0000000a"})
+
+
 class TestSoCAddressConstants(unittest.TestCase):
     def test_ip_address_constants_are_split_into_octets(self):
         soc = _ConstantCollector()
@@ -538,6 +538,33 @@ def test_bios_boot_helpers_host_coverage(tmp_path):
             return 0;
         }}
 
+        static int test_serialboot_crc_and_fill_checks_ranges(void)
+        {{
+            static const unsigned char ack[] = SFL_MAGIC_ACK;
+            /* addr, block_size/length, count/value */
+            unsigned char crc_empty[9]     = {{0x00, 0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x10, 0x00}};
+            unsigned char crc_too_many[9]  = {{0x00, 0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x10, SFL_CRC_MAX_BLOCKS + 1}};
+            unsigned char crc_overflow[9]  = {{0x00, 0x00, 0x10, 0x00, 0x00, 0x00, 0x08, 0x00, 0x03}};
+            unsigned char fill_empty[9]    = {{0x00, 0x00, 0x10, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00}};
+            unsigned char fill_overflow[9] = {{0x00, 0x00, 0x30, 0x00, 0x00, 0x00, 0x01, 0x01, 0x00}};
+            int result;
+
+            reset_serial(ack, SFL_MAGIC_LEN);
+            append_frame(SFL_CMD_CRC,  crc_empty,     sizeof(crc_empty));
+            append_frame(SFL_CMD_CRC,  crc_too_many,  sizeof(crc_too_many));
+            append_frame(SFL_CMD_CRC,  crc_overflow,  sizeof(crc_overflow));
+            append_frame(SFL_CMD_FILL, fill_empty,    sizeof(fill_empty));
+            append_frame(SFL_CMD_FILL, fill_overflow, sizeof(fill_overflow));
+            append_frame(SFL_CMD_FILL, fill_empty,    8);
+            append_frame(SFL_CMD_ABORT, NULL, 0);
+
+            result = serialboot();
+            REQUIRE(result == 1);
+            REQUIRE(uart_out_len == SFL_MAGIC_LEN + 7);
+            REQUIRE(memcmp(&uart_out[SFL_MAGIC_LEN], "KEEKEEK", 7) == 0);
+            return 0;
+        }}
+
         static int test_serialboot_jump_boots_requested_address(void)
         {{
             static const unsigned char ack[] = SFL_MAGIC_ACK;
@@ -587,6 +614,8 @@ def test_bios_boot_helpers_host_coverage(tmp_path):
                 return 1;
             if (test_serialboot_protocol_errors_recover_with_abort())
                 return 1;
+            if (test_serialboot_crc_and_fill_checks_ranges())
+                return 1;
             if (test_serialboot_jump_boots_requested_address())
                 return 1;
             return 0;
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Etherbone encode/decode micro-benchmark: Packet classes vs struct based encoder/decoder.
+# Usage: python3 test/tools/bench_etherbone.py [--count 255] [--iterations 2000]
+
+import argparse
+import timeit
+
+from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord
+from litex.tools.remote.etherbone import EtherboneReads, EtherboneWrites
+from litex.tools.remote.etherbone import encode_etherbone_record, encode_etherbone_packet
+from litex.tools.remote.etherbone import decode_etherbone_records
+
+# Classes ------------------------------------------------------------------------------------------
+
+def classes_encode(addr_width, datas, addrs):
+    addr_size = addr_width//8
+    record = EtherboneRecord(addr_size)
+    record.writes = EtherboneWrites(addr_size=addr_size, base_addr=0x1000, datas=datas)
+    record.reads  = EtherboneReads(addr_size=addr_size, base_ret_addr=0x2000, addrs=addrs)
+    packet = EtherbonePacket(addr_width)
+    packet.records = [record]
+    packet.encode()
+    return bytes(packet.bytes)
+
+def classes_decode(addr_width, buf):
+    packet = EtherbonePacket(addr_width, buf)
+    packet.decode()
+    record = packet.records[0]
+    return record.writes.get_datas(), record.reads.get_addrs()
+
+# Struct -------------------------------------------------------------------------------------------
+
+def struct_encode(addr_width, datas, addrs):
+    record = encode_etherbone_record(addr_width//8,
+        base_addr     = 0x1000,
+        datas         = datas,
+        base_ret_addr = 0x2000,
+        addrs         = addrs)
+    return encode_etherbone_packet(addr_width, [record])
+
+def struct_decode(addr_width, buf):
+    record = decode_etherbone_records(buf, addr_width//8)[0]
+    return record.datas, record.addrs
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Etherbone encode/decode micro-benchmark.")
+    parser.add_argument("--count",      default=255,  type=int, help="Words per writes/reads section.")
+    parser.add_argument("--iterations", default=2000, type=int, help="Iterations per measure.")
+    args = parser.parse_args()
+
+    for addr_width in [32, 64]:
+        datas = list(range(args.count))
+        addrs = [4*i for i in range(args.count)]
+        buf   = classes_encode(addr_width, datas, addrs)
+
+        # Both implementations must produce/decode the same packets.
+        assert struct_encode(addr_width, datas, addrs) == buf
+        assert [list(v) for v in struct_decode(addr_width, memoryview(buf))] == list(classes_decode(addr_width, buf))
+
+        results = {}
+        for name, fn in [
+            ("classes encode", lambda: classes_encode(addr_width, datas, addrs)),
+            ("struct  encode", lambda: struct_encode(addr_width, datas, addrs)),
+            ("classes decode", lambda: classes_decode(addr_width, buf)),
+            ("struct  decode", lambda: struct_decode(addr_width, memoryview(buf))),
+            ]:
+            results[name] = min(timeit.repeat(fn, number=args.iterations, repeat=3))/args.iterations
+        print(f"{addr_width}-bit addresses, {args.count} writes + {args.count} reads per record:")
+        for name, t in results.items():
+            print(f"  {name}: {t*1e6:8.2f} us")
+        for op in ["encode", "decode"]:
+            print(f"  {op} speedup: {results['classes ' + op]/results['struct  ' + op]:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import io
 import os
+import zlib
+import struct
 import tempfile
 import unittest
 from contextlib import redirect_stdout
@@ -12,6 +14,8 @@ from litex.tools.litex_term import (
     SFLFrame,
     SFLUploadError,
     crc16,
+    crc16_table,
+    sfl_encode_frame,
     sfl_ack_crcerror,
     sfl_ack_error,
     sfl_ack_success,
@@ -48,6 +52,46 @@ class FakePort:
         return len(data)
 
 
+class FakeSFLDevice(FakePort):
+    """Serial port decoding SFL frames and executing load/fill/crc commands on a memory."""
+    def __init__(self, base, size, delta=True):
+        FakePort.__init__(self)
+        self.base     = base
+        self.mem      = bytearray(size)
+        self.delta    = delta
+        self.commands = []
+        self._frame   = bytearray()
+
+    def write(self, data):
+        self.written += data
+        self._frame  += data
+        while len(self._frame) >= 4 and len(self._frame) >= 4 + self._frame[0]:
+            length  = self._frame[0]
+            cmd     = self._frame[3:4]
+            payload = bytes(self._frame[4:4 + length])
+            del self._frame[:4 + length]
+            self._read_data += self.execute(cmd, payload)
+        return len(data)
+
+    def execute(self, cmd, payload):
+        addr = struct.unpack(">I", payload[:4])[0] - self.base
+        self.commands.append(cmd)
+        if cmd == sfl_cmd_load:
+            self.mem[addr:addr + len(payload) - 4] = payload[4:]
+            return sfl_ack_success
+        if not self.delta:
+            return litex_term.sfl_ack_unknown
+        if cmd == litex_term.sfl_cmd_fill:
+            size, value = struct.unpack(">IB", payload[4:9])
+            self.mem[addr:addr + size] = bytes([value])*size
+            return sfl_ack_success
+        if cmd == litex_term.sfl_cmd_crc:
+            block_size, count = struct.unpack(">IB", payload[4:9])
+            crcs = [zlib.crc32(self.mem[addr + n*block_size:addr + (n + 1)*block_size]) for n in range(count)]
+            return sfl_ack_success + struct.pack(f">{count}I", *crcs)
+        return litex_term.sfl_ack_unknown
+
+
 class FakeConsole:
     def __init__(self, keys):
         self.keys = list(keys)
@@ -71,6 +115,7 @@ def make_term(port, port_url=None):
     if port_url is not None:
         term.port_url = port_url
     term.safe = True
+    term.delta = False
     term.delay = 0
     term.length = 64
     term.outstanding = 1
@@ -128,6 +173,24 @@ class TestSFLFrame(unittest.TestCase):
         self.assertEqual(encoded[3:4], sfl_cmd_abort)
         self.assertEqual(len(encoded), 4)
 
+    def test_crc16_matches_table(self):
+        def table_crc16(l):
+            crc = 0
+            for d in l:
+                crc = crc16_table[((crc >> 8) ^ d) & 0xff] ^ (crc << 8)
+            return crc & 0xffff
+
+        data = bytes(range(256))*3 + b"LiteX"
+        for n in [0, 1, 7, 255, len(data)]:
+            self.assertEqual(crc16(data[:n]), table_crc16(data[:n]))
+        self.assertEqual(crc16(list(data[:16])), table_crc16(data[:16]))
+
+    def test_load_frame_encoder_matches_frame(self):
+        frame = SFLFrame()
+        frame.cmd = sfl_cmd_load
+        frame.payload = (0x40001000).to_bytes(4, "big") + bytes(range(251))
+        self.assertEqual(sfl_encode_frame(sfl_cmd_load, bytes(range(251)), address=0x40001000), frame.encode())
+
     def test_send_frame_retries_after_crc_error(self):
         port = FakePort(read_data=sfl_ack_crcerror + sfl_ack_success)
         term = make_term(port)
@@ -360,6 +423,83 @@ class TestLiteXTermSFL(unittest.TestCase):
         frame.payload = (0x40000000).to_bytes(4, "big") + b"LiteX"
         self.assertEqual(port.written, frame.encode() * 2)
 
+    def test_upload_sends_prepared_frames_in_order(self):
+        port = FakePort(read_data=sfl_ack_success*4)
+        term = make_term(port)
+        term.length = 3
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b"LiteXSoC!!")
+            filename = f.name
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(term.upload(filename, 0x40000000), 10)
+        finally:
+            os.unlink(filename)
+
+        expected = b""
+        for offset in range(0, 10, 3):
+            frame = SFLFrame()
+            frame.cmd = sfl_cmd_load
+            frame.payload = (0x40000000 + offset).to_bytes(4, "big") + b"LiteXSoC!!"[offset:offset + 3]
+            expected += frame.encode()
+        self.assertEqual(port.written, expected)
+
+    def test_upload_once_raises_on_truncated_file(self):
+        port = FakePort(read_data=sfl_ack_success*4)
+        term = make_term(port)
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b"Lite")
+            filename = f.name
+        try:
+            with redirect_stdout(io.StringIO()), self.assertRaises(SFLUploadError):
+                term.upload_once(filename, 0x40000000, 8, 4, 1)
+        finally:
+            os.unlink(filename)
+
+    def _delta_upload(self, port, image):
+        term = make_term(port)
+        term.delta  = True
+        term.length = 251
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(image)
+            filename = f.name
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(term.upload(filename, 0x40000000), len(image))
+        finally:
+            os.unlink(filename)
+
+    def test_delta_upload_only_sends_changed_blocks(self):
+        block = litex_term.sfl_delta_block_size
+        image = bytearray(os.urandom(4*block)) + bytes(3*block) + b"tail"
+        port  = FakeSFLDevice(0x40000000, 16*block)
+        port.mem[4*block:5*block] = b"\xff"*block
+
+        # First upload: random blocks are loaded, the dirty zero block is filled.
+        self._delta_upload(port, bytes(image))
+        self.assertEqual(port.mem[:len(image)], image)
+        self.assertEqual(port.commands.count(litex_term.sfl_cmd_fill), 1)
+
+        # Second upload: only the modified block (and the tail) are loaded.
+        image[block + 10] ^= 0xff
+        port.commands.clear()
+        port.written.clear()
+        self._delta_upload(port, bytes(image))
+        self.assertEqual(port.mem[:len(image)], image)
+        self.assertEqual(port.commands.count(litex_term.sfl_cmd_fill), 0)
+        self.assertLess(len(port.written), block + 1024)
+
+    def test_delta_upload_falls_back_to_full_upload(self):
+        block = litex_term.sfl_delta_block_size
+        image = os.urandom(2*block)
+        port  = FakeSFLDevice(0x40000000, 4*block, delta=False)
+        self._delta_upload(port, image)
+        self.assertEqual(port.mem[:len(image)], image)
+        self.assertEqual(port.commands[0], litex_term.sfl_cmd_crc)
+        self.assertEqual(port.commands[1:], [sfl_cmd_load]*((len(image) + 250)//251))
+
     def test_upload_retries_with_smaller_window_after_optimized_error(self):
         port = FakePort(
             read_data=sfl_ack_success + sfl_ack_error,
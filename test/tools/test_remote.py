@@ -4,22 +4,33 @@
 # Copyright (c) 2026 Florent Kermarrec <florent@enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import io
 import os
 import socket
+import time
 import tempfile
 import threading
 import unittest
+from array import array
 from unittest import mock
+from contextlib import redirect_stdout
 
-from litex.tools.litex_server import RemoteServer, _read_merger
+from litex.tools.litex_server import RemoteServer, AsyncRemoteServer
+from litex.tools.remote.read_merger import read_merger
 from litex.tools.remote.comm_uart import CommUART
+from litex.tools.remote.comm_udp import CommUDP
+from litex.tools.remote.comm_devmem import CommDevMem
 from litex.tools.remote.comm_uart import CMD_READ_BURST_INCR
 from litex.tools.remote.comm_uart import CMD_WRITE_BURST_INCR, CMD_WRITE_BURST_FIXED
+from litex.tools.remote.csr_builder import CSRBuilder, CSRRegister, CSRRegisters, load_csr_map
 from litex.tools.remote.etherbone import Packet
 from litex.tools.remote.etherbone import EtherboneIPC
 from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord
 from litex.tools.remote.etherbone import EtherboneReads, EtherboneWrites
+from litex.tools.remote.etherbone import encode_etherbone_record, encode_etherbone_packet
+from litex.tools.remote.etherbone import decode_etherbone_records
 from litex.tools.litex_client import RemoteClient, read_memory, write_memory
+from litex.tools.litex_client import stream_read_memory, stream_write_memory
 
 
 def _read_response(datas, addr_width=32):
@@ -150,6 +161,52 @@ class TestEtherboneHelpers(unittest.TestCase):
         self.assertEqual(decoded.records[0].reads.get_addrs(), [0x2000, 0x2004])
 
 
+class TestEtherboneFastCodec(unittest.TestCase):
+    def _classes_packet(self, addr_width, datas, addrs):
+        addr_size = addr_width//8
+        record = EtherboneRecord(addr_size)
+        record.writes = EtherboneWrites(addr_size=addr_size, base_addr=0x1000, datas=datas)
+        record.reads  = EtherboneReads(addr_size=addr_size, base_ret_addr=0x2000, addrs=addrs)
+        record.rff    = 1
+        packet = EtherbonePacket(addr_width)
+        packet.records = [record]
+        packet.pf      = 1
+        packet.encode()
+        return bytes(packet.bytes)
+
+    def test_encode_matches_classes(self):
+        for addr_width in [32, 64]:
+            datas  = list(range(255))
+            addrs  = [4*i for i in range(255)]
+            record = encode_etherbone_record(addr_width//8, 0x1000, datas, 0x2000, addrs, flags=0x04)
+            self.assertEqual(encode_etherbone_packet(addr_width, [record], pf=1),
+                self._classes_packet(addr_width, datas, addrs))
+
+    def test_decode_matches_classes(self):
+        for addr_width in [32, 64]:
+            buf     = self._classes_packet(addr_width, [0xdeadbeef, 0x12345678], [0x10, 0x20, 0x30])
+            records = decode_etherbone_records(memoryview(buf))
+            self.assertEqual(len(records), 1)
+            self.assertEqual(records[0].flags,         0x04)
+            self.assertEqual(records[0].base_addr,     0x1000)
+            self.assertEqual(records[0].datas,         (0xdeadbeef, 0x12345678))
+            self.assertEqual(records[0].base_ret_addr, 0x2000)
+            self.assertEqual(records[0].addrs,         (0x10, 0x20, 0x30))
+
+    def test_multiple_records_and_read_response(self):
+        buf = encode_etherbone_packet(32, [
+            encode_etherbone_record(4, datas=[1, 2, 3]),
+            encode_etherbone_record(4, addrs=[0x40]),
+        ])
+        records = decode_etherbone_records(buf)
+        self.assertEqual([(r.datas, r.addrs) for r in records], [((1, 2, 3), ()), ((), (0x40,))])
+        self.assertEqual(decode_etherbone_records(_read_response([7, 8]))[0].datas, (7, 8))
+
+    def test_burst_limit(self):
+        with self.assertRaises(ValueError):
+            encode_etherbone_record(4, datas=list(range(256)))
+
+
 class TestReadMerger(unittest.TestCase):
     @staticmethod
     def _expand(reads):
@@ -162,59 +219,59 @@ class TestReadMerger(unittest.TestCase):
         return addrs
 
     def test_empty_reads(self):
-        self.assertEqual(list(_read_merger([])), [])
+        self.assertEqual(list(read_merger([])), [])
 
     def test_incr_reads(self):
         addrs = [0x00, 0x04, 0x08]
-        reads = list(_read_merger(addrs))
+        reads = list(read_merger(addrs))
 
         self.assertEqual(reads, [(0x00, 3, "incr")])
         self.assertEqual(self._expand(reads), addrs)
 
     def test_fixed_reads(self):
         addrs = [0x20, 0x20, 0x20]
-        reads = list(_read_merger(addrs))
+        reads = list(read_merger(addrs))
 
         self.assertEqual(reads, [(0x20, 3, "fixed")])
         self.assertEqual(self._expand(reads), addrs)
 
     def test_mixed_reads_preserve_order(self):
         addrs = [0x00, 0x04, 0x04, 0x08, 0x20, 0x20]
-        reads = list(_read_merger(addrs))
+        reads = list(read_merger(addrs))
 
         self.assertEqual(reads, [(0x00, 2, "incr"), (0x04, 2, "incr"), (0x20, 2, "fixed")])
         self.assertEqual(self._expand(reads), addrs)
 
     def test_fixed_disabled_preserves_repeated_reads(self):
         addrs = [0x20, 0x20]
-        reads = list(_read_merger(addrs, bursts=["incr"]))
+        reads = list(read_merger(addrs, bursts=["incr"]))
 
         self.assertEqual(reads, [(0x20, 1, "incr"), (0x20, 1, "incr")])
         self.assertEqual(self._expand(reads), addrs)
 
     def test_max_length_splits_reads(self):
         addrs = [4*i for i in range(5)]
-        reads = list(_read_merger(addrs, max_length=2))
+        reads = list(read_merger(addrs, max_length=2))
 
         self.assertEqual(reads, [(0x00, 2, "incr"), (0x08, 2, "incr"), (0x10, 1, "incr")])
         self.assertEqual(self._expand(reads), addrs)
 
     def test_default_max_length_is_etherbone_safe(self):
         addrs = [4*i for i in range(256)]
-        reads = list(_read_merger(addrs))
+        reads = list(read_merger(addrs))
 
         self.assertEqual(reads, [(0x00, 255, "incr"), (0x3fc, 1, "incr")])
         self.assertEqual(self._expand(reads), addrs)
 
     def test_invalid_configuration(self):
         with self.assertRaises(ValueError):
-            list(_read_merger([0], max_length=0))
+            list(read_merger([0], max_length=0))
 
         with self.assertRaises(ValueError):
-            list(_read_merger([0], bursts=["fixed"]))
+            list(read_merger([0], bursts=["fixed"]))
 
         with self.assertRaises(ValueError):
-            list(_read_merger([0], bursts=["incr", "wrap"]))
+            list(read_merger([0], bursts=["incr", "wrap"]))
 
 
 class TestRemoteServer(unittest.TestCase):
@@ -241,6 +298,242 @@ class TestRemoteServer(unittest.TestCase):
         self.assertEqual(server.read_bursts, ["incr"])
 
 
+class FakeMemoryComm:
+    def __init__(self):
+        self.mem         = {}
+        self.lock        = threading.Lock()
+        self.read_calls  = []
+        self.write_calls = []
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def read(self, addr, length=None, burst="incr"):
+        with self.lock:
+            self.read_calls.append((addr, length, burst))
+            n = 1 if length is None else length
+            return [self.mem.get(addr + (4*i if burst == "incr" else 0), 0) for i in range(n)]
+
+    def write(self, addr, datas):
+        with self.lock:
+            self.write_calls.append((addr, list(datas)))
+            for i, data in enumerate(datas):
+                self.mem[addr + 4*i] = data
+
+
+def _record(writes=None, reads=None, addr_size=4):
+    record = EtherboneRecord(addr_size)
+    if writes is not None:
+        base, datas = writes
+        record.writes = EtherboneWrites(addr_size=addr_size, base_addr=base, datas=datas)
+        record.wcount = len(record.writes)
+    if reads is not None:
+        record.reads  = EtherboneReads(addr_size=addr_size, addrs=reads)
+        record.rcount = len(record.reads)
+    return record
+
+
+class TestAsyncRemoteServer(unittest.TestCase):
+    def test_inflight_capability(self):
+        class CommPCIe:
+            pass
+
+        class CommUDP:
+            pass
+
+        class CommPipelined:
+            max_inflight = 8
+
+        self.assertEqual(AsyncRemoteServer(CommPCIe(),      "localhost").inflight, 4)
+        self.assertEqual(AsyncRemoteServer(CommUDP(),       "localhost").inflight, 1)
+        self.assertEqual(AsyncRemoteServer(CommPipelined(), "localhost").inflight, 8)
+        self.assertEqual(AsyncRemoteServer(CommUDP(),       "localhost", inflight=2).inflight, 2)
+
+    def test_records_are_coalesced_across_clients(self):
+        server = AsyncRemoteServer(FakeMemoryComm(), "localhost")
+        ops = server._coalesce([
+            (_record(writes=(0x100, [1, 2])),     None),
+            (_record(writes=(0x108, [3])),        None),
+            (_record(reads=[0x100, 0x104]),       "f0"),
+            (_record(reads=[0x108]),              "f1"),
+            (_record(writes=(0x200, [4]), reads=[0x200]), "f2"),
+        ])
+
+        self.assertEqual(ops, [
+            ("write", 0x100, [1, 2, 3]),
+            ("read",  [0x100, 0x104, 0x108], [("f0", 2), ("f1", 1)]),
+            ("write", 0x200, [4]),
+            ("read",  [0x200], [("f2", 1)]),
+        ])
+
+    def test_non_contiguous_or_long_writes_are_not_merged(self):
+        server = AsyncRemoteServer(FakeMemoryComm(), "localhost")
+        ops = server._coalesce([
+            (_record(writes=(0x000, [0]*200)), None),
+            (_record(writes=(0x320, [0]*100)), None),
+            (_record(writes=(0x800, [0])),     None),
+        ])
+        self.assertEqual([(op[1], len(op[2])) for op in ops], [(0x000, 200), (0x320, 100), (0x800, 1)])
+
+    def test_concurrent_clients(self):
+        comm   = FakeMemoryComm()
+        server = AsyncRemoteServer(comm, "localhost", bind_port=0, inflight=2)
+        server.open()
+        try:
+            server.start()
+            port = server.socket.getsockname()[1]
+
+            errors = []
+            def client(n):
+                try:
+                    with RemoteClient(port=port, csr_csv=None, raise_on_timeout=True) as bus:
+                        base = 0x1000*(n + 1)
+                        for i in range(20):
+                            bus.write(base + 4*i, [n*100 + i])
+                        self.assertEqual(bus.read(base, 20), [n*100 + i for i in range(20)])
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=client, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+            self.assertEqual(errors, [])
+        finally:
+            server.close()
+
+
+class FakeEtherboneUDP:
+    """Etherbone UDP target replying to reads with addr//4, in reverse order of `batch` requests."""
+    def __init__(self, batch=1, drop=0):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.settimeout(0.1)
+        self.port     = self.socket.getsockname()[1]
+        self.batch    = batch
+        self.drop     = drop
+        self.requests = []
+        self.running  = True
+        self.thread   = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        pending = []
+        while self.running:
+            try:
+                datas, peer = self.socket.recvfrom(8192)
+            except socket.timeout:
+                pending, flush = [], pending
+            else:
+                packet = EtherbonePacket(32, datas)
+                packet.decode()
+                reads = packet.records[0].reads
+                self.requests.append(len(reads.get_addrs()))
+                if self.drop:
+                    self.drop -= 1
+                    continue
+                record = EtherboneRecord(4)
+                record.writes = EtherboneWrites(addr_size=4, base_addr=reads.base_ret_addr,
+                    datas=[addr//4 for addr in reads.get_addrs()])
+                record.wcount = len(record.writes)
+                reply = EtherbonePacket(32)
+                reply.records = [record]
+                reply.encode()
+                pending.append((reply.bytes, peer))
+                flush = []
+                if len(pending) >= self.batch:
+                    pending, flush = [], pending
+            for reply, peer in reversed(flush):
+                self.socket.sendto(reply, peer)
+
+    def comm(self, **kwargs):
+        comm = CommUDP("127.0.0.1", self.port, timeout=0.5, **kwargs)
+        comm.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        comm.socket.bind(("127.0.0.1", 0))
+        comm.socket.settimeout(comm.timeout)
+        return comm
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        self.socket.close()
+
+
+class TestCommUDP(unittest.TestCase):
+    def test_read_single(self):
+        target = FakeEtherboneUDP()
+        try:
+            comm = target.comm()
+            self.assertEqual(comm.read(0x100), 0x40)
+            self.assertEqual(comm.read_max_length, 1)
+            comm.close()
+        finally:
+            target.close()
+
+    def test_windowed_read_is_split_and_reordered(self):
+        target = FakeEtherboneUDP(batch=4)
+        try:
+            comm = target.comm(window=4, max_length=16)
+            self.assertEqual(comm.read(0x1000, 100), [0x400 + i for i in range(100)])
+            self.assertEqual(target.requests, [16]*6 + [4])
+            self.assertEqual(comm.read_max_length, 64)
+            comm.close()
+        finally:
+            target.close()
+
+    def test_windowed_read_retries_lost_records(self):
+        target = FakeEtherboneUDP(drop=1)
+        try:
+            comm = target.comm(window=2, max_length=8)
+            self.assertEqual(comm.read(0x0, 20), list(range(20)))
+            self.assertEqual(sum(target.requests), 20 + 8)
+            comm.close()
+        finally:
+            target.close()
+
+
+class TestCommDevMemBulk(unittest.TestCase):
+    def _comm(self, size=0x1000):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(bytes(size))
+        self.addCleanup(os.unlink, f.name)
+        comm = CommDevMem(base=0, size=size, dev=f.name)
+        comm.open()
+        self.addCleanup(comm.close)
+        return comm
+
+    def test_bulk_write_read(self):
+        comm = self._comm()
+        comm.write_bulk(0x100, [0x11223344, 0x55667788])
+        comm.write_bulk(0x108, array("I", [0xdeadbeef]))
+        comm.write_bulk(0x10c, b"\x01\x02\x03\x04")
+        self.assertEqual(comm.read(0x100, 4), [0x11223344, 0x55667788, 0xdeadbeef, 0x04030201])
+        self.assertEqual(comm.read_bulk(0x100, 4), array("I", [0x11223344, 0x55667788, 0xdeadbeef, 0x04030201]))
+        self.assertEqual(comm.read_bytes(0x10c, 4), b"\x01\x02\x03\x04")
+
+    def test_read_into(self):
+        comm = self._comm()
+        comm.write(0x200, [1, 2, 3])
+        buf = array("I", [0]*3)
+        self.assertEqual(comm.read_into(0x200, buf), 12)
+        self.assertEqual(list(buf), [1, 2, 3])
+        buf = bytearray(8)
+        comm.read_into(0x204, memoryview(buf))
+        self.assertEqual(buf, b"\x02\x00\x00\x00\x03\x00\x00\x00")
+
+    def test_bulk_window_is_checked(self):
+        comm = self._comm()
+        with self.assertRaises(AssertionError):
+            comm.read_bytes(0xffc, 8)
+        with self.assertRaises(ValueError):
+            comm.read_bytes(0x002, 4)
+        self.assertEqual(comm.read_bytes(0xffc, 4), bytes(4))
+
+
 class TestCommUART(unittest.TestCase):
     def _comm_uart(self, baudrate=115200, addr_width=32, read_data=b""):
         port = FakeSerialPort(read_data=read_data)
@@ -506,6 +799,168 @@ class TestRemoteClient(unittest.TestCase):
             bus.write(0, 0, burst="wrap")
 
 
+class BatchMemoryComm(FakeMemoryComm, CSRBuilder):
+    pass
+
+
+class TestCSRBatch(unittest.TestCase):
+    def _run_batch(self, bus, comm):
+        reg = CSRRegister(bus.read, bus.write, "ctrl_scratch", 0x20, 2, 16, "rw")
+        with bus.batch() as batch:
+            batch.write(0x00, [1, 2, 3])
+            batch.write(reg, 0x12345678)
+            first = batch.read(0x00, 3)
+            value = batch.read(reg)
+            batch.write(0x04, 5)
+            word  = batch.read(0x04, key="word")
+        self.assertEqual(first.result(), [1, 2, 3])
+        self.assertEqual(value.result(), 0x12345678)
+        self.assertEqual(word.result(),  5)
+        self.assertEqual(batch.results, {0x00: [1, 2, 3], "ctrl_scratch": 0x12345678, "word": 5})
+        self.assertEqual(comm.mem[0x20], 0x1234)
+        self.assertEqual(comm.mem[0x24], 0x5678)
+
+    def test_generic_batch_merges_reads(self):
+        comm = BatchMemoryComm()
+        self._run_batch(comm, comm)
+        # Reads between two writes are merged in bursts.
+        self.assertEqual([call[:2] for call in comm.read_calls], [(0x00, 3), (0x20, 2), (0x04, 1)])
+
+    def test_result_before_flush_raises(self):
+        batch = BatchMemoryComm().batch()
+        future = batch.read(0x00)
+        with self.assertRaises(RuntimeError):
+            future.result()
+        batch.flush()
+        self.assertEqual(future.result(), 0)
+
+    def test_register_mode_is_checked(self):
+        batch = BatchMemoryComm().batch()
+        with self.assertRaises(KeyError):
+            batch.read(CSRRegister(None, None, "wo", 0x0, 1, 32, "wo"))
+        with self.assertRaises(KeyError):
+            batch.write(CSRRegister(None, None, "ro", 0x0, 1, 32, "ro"), 0)
+
+    def test_remote_client_batch(self):
+        comm   = FakeMemoryComm()
+        server = AsyncRemoteServer(comm, "localhost", bind_port=0)
+        server.open()
+        self.addCleanup(server.close)
+        server.start()
+        with mock.patch("litex.tools.litex_client.os.path.exists", return_value=False):
+            bus = RemoteClient(port=server.socket.getsockname()[1], raise_on_timeout=True)
+        with bus:
+            sent = []
+            send_packet = bus.send_packet
+            def record_send(socket, packet):
+                sent.append(packet)
+                send_packet(socket, packet)
+            bus.send_packet = record_send
+            self._run_batch(bus, comm)
+
+            # Large batches are split in records and kept in flight.
+            with bus.batch() as batch:
+                reads = [batch.read(4*i) for i in range(1000)]
+            self.assertEqual([read.result() for read in reads[:2]], [1, 5])
+            self.assertEqual(len(sent), 5 + 4)
+
+    def test_remote_client_batch_timeout(self):
+        class SlowMemoryComm(FakeMemoryComm):
+            def read(self, addr, length=None, burst="incr"):
+                if addr == 0x0:
+                    time.sleep(0.5)
+                return FakeMemoryComm.read(self, addr, length, burst)
+        comm   = SlowMemoryComm()
+        comm.mem[0x8000] = 0x1234
+        server = AsyncRemoteServer(comm, "localhost", bind_port=0)
+        server.open()
+        self.addCleanup(server.close)
+        server.start()
+        port = server.socket.getsockname()[1]
+        with mock.patch("litex.tools.litex_client.os.path.exists", return_value=False):
+            bus = RemoteClient(port=port, timeout=0.2)
+        with bus:
+            # The first read times out: the batch stops waiting for the other records in flight.
+            start = time.monotonic()
+            with bus.batch() as batch:
+                reads = [batch.read(4*i) for i in range(5000)]
+                batch.write(0x8004, 0x5678)
+            self.assertLess(time.monotonic() - start, 2.0)
+            self.assertEqual({read.result() for read in reads}, {0})
+
+            # Late responses do not leak into later reads; writes of the batch are done.
+            time.sleep(0.6)
+            self.assertEqual(bus.read(0x8000, 2), [0x1234, 0x5678])
+
+        with mock.patch("litex.tools.litex_client.os.path.exists", return_value=False):
+            bus = RemoteClient(port=port, timeout=0.2, raise_on_timeout=True)
+        with bus:
+            with self.assertRaises(TimeoutError):
+                with bus.batch() as batch:
+                    batch.read(0x0)
+            time.sleep(0.6)
+            self.assertEqual(bus.read(0x8000), 0x1234)
+
+
+class TestCSRMap(unittest.TestCase):
+    csv = (
+        "csr_base,ctrl,0x00000000,,\n"
+        "csr_register,ctrl_reset,0x00000000,1,rw\n"
+        "csr_register,ctrl_scratch,0x00000004,1,rw\n"
+        "csr_register,ctrl_bus_errors,0x00000008,1,ro\n"
+        "constant,config_csr_data_width,32,,\n"
+        "constant,config_bus_address_width,32,,\n"
+        "constant,config_cpu_type,none,,\n"
+        "memory_region,sram,0x10000000,8192,cached\n"
+    )
+
+    def setUp(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write(self.csv)
+            self.csr_csv = f.name
+        self.addCleanup(os.unlink, self.csr_csv)
+
+    def test_csr_map_is_cached_until_file_changes(self):
+        csr_map = load_csr_map(self.csr_csv)
+        self.assertIs(load_csr_map(self.csr_csv), csr_map)
+        with open(self.csr_csv, "a") as f:
+            f.write("csr_register,ctrl_extra,0x0000000c,1,rw\n")
+        new_csr_map = load_csr_map(self.csr_csv)
+        self.assertIsNot(new_csr_map, csr_map)
+        self.assertIn("ctrl_extra", new_csr_map.registers)
+
+    def test_registers_are_built_lazily(self):
+        comm = BatchMemoryComm()
+        bus  = CSRBuilder(comm, self.csr_csv)
+        self.assertIsInstance(bus.regs, CSRRegisters)
+        with mock.patch("litex.tools.remote.csr_builder.CSRRegister", wraps=CSRRegister) as build:
+            bus.regs.ctrl_scratch.write(0x12345678)
+            self.assertIs(bus.regs.ctrl_scratch, bus.regs.ctrl_scratch)
+            self.assertEqual(build.call_count, 1)
+            self.assertIs(bus.regs.d["ctrl_scratch"], bus.regs.ctrl_scratch)
+            self.assertEqual(build.call_count, 3)
+        self.assertEqual(comm.mem[0x04], 0x12345678)
+        self.assertTrue(hasattr(bus.regs, "ctrl_bus_errors"))
+        self.assertFalse(hasattr(bus.regs, "ctrl_missing"))
+
+    def test_registers_dict_iteration(self):
+        # Scripts iterating over __dict__ get all the registers.
+        bus     = CSRBuilder(BatchMemoryComm(), self.csr_csv)
+        scratch = bus.regs.ctrl_scratch
+        names   = [name for name, register in bus.regs.__dict__.items()]
+        self.assertEqual(names, ["ctrl_reset", "ctrl_scratch", "ctrl_bus_errors"])
+        self.assertIs(bus.regs.__dict__["ctrl_scratch"], scratch)
+        self.assertEqual(vars(bus.regs), bus.regs.d)
+
+    def test_registers_d_keeps_csr_map_order(self):
+        bus = CSRBuilder(BatchMemoryComm(), self.csr_csv)
+        bus.regs.ctrl_bus_errors
+        self.assertEqual(list(bus.regs.d), ["ctrl_reset", "ctrl_scratch", "ctrl_bus_errors"])
+        self.assertEqual(bus.regs.d["ctrl_bus_errors"].mode, "ro")
+        self.assertEqual(bus.constants.config_cpu_type, "none")
+        self.assertEqual(bus.bases.ctrl, 0x0)
+        self.assertEqual(bus.mems.sram.base, 0x10000000)
+
 class TestLiteXClientUtilities(unittest.TestCase):
     def setUp(self):
         FakeRemoteClient.instances = []
@@ -518,7 +973,9 @@ class TestLiteXClientUtilities(unittest.TestCase):
         self.addCleanup(lambda: os.path.exists(path) and os.unlink(path))
 
         with mock.patch("litex.tools.litex_client.RemoteClient", FakeRemoteClient):
-            read_memory("host", "csr.csv", 1234, 0x6000, length=6, file=path, endianness="big")
+            with redirect_stdout(io.StringIO()) as output:
+                read_memory("host", "csr.csv", 1234, 0x6000, length=6, file=path, endianness="big")
+        self.assertIn("Read 6 bytes in ", output.getvalue())
 
         bus = FakeRemoteClient.instances[0]
         self.assertEqual(bus.read_calls, [(0x6000, 2, "incr")])
@@ -554,6 +1011,34 @@ class TestLiteXClientUtilities(unittest.TestCase):
         bus = FakeRemoteClient.instances[0]
         self.assertEqual(bus.write_calls, [(0x7000, [0x01020304, 0x05000000], "incr")])
 
+    def test_stream_memory_roundtrip_in_chunks(self):
+        class Bus(FakeMemoryComm):
+            def write(self, addr, datas, burst="incr"):
+                FakeMemoryComm.write(self, addr, datas)
+
+        bus  = Bus()
+        data = os.urandom(10000)
+        written, _ = stream_write_memory(bus, 0x1000, io.BytesIO(data + b"ignored"), length=len(data), endianness="big", chunk_size=1024)
+        f = io.BytesIO()
+        read, _    = stream_read_memory(bus, 0x1000, len(data), f, endianness="big", chunk_size=4096)
+
+        self.assertEqual((written, read), (len(data), len(data)))
+        self.assertEqual(f.getvalue(), data)
+        self.assertEqual(len(bus.write_calls), 10)
+        self.assertEqual(bus.write_calls[1][0], 0x1000 + 1024)
+        self.assertEqual(bus.mem[0x1000], int.from_bytes(data[:4], "big"))
+        self.assertEqual([call[:2] for call in bus.read_calls], [(0x1000, 1024), (0x2000, 1024), (0x3000, 452)])
+
+    def test_stream_memory_errors(self):
+        class Bus:
+            def read(self, addr, length, burst="incr"):
+                raise TimeoutError
+
+        with self.assertRaises(TimeoutError):
+            stream_read_memory(Bus(), 0x0, 16, io.BytesIO())
+        with self.assertRaises(ValueError):
+            stream_read_memory(Bus(), 0x0, 16, io.BytesIO(), chunk_size=6)
+
     def test_write_memory_empty_file_does_not_write_bus(self):
         with tempfile.NamedTemporaryFile(delete=False) as f:
             path = f.name